@@ -0,0 +1,58 @@
+"""Throughput of the batch mode against the interactive REPL on the same input
+
+    python benchmarks/bench_batch.py [LINES]
+"""
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+COMMAND = [sys.executable, "-m", "calculator"]
+VARIABLES = ["a", "b", "c", "total", "rate"]
+
+
+def generate(lines, seed=0):
+    rng = random.Random(seed)
+    content = [f"{name} = {rng.randint(1, 99)}" for name in VARIABLES]
+    for _ in range(lines - len(content)):
+        if rng.random() < 0.05:
+            content.append(f"{rng.choice(VARIABLES)} = {rng.randint(1, 99)}")
+        else:
+            terms = [str(rng.choice(VARIABLES + [rng.randint(1, 999)])) for _ in range(rng.randint(2, 8))]
+            ops = [rng.choice("+-*") for _ in terms[1:]]
+            expression = terms[0]
+            for op, term in zip(ops, terms[1:]):
+                expression += f" {op} {term}"
+            content.append(expression)
+    return content
+
+
+def run(arguments, stdin):
+    start = time.perf_counter()
+    subprocess.run([*COMMAND, *arguments], cwd=ROOT, stdin=stdin,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+    return time.perf_counter() - start
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    content = generate(lines)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "input.txt"
+        path.write_text("\n".join(content + ["/exit"]) + "\n")
+
+        with path.open() as stdin:
+            repl = run([], stdin)
+        batch = run(["--batch", str(path)], subprocess.DEVNULL)
+
+    print(f"lines: {lines}")
+    print(f"repl:  {repl:.3f}s ({lines / repl:,.0f} lines/s)")
+    print(f"batch: {batch:.3f}s ({lines / batch:,.0f} lines/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Long flat chains of one operator folded into one call against reduced two operands at a time
+
+    python benchmarks/bench_chains.py [TERMS ...]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from calculator import Calculator, Governor  # noqa: E402
+from calculator.streams import DIGIT, LEFT_BRACKET, RIGHT_BRACKET, OPERATIONS, OPERATORS, YIELDS  # noqa: E402
+from calculator.streams import TokenStream  # noqa: E402
+from calculator.tokens import Tokenizer  # noqa: E402
+
+
+class PairwiseCalculator:
+    """The Calculator that popped two operands for every operator of a chain"""
+
+    def __init__(self, buffer, governor=None):
+        self.buffer = buffer
+        self.governor = governor or Governor()
+        self.__result = []
+        self.__operators = []
+
+    def calculate_result_stack(self, opcode):
+        second_operand = self.__result.pop()
+        first_operand = self.__result.pop()
+        self.governor.check(OPERATORS[opcode], first_operand, second_operand)
+        self.__result.append(OPERATIONS[opcode](first_operand, second_operand))
+
+    def calculate(self):
+        self.governor.start()
+        push = self.__result.append
+        operators = self.__operators
+
+        for opcode, operand in zip(self.buffer.opcodes, self.buffer.operands):
+            if opcode == DIGIT:
+                push(self.buffer.constants[operand])
+
+            elif opcode == LEFT_BRACKET:
+                operators.append(opcode)
+
+            elif opcode == RIGHT_BRACKET:
+                top = operators.pop()
+
+                while top != LEFT_BRACKET:
+                    self.calculate_result_stack(top)
+                    top = operators.pop()
+            else:
+                yields = YIELDS[opcode]
+                while operators and yields[operators[-1]]:
+                    self.calculate_result_stack(operators.pop())
+
+                operators.append(opcode)
+
+        while operators:
+            self.calculate_result_stack(operators.pop())
+
+        return self.__result.pop()
+
+
+def chains(terms, generator):
+    return {
+        "sum": " + ".join(str(generator.randint(1, 10 ** 6)) for _ in range(terms)),
+        "difference": " - ".join(str(generator.randint(1, 10 ** 6)) for _ in range(terms)),
+        "product": " * ".join(str(generator.randint(2, 3)) for _ in range(min(terms, 20000))),
+        "quotient": f"{10 ** 4000} / " + " / ".join(str(generator.randint(1, 2)) for _ in range(terms)),
+        "mixed": " + ".join(f"{generator.randint(1, 99)} * {generator.randint(1, 99)}" for _ in range(terms // 2)),
+    }
+
+
+def best(calculator, tokens, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = calculator(buffer=tokens, governor=Governor(max_bits=1 << 20)).calculate()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or [1000, 10000, 100000]
+    generator = random.Random(0)
+
+    print(f"{'chain':<11} {'terms':>7} {'pairwise':>11} {'folded':>11} {'speedup':>8}")
+    for terms in sizes:
+        for name, expression in chains(terms, generator).items():
+            tokens = TokenStream(Tokenizer(buffer=expression).tokenize())
+            pairwise, expected = best(PairwiseCalculator, tokens)
+            folded, result = best(Calculator, tokens)
+            assert result == expected, name
+            print(f"{name:<11} {terms:>7} {pairwise * 1e3:>9.2f}ms {folded * 1e3:>9.2f}ms {pairwise / folded:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Stored formulas recalculated through their compiled function against the interpreter loop of the Calculator
+
+    python benchmarks/bench_compile.py [FORMULAS] [UPDATES]
+
+Every formula reads the same input variable, so every assignment of it recalculates all of them, as a sheet of
+formulas does. The interpreter run sets Compiler.THRESHOLD out of reach so nothing is ever compiled. With UPDATES not
+far above Compiler.THRESHOLD the compiled run is slower, its compiling not being paid back yet.
+"""
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from calculator import Calculator, Memory  # noqa: E402
+from calculator.compilers import Compiler  # noqa: E402
+from calculator.streams import TokenStream  # noqa: E402
+from calculator.tokens import Tokenizer  # noqa: E402
+
+
+def name(index):
+    """The variable name of a formula, in letters only: a, b, ..., z, ba, bb, ..."""
+    letters = ""
+    while True:
+        index, digit = divmod(index, 26)
+        letters = chr(ord("a") + digit) + letters
+        if not index:
+            return f"f{letters}"
+
+
+def formula(generator, terms=12):
+    parts = ["x"]
+    for _ in range(terms):
+        operand = generator.choice(["x", "y", str(generator.randint(1, 99))])
+        parts += [generator.choice(["+", "-", "*", "/"]), operand]
+    return f"({' '.join(parts)}) * {generator.randint(2, 9)} - y"
+
+
+def sheet(formulas, updates, generator):
+    memory = Memory()
+    memory.update({"x": "1", "y": "7"})
+    for index in range(formulas):
+        memory.update({name(index): formula(generator)})
+
+    start = time.perf_counter()
+    for value in range(updates):
+        memory.update({"x": str(value + 2)})
+    return time.perf_counter() - start, memory.snapshot()
+
+
+def expressions(count, updates, generator):
+    streams = [TokenStream(Tokenizer(buffer=formula(generator, 40)).tokenize()) for _ in range(count)]
+    memory = Memory()
+    memory.update({"y": "7"})
+
+    start = time.perf_counter()
+    results = []
+    for value in range(updates):
+        memory.update({"x": str(value + 2)})
+        results += [Calculator(buffer=stream, memory=memory).calculate() for stream in streams]
+    return time.perf_counter() - start, results
+
+
+def compile_cost(generator, count=200):
+    streams = [TokenStream(Tokenizer(buffer=formula(generator, 40)).tokenize()) for _ in range(count)]
+    start = time.perf_counter()
+    for stream in streams:
+        Compiler(stream).compile()
+    return (time.perf_counter() - start) / count
+
+
+def measure(function, *arguments):
+    results = {}
+    for threshold in (math.inf, Compiler.THRESHOLD):
+        saved, Compiler.THRESHOLD = Compiler.THRESHOLD, threshold
+        try:
+            results[threshold] = function(*arguments, random.Random(0))
+        finally:
+            Compiler.THRESHOLD = saved
+    (interpreted, expected), (compiled, result) = results.values()
+    assert result == expected
+    return interpreted, compiled
+
+
+def main():
+    formulas = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    updates = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    print(f"{'workload':<12} {'interpreted':>12} {'compiled':>12} {'speedup':>8}")
+    for name, function in (("sheet", sheet), ("expressions", expressions)):
+        interpreted, compiled = measure(function, formulas, updates)
+        print(f"{name:<12} {interpreted * 1e3:>10.1f}ms {compiled * 1e3:>10.1f}ms {interpreted / compiled:>7.1f}x")
+    print(f"compiling one 40-term expression: {compile_cost(random.Random(1)) * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
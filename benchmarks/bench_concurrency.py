@@ -0,0 +1,124 @@
+"""Readers calculating against a ConcurrentMemory while writers update it, against one Memory shared under a lock
+
+    python benchmarks/bench_concurrency.py [READERS] [WRITERS] [SECONDS]
+
+The stress run checks that every reader sees a consistent version: `y` and `z` are formulas over `x`, so `y - 2 * x`
+and `z - 3 * x` are 0 in any version, and the version a reader sees never goes back. One plain Memory shared without
+the lock is run the same way, counting the reads that saw a half-applied update. The benchmark then measures the read
+throughput of every store with and without writers.
+"""
+import threading
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from calculator import Calculator, ConcurrentMemory, CustomError, Memory  # noqa: E402
+from calculator.concurrency import parse  # noqa: E402
+from calculator.backends import INTEGER  # noqa: E402
+
+FORMULAS = {"x": "1", "y": "x * 2", "z": "y + x"}
+PADDING = 5000
+CHECKS = ("y - 2 * x", "z - 3 * x")
+
+
+def padding():
+    names, index = {}, 0
+    while len(names) < PADDING:
+        name, number = "", index
+        while True:
+            name = chr(97 + number % 26) + name
+            number //= 26
+            if not number:
+                break
+        if name not in FORMULAS:
+            names[name] = str(index)
+        index += 1
+    return names
+
+
+class LockedMemory:
+    """One Memory, both its readers and its writers taking the same lock"""
+
+    def __init__(self, lock=True):
+        self.memory = Memory()
+        self.lock = threading.Lock() if lock else None
+
+    def update(self, args):
+        if self.lock is None:
+            return self.memory.update(args)
+        with self.lock:
+            return self.memory.update(args)
+
+    def evaluate(self, expression):
+        calculator = Calculator(buffer=parse(expression, INTEGER), memory=self.memory)
+        if self.lock is None:
+            return calculator.calculate()
+        with self.lock:
+            return calculator.calculate()
+
+
+def stress(store, readers, writers, seconds, consistent=True):
+    store.update(padding())
+    store.update(FORMULAS)
+    stop = threading.Event()
+    reads, torn, failures = [0] * readers, [0] * readers, []
+
+    def read(index):
+        last = 0
+        while not stop.is_set():
+            view = store.view() if consistent else None
+            for expression in CHECKS:
+                try:
+                    result = store.evaluate(expression, view) if consistent else store.evaluate(expression)
+                except CustomError:
+                    result = None
+                if result != 0:
+                    torn[index] += 1
+            if consistent:
+                if view.version < last:
+                    failures.append(f"version went back from {last} to {view.version}")
+                last = view.version
+            reads[index] += len(CHECKS)
+
+    def write(index):
+        value = index
+        while not stop.is_set():
+            value += writers
+            store.update({"x": str(value)})
+
+    threads = [threading.Thread(target=read, args=(index,)) for index in range(readers)]
+    threads += [threading.Thread(target=write, args=(index,)) for index in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return sum(reads), sum(torn), failures
+
+
+def main():
+    readers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    writers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 1.0
+
+    reads, torn, failures = stress(ConcurrentMemory(), readers, writers, seconds)
+    assert not torn and not failures, (torn, failures[:3])
+    print(f"stress: {reads} consistent reads by {readers} readers under {writers} writers")
+
+    reads, torn, _ = stress(LockedMemory(lock=False), readers, writers, seconds, consistent=False)
+    print(f"plain Memory without a lock: {torn} of {reads} reads saw a half-applied update")
+
+    print(f"{'store':<18} {'writers':>7} {'reads/s':>12}")
+    for name, factory in (("ConcurrentMemory", ConcurrentMemory), ("locked Memory", LockedMemory)):
+        for count in (0, writers):
+            reads, torn, _ = stress(factory(), readers, count, seconds, consistent=factory is ConcurrentMemory)
+            assert not torn
+            print(f"{name:<18} {count:>7} {reads / seconds:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
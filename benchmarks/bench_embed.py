@@ -0,0 +1,53 @@
+"""Cost of one evaluation through a subprocess per call against the in-process evaluate() API
+
+    python benchmarks/bench_embed.py [CALLS]
+"""
+import subprocess
+import sys
+import time
+
+from bench_batch import COMMAND, ROOT
+
+sys.path.insert(0, str(ROOT))
+
+EXPRESSION = "a * (b + 1) - 2 ^ 10"
+VALUES = {"a": 6, "b": 6}
+
+
+def spawn(calls):
+    stdin = "".join(f"{name} = {value}\n" for name, value in VALUES.items()) + f"{EXPRESSION}\n/exit\n"
+    start = time.perf_counter()
+    for _ in range(calls):
+        subprocess.run(COMMAND, cwd=ROOT, input=stdin, text=True, capture_output=True, check=True)
+    return (time.perf_counter() - start) / calls
+
+
+def cold_import():
+    script = (
+        "import time; start = time.perf_counter(); from calculator import evaluate; print(time.perf_counter() - start)"
+    )
+    return float(subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True).stdout)
+
+
+def in_process(calls):
+    import calculator
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        calculator.evaluate(EXPRESSION, VALUES)
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    subprocess_call = spawn(calls)
+    in_process_call = in_process(calls * 100)
+
+    print(f"from calculator import evaluate: {cold_import() * 1e3:.2f}ms")
+    print(f"subprocess:                      {subprocess_call * 1e3:.3f}ms per call")
+    speedup = subprocess_call / in_process_call
+    print(f"evaluate():                      {in_process_call * 1e3:.3f}ms per call ({speedup:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
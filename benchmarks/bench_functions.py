@@ -0,0 +1,61 @@
+"""Calls of user-defined functions with their memoization caches against the same calls with the caches disabled
+
+    python benchmarks/bench_functions.py [CALLS] [ARGUMENTS]
+
+Every function calls the one below it twice, so an uncached call of the top one calculates 2 ^ LEVELS bodies while a
+cached one calculates each body once per argument. The calls draw from ARGUMENTS distinct arguments, and a global
+variable read by the bottom function is assigned every 100 calls, invalidating every cache.
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from calculator import Session  # noqa: E402
+
+LEVELS = 8
+
+
+def definitions():
+    lines = ["rate = 3", "fa(x) = x * rate + 1"]
+    for level in range(1, LEVELS):
+        name, below = f"f{chr(97 + level)}", f"f{chr(96 + level)}"
+        lines.append(f"{name}(x) = {below}(x) + {below}(x + 1) / 2")
+    return lines, f"f{chr(96 + LEVELS)}"
+
+
+def run(calls, arguments, function_cache):
+    session = Session(function_cache=function_cache)
+    lines, top = definitions()
+    for line in lines:
+        session.process(line)
+
+    generator = random.Random(0)
+    results = []
+    start = time.perf_counter()
+    for index in range(calls):
+        if index and not index % 100:
+            session.process(f"rate = {generator.randint(2, 9)}")
+        results.append(session.process(f"{top}({generator.randint(1, arguments)})"))
+    return time.perf_counter() - start, results, session
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    arguments = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    uncached, expected, _ = run(calls, arguments, 0)
+    cached, results, session = run(calls, arguments, 128)
+    assert results == expected
+
+    print(f"{'caches':<10} {'per call':>12}")
+    print(f"{'disabled':<10} {uncached / calls * 1e6:>10.1f}us")
+    print(f"{'enabled':<10} {cached / calls * 1e6:>10.1f}us ({uncached / cached:.1f}x)")
+    for function in session.functions:
+        print(function.summary())
+
+
+if __name__ == "__main__":
+    main()
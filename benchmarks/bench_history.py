@@ -0,0 +1,57 @@
+"""Repeated expressions returned from their memoized result against recalculated every time
+
+    python benchmarks/bench_history.py [TERMS] [REPEAT]
+
+Both sessions keep their parsed expressions in the cache, the first one drops the memoized result after every line so
+only the calculation differs. Every tenth line assigns one of the variables, invalidating the expressions reading it.
+"""
+import sys
+import time
+
+from bench_batch import ROOT
+
+sys.path.insert(0, str(ROOT))
+
+from calculator import Session  # noqa: E402
+
+VARIABLES = ("a", "b", "c", "d")
+
+
+def expressions(terms):
+    return [
+        " + ".join(f"{name} * {index + 1} ^ 3" for index in range(terms)) for name in VARIABLES
+    ]
+
+
+def run(session, lines, memoize):
+    for name in VARIABLES:
+        session.process(f"{name} = 7")
+
+    start = time.perf_counter()
+    results = []
+    for number, line in enumerate(lines):
+        if number % 10 == 9:
+            session.process(f"{VARIABLES[number % len(VARIABLES)]} = {number}")
+        results.append(session.process(line)[0])
+        if not memoize:
+            session.cache.entries[line].memo = None
+    return time.perf_counter() - start, results
+
+
+def main():
+    terms = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    unique = expressions(terms)
+    lines = [unique[number % len(unique)] for number in range(repeat)]
+
+    recalculated, expected = run(Session(), lines, memoize=False)
+    memoized, results = run(Session(), lines, memoize=True)
+    assert results == expected
+
+    print(f"{repeat} lines of {terms} terms")
+    print(f"recalculated: {recalculated / repeat * 1e6:>9.1f}us per line")
+    print(f"memoized:     {memoized / repeat * 1e6:>9.1f}us per line ({recalculated / memoized:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
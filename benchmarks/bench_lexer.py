@@ -0,0 +1,106 @@
+"""Single-pass Tokenizer against the former multi-pass Validator + Tokenizer on long inputs
+
+    python benchmarks/bench_lexer.py
+"""
+import random
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from calculator.digits import Digit  # noqa: E402
+from calculator.operators import OPERATORS, Operator  # noqa: E402
+from calculator.tokens import Tokenizer  # noqa: E402
+from calculator.variables import Variable  # noqa: E402
+
+
+class LegacyTokenizer:
+    """The character by character tokenizer the single-pass Tokenizer replaced"""
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.pos = 0
+        self.tokens = []
+
+    def next_token(self):
+        atom = self.get_atom()
+        while atom and atom.isspace():
+            self.pos += 1
+            atom = self.get_atom()
+
+        if atom is None:
+            return None
+        if Digit.is_check(atom):
+            return self.read(Digit)
+        if Operator.is_check(atom):
+            return self.read(Operator).operator
+        if Variable.is_check(atom):
+            return self.read(Variable)
+
+    def read(self, meta):
+        end_pos = self.pos + 1
+        while self.get_atom(end_pos) and meta.is_check(self.get_atom(end_pos)):
+            end_pos += 1
+        value = self.buffer[self.pos:end_pos]
+        self.pos = end_pos
+        return meta(value)
+
+    def get_atom(self, pos=None):
+        try:
+            return self.buffer[pos or self.pos]
+        except IndexError:
+            return None
+
+    def tokenize(self):
+        while True:
+            token = self.next_token()
+            if not token:
+                return self.tokens
+            self.tokens.append(token)
+
+
+def legacy(content):
+    """The checks the former Validator ran before handing the content to the Tokenizer"""
+    if Variable.is_check(content):
+        return None
+    if content.count("(") != content.count(")"):
+        return None
+    if any([re.search(r"(\*)\1+", content), re.search(r"(/)\1+", content), re.search(r"(\^)\1+", content)]):
+        return None
+    if any([content.startswith(op) for op in OPERATORS]) or any([content.endswith(op) for op in OPERATORS]):
+        return None
+    return LegacyTokenizer(content).tokenize()
+
+
+def single_pass(content):
+    return Tokenizer(content).tokenize()
+
+
+def generate(terms, seed=0):
+    rng = random.Random(seed)
+    parts = [str(rng.randint(1, 999))]
+    for _ in range(terms - 1):
+        operand = rng.choice(["a", "total", str(rng.randint(1, 999))])
+        if rng.random() < 0.1:
+            operand = f"({operand} + {rng.randint(1, 9)})"
+        parts.append(f"{rng.choice('+-*/')} {operand}")
+    parts.append(f"+ {rng.randint(1, 999)}")
+    return " ".join(parts)
+
+
+def main():
+    print(f"{'terms':>8} {'chars':>9} {'legacy':>10} {'single':>10} {'speedup':>8}")
+    for terms in (10, 100, 1_000, 10_000, 100_000):
+        content = generate(terms)
+        assert len(legacy(content)) == len(single_pass(content))
+
+        number = max(1, 20_000 // terms)
+        before = min(timeit.repeat(lambda: legacy(content), number=number, repeat=3)) / number
+        after = min(timeit.repeat(lambda: single_pass(content), number=number, repeat=3)) / number
+        print(f"{terms:>8} {len(content):>9} {before * 1e3:>8.3f}ms {after * 1e3:>8.3f}ms {before / after:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
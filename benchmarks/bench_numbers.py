@@ -0,0 +1,95 @@
+"""Integer expressions on the int fast path against the same expressions through the generic backend path
+
+    python benchmarks/bench_numbers.py [EXPRESSIONS] [TERMS]
+
+`generic` calculates integers with floor division like `int`, but as any non-integer backend does: its literals are
+converted and every operation goes through the backend tables and the number-aware Governor check. The other backends
+run the same expressions with their own arithmetic, then expressions with decimal literals.
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from calculator import Calculator, Governor, Memory  # noqa: E402
+from calculator.backends import INTEGER, Backend, Floating, Integer, Rational, Real  # noqa: E402
+from calculator.optimizers import Optimizer  # noqa: E402
+from calculator.streams import TokenStream  # noqa: E402
+from calculator.tokens import Tokenizer  # noqa: E402
+
+VARIABLES = ("a", "b", "c")
+
+
+class Generic(Backend):
+    """Integers with floor division, taken through the path of every non-integer backend"""
+
+    name = "generic"
+    operations = Integer.operations
+    runs = Integer.runs
+    bits = staticmethod(int.bit_length)
+
+    def number(self, value):
+        return int(value)
+
+
+def expressions(count, terms, generator, decimals=False):
+    def operand():
+        if generator.random() < 0.25:
+            return generator.choice(VARIABLES)
+        if decimals:
+            return f"{generator.randint(1, 999)}.{generator.randint(0, 99)}"
+        return str(generator.randint(1, 999))
+
+    lines = []
+    for _ in range(count):
+        parts = [operand()]
+        for _ in range(terms - 1):
+            parts += [generator.choice("+-*/"), operand()]
+        lines.append(" ".join(parts))
+    return lines
+
+
+def parse(lines, backend):
+    tokens = [Tokenizer(buffer=line, decimals=not backend.integral).tokenize() for line in lines]
+    return [TokenStream(Optimizer(buffer=buffer, backend=backend).optimize()) for buffer in tokens]
+
+
+def best(lines, backend, repeat=5):
+    memory = Memory(backend=backend)
+    memory.update({name: str(value) for value, name in enumerate(VARIABLES, 2)})
+    streams = parse(lines, backend)
+    governor = Governor(max_bits=1 << 20)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for stream in streams:
+            try:
+                Calculator(buffer=stream, memory=memory, governor=governor, backend=backend).calculate()
+            except Exception:
+                pass
+        timings.append(time.perf_counter() - start)
+    return min(timings) / len(lines)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    terms = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    generator = random.Random(0)
+    integers = expressions(count, terms, generator)
+    decimals = expressions(count, terms, generator, decimals=True)
+
+    fast = best(integers, INTEGER)
+    print(f"{'numbers':<10} {'literals':<9} {'per expression':>15}")
+    print(f"{'int':<10} {'integer':<9} {fast * 1e6:>13.1f}us")
+    for backend in (Generic(), Rational(), Real(), Floating()):
+        timing = best(integers, backend)
+        print(f"{backend.name:<10} {'integer':<9} {timing * 1e6:>13.1f}us ({timing / fast:.2f}x int)")
+    for backend in (Rational(), Real(), Floating()):
+        print(f"{backend.name:<10} {'decimal':<9} {best(decimals, backend) * 1e6:>13.1f}us")
+
+
+if __name__ == "__main__":
+    main()
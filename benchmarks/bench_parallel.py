@@ -0,0 +1,43 @@
+"""How batch throughput scales with the number of worker processes
+
+    python benchmarks/bench_parallel.py [LINES] [MAX_WORKERS]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench_batch import COMMAND, ROOT, generate
+
+
+def run(arguments):
+    start = time.perf_counter()
+    subprocess.run([*COMMAND, *arguments], cwd=ROOT, stdin=subprocess.DEVNULL,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "input.txt"
+        path.write_text("\n".join(generate(lines)) + "\n")
+
+        sequential = run(["--batch", str(path)])
+        print(f"lines: {lines}")
+        print(f"{'workers':>10} {'seconds':>9} {'lines/s':>12} {'speedup':>8}")
+        print(f"{'sequential':>10} {sequential:>9.3f} {lines / sequential:>12,.0f} {1:>7.2f}x")
+
+        workers = 1
+        while workers <= max_workers:
+            elapsed = run(["--batch", str(path), "--workers", str(workers)])
+            print(f"{workers:>10} {elapsed:>9.3f} {lines / elapsed:>12,.0f} {sequential / elapsed:>7.2f}x")
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
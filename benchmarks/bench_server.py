@@ -0,0 +1,84 @@
+"""Local load generator for the --serve mode, reporting requests per second and latency percentiles
+
+    python benchmarks/bench_server.py [CONNECTIONS] [REQUESTS_PER_CONNECTION]
+"""
+import asyncio
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from bench_batch import COMMAND, ROOT
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+async def wait_for(port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+async def client(port, requests, seed, latencies):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"a = 7\nb = 3\n")
+
+    for _ in range(requests):
+        expression = f"a * {rng.randint(1, 999)} + b ^ {rng.randint(1, 9)} - ({rng.randint(1, 99)} / b)\n"
+        start = time.perf_counter()
+        writer.write(expression.encode())
+        await writer.drain()
+        await reader.readline()
+        latencies.append(time.perf_counter() - start)
+
+    writer.write(b"/exit\n")
+    await reader.readline()
+    writer.close()
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def load(port, connections, requests):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, requests, seed, latencies) for seed in range(connections)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"connections: {connections}, requests: {len(latencies)}")
+    print(f"throughput:  {len(latencies) / elapsed:,.0f} requests/s")
+    for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        print(f"{name}:         {percentile(latencies, fraction) * 1e3:.3f}ms")
+
+
+def main():
+    connections = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    port = free_port()
+
+    server = subprocess.Popen([*COMMAND, "--serve", str(port)], cwd=ROOT)
+    try:
+        asyncio.run(wait_for(port))
+        asyncio.run(load(port, connections, requests))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
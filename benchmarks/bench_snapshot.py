@@ -0,0 +1,76 @@
+"""Loading a Memory from a mmap-backed Snapshot against replaying its assignment lines
+
+    python benchmarks/bench_snapshot.py [VARIABLES] [FORMULAS]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from calculator import Memory, Session  # noqa: E402
+
+
+def name(index, prefix):
+    """Identifiers are letters only, so the index is spelled in base 26"""
+    letters = ""
+    while True:
+        index, digit = divmod(index, 26)
+        letters += chr(ord("a") + digit)
+        if not index:
+            return prefix + letters
+
+
+def generate(variables, formulas, seed=0):
+    rng = random.Random(seed)
+    literals = variables - formulas
+    lines = [f"{name(index, 'v')} = {rng.randint(-10 ** 12, 10 ** 12)}" for index in range(literals)]
+    for index in range(formulas):
+        first, second = rng.sample(range(literals), 2)
+        lines.append(f"{name(index, 'f')} = {name(first, 'v')} * {name(second, 'v')} + {rng.randint(1, 99)}")
+    return lines
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def replay(lines):
+    session = Session()
+    for line in lines:
+        session.process(line)
+    return session.memory
+
+
+def main():
+    variables = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    formulas = int(sys.argv[2]) if len(sys.argv) > 2 else variables // 10
+    lines = generate(variables, formulas)
+    names = [line.split(" = ")[0] for line in random.Random(1).sample(lines, min(1000, len(lines)))]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "memory.snapshot")
+        memory, replayed = timed(lambda: replay(lines))
+        _, saved = timed(lambda: memory.save(path))
+
+        loaded_memory = Memory()
+        _, loaded = timed(lambda: loaded_memory.load(path))
+        _, looked_up = timed(lambda: [loaded_memory.get(name) for name in names])
+        assert all(loaded_memory.get(name) == memory.get(name) for name in names)
+        _, materialized = timed(loaded_memory.materialize)
+
+        print(f"variables: {variables} ({formulas} formulas), snapshot {os.path.getsize(path) / 1024:,.0f} KiB")
+        print(f"replay assignments: {replayed * 1e3:>9.1f}ms")
+        print(f"save snapshot:      {saved * 1e3:>9.1f}ms")
+        print(f"load snapshot:      {loaded * 1e3:>9.1f}ms ({replayed / loaded:,.0f}x faster than replaying)")
+        print(f"{len(names)} first reads:    {looked_up * 1e3:>9.1f}ms")
+        print(f"read the rest:      {materialized * 1e3:>9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Peak memory and time of --stream against reading, tokenizing and calculating a huge expression all at once
+
+    python benchmarks/bench_stream.py [MEGABYTES]
+
+Every mode runs in its own process, so the growth of its peak resident memory is its own.
+"""
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from calculator import Calculator, Governor, evaluate_stream  # noqa: E402
+from calculator.tokens import Tokenizer  # noqa: E402
+
+
+def generate(path, megabytes, seed=0):
+    """A sum of small bracketed products, nested a few levels deep, written line by line"""
+    rng = random.Random(seed)
+    size = 0
+    with open(path, "w") as stream:
+        stream.write("0")
+        while size < megabytes * 2 ** 20:
+            line = " + " + "(" * 3 + " - ".join(
+                f"{rng.randint(1, 999)} * {rng.randint(1, 999)}" for _ in range(8)
+            ) + ")" * 3 + "\n"
+            stream.write(line)
+            size += len(line)
+
+
+def measure(mode, path):
+    governor = Governor(timeout=0)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+
+    if mode == "stream":
+        with open(path) as source:
+            result = evaluate_stream(source, governor=governor)
+    else:
+        with open(path) as source:
+            tokens = Tokenizer(buffer=source.read()).tokenize()
+        result = Calculator(buffer=tokens, governor=governor).calculate()
+
+    return {
+        "result": result,
+        "elapsed": time.perf_counter() - start,
+        "rss": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline) * 1024,
+    }
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] in ("stream", "whole"):
+        print(json.dumps(measure(sys.argv[1], sys.argv[2])))
+        return
+
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "expression.txt")
+        generate(path, megabytes)
+        print(f"expression: {os.path.getsize(path) / 2 ** 20:.0f}MB")
+        print(f"{'mode':<7} {'seconds':>8} {'peak RSS growth':>16}")
+
+        results = []
+        for mode in ("whole", "stream"):
+            output = subprocess.run(
+                [sys.executable, __file__, mode, path], capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output)
+            results.append(result["result"])
+            print(f"{mode:<7} {result['elapsed']:>8.2f} {result['rss'] / 2 ** 20:>14.1f}MB")
+
+        assert results[0] == results[1]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Loading and querying millions of variables in Memory against the former pair of string-keyed dicts
+
+    python benchmarks/bench_symbols.py [VARIABLES] [QUERIES]
+
+Every store runs in its own process, so the growth of its peak resident memory while loading is its own.
+"""
+import json
+import random
+import resource
+import string
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from calculator import Memory  # noqa: E402
+from calculator.variables import Variable  # noqa: E402
+
+
+class LegacyMemory:
+    """The former store: resolved values and the text of every variable, both keyed by name"""
+
+    def __init__(self):
+        self.memory = {}
+        self.values = {}
+
+    def assign(self, key, value):
+        self.values[key] = int(value)
+        self.memory[key] = str(value)
+
+    def get(self, key):
+        return self.values.get(key)
+
+
+def legacy_is_check(variable):
+    alphabet = string.ascii_letters
+    count = 0
+    for k in variable:
+        count += alphabet.count(k)
+
+    return count == len(variable)
+
+
+def name(index):
+    letters = ""
+    while True:
+        index, digit = divmod(index, 52)
+        letters += string.ascii_letters[digit]
+        if not index:
+            return "var" + letters
+
+
+def measure(store, variables, queries):
+    memory = LegacyMemory() if store == "legacy" else Memory()
+    check = legacy_is_check if store == "legacy" else Variable.is_check
+    rng = random.Random(0)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    for index in range(variables):
+        key = name(index)
+        if check(key):
+            memory.assign(key, rng.randint(-10 ** 9, 10 ** 9) if index % 1000 else 1 << 80)
+    loaded = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+
+    keys = [name(rng.randrange(variables)) for _ in range(queries)]
+    start = time.perf_counter()
+    for key in keys:
+        memory.get(key)
+    queried = time.perf_counter() - start
+
+    keys = [name(index) for index in range(min(variables, 100_000))]
+    start = time.perf_counter()
+    for key in keys:
+        check(key)
+    checked = time.perf_counter() - start
+
+    return {
+        "loaded": loaded,
+        "queried": queried / queries,
+        "checked": checked / len(keys),
+        "rss": peak * 1024,
+    }
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] in ("legacy", "symbols"):
+        print(json.dumps(measure(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]))))
+        return
+
+    variables = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+
+    print(f"variables: {variables:,}, queries: {queries:,}")
+    print(f"{'store':<8} {'load':>9} {'get':>9} {'is_check':>9} {'RSS':>10} {'B/var':>7}")
+    for store in ("legacy", "symbols"):
+        output = subprocess.run(
+            [sys.executable, __file__, store, str(variables), str(queries)], capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output)
+        print(f"{store:<8} {result['loaded']:>8.2f}s {result['queried'] * 1e9:>7.0f}ns "
+              f"{result['checked'] * 1e9:>7.0f}ns {result['rss'] / 2 ** 20:>8.0f}MB {result['rss'] / variables:>7.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Memory per token and evaluation speed of a TokenStream against the former list of token objects
+
+    python benchmarks/bench_tokens.py [TOKENS ...]
+"""
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from calculator import Calculator, Governor  # noqa: E402
+from calculator.digits import Digit  # noqa: E402
+from calculator.operators import Addition, Subtraction, Multiplication, LeftBracket, RightBracket  # noqa: E402
+from calculator.operators import Precedence  # noqa: E402
+from calculator.streams import TokenStream  # noqa: E402
+
+
+class LegacyDigit:
+    """The Digit token before it had __slots__"""
+
+    def __init__(self, number):
+        self.number = int(number)
+
+
+class LegacyCalculator:
+    """The Calculator that walked a list of token objects with isinstance checks and Precedence lookups"""
+
+    def __init__(self, buffer, governor=None):
+        self.buffer = buffer
+        self.governor = governor or Governor()
+        self.__result = deque()
+        self.__operators = deque()
+
+    def calculate_result_stack(self, operator):
+        second_operand = self.__result.pop()
+        first_operand = self.__result.pop()
+        self.governor.check(operator, first_operand, second_operand)
+        self.__result.append(operator.execute(first_operand, second_operand))
+
+    def calculate(self):
+        self.governor.start()
+        for v in self.buffer:
+            if isinstance(v, LegacyDigit):
+                self.__result.append(v.number)
+
+            elif v == LeftBracket:
+                self.__operators.append(v)
+
+            elif v == RightBracket:
+                operator = self.__operators.pop()
+
+                while not operator == LeftBracket:
+                    self.calculate_result_stack(operator=operator)
+                    operator = self.__operators.pop()
+            else:
+                while len(self.__operators) and Precedence.yields(v, self.__operators[-1]):
+                    self.calculate_result_stack(operator=self.__operators.pop())
+
+                self.__operators.append(v)
+
+        while len(self.__operators):
+            self.calculate_result_stack(operator=self.__operators.pop())
+
+        return self.__result.pop()
+
+
+def generate(size, seed=0):
+    """Legacy and current tokens of `n + (n * n - n) + ...` with size tokens at least"""
+    rng = random.Random(seed)
+    numbers = []
+    while len(numbers) * 8 < size:
+        numbers.append([rng.randint(1, 10 ** 6) for _ in range(3)])
+
+    def tokens(digit):
+        buffer = [digit(1)]
+        for first, second, third in numbers:
+            buffer += [Addition, LeftBracket, digit(first), Multiplication, digit(second), Subtraction, digit(third),
+                       RightBracket]
+        return buffer
+
+    return tokens(LegacyDigit), tokens
+
+
+def allocated(build):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    value = build()
+    size = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+    tracemalloc.stop()
+    return value, size
+
+
+def best(function, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return result, min(timings)
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1:]] or [100_000, 1_000_000]
+    governor = Governor(timeout=0)
+
+    print(f"{'tokens':>9} {'list B/tok':>11} {'stream B/tok':>13} {'legacy':>10} {'stream':>10} {'speedup':>8}")
+    for size in sizes:
+        legacy, legacy_bytes = allocated(lambda: generate(size)[0])
+        stream, stream_bytes = allocated(lambda: TokenStream(generate(size)[1](Digit)))
+
+        expected, before = best(lambda: LegacyCalculator(buffer=legacy, governor=governor).calculate())
+        result, after = best(lambda: Calculator(buffer=stream, governor=governor).calculate())
+        assert result == expected
+
+        count = len(stream)
+        print(f"{count:>9} {legacy_bytes / count:>11.1f} {stream_bytes / count:>13.1f} "
+              f"{before * 1e3:>8.1f}ms {after * 1e3:>8.1f}ms {before / after:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Incremental updates of a watched sheet against evaluating the whole edited sheet again
+
+    python benchmarks/bench_watch.py [LINES] [EDITS]
+
+The sheet chains groups of formulas off a few inputs and evaluates expressions over them. Every edit changes one input,
+one expression or one line in the middle, then the Watcher updates the results it already had and a new Watcher
+evaluates the edited sheet from scratch, and both end with the same results.
+"""
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from calculator import Session  # noqa: E402
+from calculator.watchers import Watcher  # noqa: E402
+
+
+def name(index):
+    letters = ""
+    while True:
+        letters = chr(97 + index % 26) + letters
+        index //= 26
+        if not index:
+            return f"v{letters}"
+
+
+def sheet(lines, generator):
+    texts = [f"in{chr(97 + group)} = {generator.randint(1, 99)}" for group in range(8)]
+    index = 0
+    while len(texts) < lines:
+        source = f"in{chr(97 + index % 8)}" if index < 8 else name(generator.randrange(max(0, index - 8), index))
+        texts.append(f"{name(index)} = {source} * {generator.randint(2, 9)} + {generator.randint(1, 99)}")
+        texts.append(f"{name(index)} / {generator.randint(1, 9)} - {source}")
+        index += 1
+    return texts
+
+
+def edit(texts, generator):
+    kind = generator.choice(("input", "expression", "line"))
+    if kind == "input":
+        group = generator.randrange(8)
+        texts[group] = f"in{chr(97 + group)} = {generator.randint(1, 99)}"
+    elif kind == "expression":
+        position = generator.randrange(9, len(texts), 2)
+        texts[position] = f"{texts[position].split(' / ')[0]} / {generator.randint(1, 9)} + 1"
+    else:
+        texts.insert(generator.randrange(8, len(texts)), f"{generator.randint(1, 99)} * {generator.randint(1, 99)}")
+    return kind
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    edits = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    generator = random.Random(0)
+    texts = sheet(lines, generator)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "sheet.txt")
+
+        def write(stamp):
+            with open(path, "w") as target:
+                target.write("\n".join(texts) + "\n")
+            os.utime(path, ns=(stamp, stamp))
+
+        write(0)
+        watcher = Watcher(path, Session, output=lambda line: None, errors=io.StringIO())
+        start = time.perf_counter()
+        watcher.poll()
+        print(f"first evaluation of {len(texts)} lines: {(time.perf_counter() - start) * 1e3:.1f}ms")
+
+        print(f"{'edit':<11} {'incremental':>12} {'full':>10}")
+        for stamp in range(1, edits + 1):
+            kind = edit(texts, generator)
+            write(stamp * 10 ** 9)
+
+            start = time.perf_counter()
+            watcher.poll()
+            incremental = time.perf_counter() - start
+
+            fresh = Watcher(path, Session, output=lambda line: None, errors=io.StringIO())
+            start = time.perf_counter()
+            fresh.poll()
+            full = time.perf_counter() - start
+
+            assert [row.output for row in watcher.rows] == [row.output for row in fresh.rows]
+            print(f"{kind:<11} {incremental * 1e3:>10.1f}ms {full * 1e3:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
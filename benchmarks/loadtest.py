@@ -0,0 +1,355 @@
+"""Load-testing driver replaying sessions of the REPL protocol, reporting latency percentiles, throughput and errors
+
+    python benchmarks/loadtest.py [--target inprocess|repl] [--sessions 4] [--lines 1000] [--rate 0] [--seed 0]
+                                  [--replay FILE] [--record FILE] [--output report.json]
+
+Sessions are synthetic unless replayed from a file: a few setup assignments, then a seeded mix of expressions,
+assignments, `/help` and invalid inputs taking every error path of the Validator (`Invalid identifier`,
+`Invalid assignment`, `Unknown variable`, `Cyclic assignment`, `Invalid Expression`) as well as `Division by zero` and
+`Unknown command`. Every synthetic line knows the error it should end with, so outcomes the target got wrong are
+counted apart. A recorded or replayed file holds the lines of a session as typed in the REPL, every session ending
+with `/exit`, so any REPL transcript replays as is.
+
+`repl` runs one `python -m calculator` process per session over its stdin and stdout, two marker lines after every
+input telling where its output ends: an unknown command then an invalid expression. Neither touches the History, and
+no single input prints both of their messages in a row. `inprocess` runs one Session per session in this process,
+interleaved on one thread. With `--rate`, lines are sent at that many per second across all sessions and latency is
+measured from the time a line was due, so the time a slow target keeps lines waiting is counted; without it every
+session sends its next line as soon as the previous one is answered.
+"""
+import argparse
+import heapq
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from calculator import CustomError, Session  # noqa: E402
+from calculator.commands import Command, CommandCenter  # noqa: E402
+from calculator.instruments import Statistics  # noqa: E402
+
+COMMAND = [sys.executable, "-u", "-m", "calculator"]
+MARKERS = ("/marker", "*")
+DELIMITER = ["Unknown command", "Invalid Expression"]
+KINDS = ("assignment", "expression", "command", "invalid")
+VARIABLES = ("a", "b")
+FORMULAS = {"c": "a * 2 + b", "d": "c - a"}
+UNKNOWN = ("zq", "zw", "qz", "wz")
+MESSAGES = (
+    "Invalid identifier", "Invalid assignment", "Unknown variable", "Cyclic assignment", "Invalid Expression",
+    "Division by zero", "Unknown command", "Result too large", "Calculation timed out", "Undefined result",
+    "Unknown result", "Unknown function", "Wrong number of arguments", "Recursion limit exceeded",
+)
+
+
+class Line:
+    """One input of a session, with its kind and the error message it should end with, if known"""
+
+    __slots__ = ("text", "kind", "expected")
+
+    def __init__(self, text, kind=None, expected=None):
+        self.text = text
+        self.kind = kind or self.classify(text)
+        self.expected = expected
+
+    @staticmethod
+    def classify(text):
+        content = text.strip()
+        if content.startswith("/"):
+            return "command"
+        if "=" in content:
+            return "assignment"
+        return "expression"
+
+    def __repr__(self):
+        return f"Line {self.kind} {self.text!r}"
+
+
+class Workload:
+    """Seeded synthetic sessions, each one drawing its lines from a Random of its own"""
+
+    MIX = {"expression": 0.6, "assignment": 0.2, "command": 0.02, "invalid": 0.18}
+
+    def __init__(self, seed=0):
+        self.seed = seed
+
+    def operand(self, generator):
+        if generator.random() < 0.5:
+            return generator.choice(VARIABLES + tuple(FORMULAS))
+        return str(generator.randint(1, 99))
+
+    def expression(self, generator):
+        parts = [self.operand(generator)]
+        for _ in range(generator.randint(1, 6)):
+            operator = generator.choice("+-*/")
+            parts += [operator, str(generator.randint(1, 9)) if operator == "/" else self.operand(generator)]
+        cut = generator.randrange(0, len(parts) - 2, 2)
+        if generator.random() < 0.3 and not (cut and parts[cut - 1] == "/"):
+            parts[cut:cut + 3] = [f"({' '.join(parts[cut:cut + 3])})"]
+        return " ".join(parts)
+
+    def invalid(self, generator):
+        name, number = generator.choice(VARIABLES), generator.randint(1, 99)
+        unknown = generator.choice(UNKNOWN)
+        return generator.choice((
+            (f"{name}{number} = {number}", "Invalid identifier"),
+            (f"{name} = {number} = {number}", "Invalid assignment"),
+            (f"{name} = {number} +", "Invalid assignment"),
+            (unknown, "Unknown variable"),
+            (f"{name} = {unknown} + {number}", "Unknown variable"),
+            (f"a = {generator.choice(tuple(FORMULAS))} + {number}", "Cyclic assignment"),
+            (f"{number} *** {name}", "Invalid Expression"),
+            (f"({name} + {number}", "Invalid Expression"),
+            (f"{name} + {number})", "Invalid Expression"),
+            (f"{name} / 0", "Division by zero"),
+            ("/unknown", "Unknown command"),
+        ))
+
+    def session(self, index, lines):
+        generator = random.Random(self.seed * 1000003 + index)
+        session = [Line(f"{name} = {generator.randint(1, 99)}", "assignment") for name in VARIABLES]
+        session += [Line(f"{name} = {formula}", "assignment") for name, formula in FORMULAS.items()]
+        kinds, weights = zip(*self.MIX.items())
+
+        while len(session) < lines:
+            kind = generator.choices(kinds, weights)[0]
+            if kind == "expression":
+                session.append(Line(self.expression(generator), kind))
+            elif kind == "assignment":
+                session.append(Line(f"{generator.choice(VARIABLES)} = {generator.randint(1, 99)}", kind))
+            elif kind == "command":
+                session.append(Line("/help", kind))
+            else:
+                text, expected = self.invalid(generator)
+                session.append(Line(text, kind, expected))
+        return session
+
+    def sessions(self, count, lines):
+        return [self.session(index, lines) for index in range(count)]
+
+
+def load(path):
+    """The sessions of a file of REPL input, every session ending with /exit"""
+    sessions, current = [], []
+    with open(path) as source:
+        for text in source:
+            text = text.rstrip("\n")
+            if text.strip() == "/exit":
+                sessions.append(current)
+                current = []
+            else:
+                current.append(Line(text))
+    if current:
+        sessions.append(current)
+    return sessions
+
+
+def record(path, sessions):
+    with open(path, "w") as target:
+        for session in sessions:
+            target.write("".join(f"{line.text}\n" for line in session) + "/exit\n")
+
+
+def outcome(outputs):
+    """The error message among the output lines of one input, or None"""
+    return next((output for output in outputs if output in MESSAGES), None)
+
+
+def schedule(sessions, rate):
+    """The time every line of every session is due at, relative to the start, or None to send it when answered"""
+    if not rate:
+        return [[None] * len(session) for session in sessions]
+
+    interval = len(sessions) / rate
+    return [[(number + index / len(sessions)) * interval for number in range(len(session))]
+            for index, session in enumerate(sessions)]
+
+
+def inprocess(sessions, due):
+    """Run every session in a Session of this process, always answering the line due first"""
+    results = []
+    states = [Session() for _ in sessions]
+    queue = [(0.0, index, 0) for index, session in enumerate(sessions) if session]
+    heapq.heapify(queue)
+    start = time.perf_counter()
+
+    while queue:
+        _, index, number = heapq.heappop(queue)
+        line, when = sessions[index][number], due[index][number]
+        if when is not None:
+            delay = start + when - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        sent = time.perf_counter() if when is None else start + when
+
+        outputs = []
+        result, error = states[index].process(line.text)
+        if isinstance(error, CustomError):
+            if error.message:
+                outputs.append(error.message)
+        elif isinstance(result, Command):
+            if result.instruction != "exit":
+                CommandCenter(command=result, output=outputs.append, session=states[index]).execute()
+        elif result is not None:
+            outputs.append(str(result))
+        finished = time.perf_counter()
+
+        results.append((line, finished - sent, outcome(outputs)))
+        if number + 1 < len(sessions[index]):
+            following = due[index][number + 1]
+            heapq.heappush(queue, (finished - start if following is None else following, index, number + 1))
+
+    return results, time.perf_counter() - start
+
+
+def exchange(process, text):
+    """Send one input to a REPL process and read its output up to the messages of the marker lines"""
+    process.stdin.write("".join(f"{line}\n" for line in (text, *MARKERS)))
+    process.stdin.flush()
+    outputs = []
+    for output in process.stdout:
+        outputs.append(output.rstrip("\n"))
+        if outputs[-len(DELIMITER):] == DELIMITER:
+            break
+    return outputs[:-len(DELIMITER)]
+
+
+def repl(sessions, due):
+    """Run every session in a REPL process of its own, one thread writing to and reading from each
+
+    Every process has answered a first empty line before the clock starts, so its start-up is not counted.
+    """
+    results = []
+    lock = threading.Lock()
+    environment = dict(os.environ, PYTHONUNBUFFERED="1")
+    processes = [
+        subprocess.Popen(
+            COMMAND, cwd=ROOT, env=environment, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, text=True, bufsize=1
+        )
+        for _ in sessions
+    ]
+    for process in processes:
+        exchange(process, "")
+
+    def drive(process, session, times):
+        answered = []
+        for line, when in zip(session, times):
+            if when is not None:
+                delay = start + when - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            sent = time.perf_counter() if when is None else start + when
+
+            outputs = exchange(process, line.text)
+            answered.append((line, time.perf_counter() - sent, outcome(outputs)))
+
+        process.stdin.write("/exit\n")
+        process.stdin.close()
+        process.wait()
+        with lock:
+            results.extend(answered)
+
+    threads = [threading.Thread(target=drive, args=arguments) for arguments in zip(processes, sessions, due)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - start
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def report(results, elapsed, arguments):
+    """The summary of a run: latency percentiles per kind, throughput and errors"""
+    latencies = {kind: [] for kind in KINDS + ("all",)}
+    errors, unexpected = Counter(), []
+    for line, latency, message in results:
+        latencies[line.kind].append(latency)
+        latencies["all"].append(latency)
+        if message is not None:
+            errors[message] += 1
+        if line.kind == "invalid" and message != line.expected or line.kind != "invalid" and message is not None:
+            if arguments.replay is None:
+                unexpected.append((line.text, line.expected, message))
+
+    summary = {
+        "target": arguments.target, "sessions": arguments.sessions, "seed": arguments.seed, "rate": arguments.rate,
+        "replay": arguments.replay, "lines": len(results), "elapsed": elapsed,
+        "throughput": len(results) / elapsed if elapsed else 0.0,
+        "error_rate": sum(errors.values()) / len(results) if results else 0.0,
+        "errors": dict(errors.most_common()), "unexpected": len(unexpected), "latency": {},
+    }
+    for kind, values in latencies.items():
+        values.sort()
+        summary["latency"][kind] = {
+            "count": len(values), "p50": percentile(values, 0.5), "p90": percentile(values, 0.9),
+            "p99": percentile(values, 0.99), "max": values[-1] if values else 0.0,
+        }
+    return summary, unexpected
+
+
+def display(summary, unexpected):
+    duration = Statistics.duration
+    rate = f"{summary['rate']:.0f} lines/s" if summary["rate"] else "unpaced"
+    source = summary["replay"] or f"seed {summary['seed']}"
+    print(f"target: {summary['target']}, sessions: {summary['sessions']}, {source}, {rate}")
+    print(f"throughput: {summary['throughput']:,.0f} lines/s ({summary['lines']} lines in {summary['elapsed']:.3f}s)")
+    print(f"{'kind':<11} {'count':>7} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}")
+    for kind, latency in summary["latency"].items():
+        print(
+            f"{kind:<11} {latency['count']:>7} " +
+            " ".join(f"{duration(latency[key] * 1e9):>9}" for key in ("p50", "p90", "p99", "max"))
+        )
+    print(f"error rate: {summary['error_rate']:.1%}")
+    for message, count in summary["errors"].items():
+        print(f"  {message:<26} {count:>7}")
+    if unexpected:
+        print(f"unexpected outcomes: {len(unexpected)}")
+        for text, expected, message in unexpected[:5]:
+            print(f"  {text!r}: expected {expected}, got {message}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", choices=("inprocess", "repl"), default="inprocess")
+    parser.add_argument("--sessions", type=int, default=4, help="number of concurrent sessions")
+    parser.add_argument("--lines", type=int, default=1000, help="lines per synthetic session")
+    parser.add_argument("--rate", type=float, default=0, help="lines per second across sessions, 0 for unpaced")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--replay", metavar="FILE", help="replay the sessions of a file instead of synthetic ones")
+    parser.add_argument("--record", metavar="FILE", help="write the sessions to FILE before running them")
+    parser.add_argument("--output", metavar="FILE", help="write the report as JSON")
+    arguments = parser.parse_args()
+
+    if arguments.replay is None:
+        sessions = Workload(arguments.seed).sessions(arguments.sessions, arguments.lines)
+    else:
+        sessions = load(arguments.replay)
+        arguments.sessions = len(sessions)
+    if arguments.record:
+        record(arguments.record, sessions)
+
+    driver = repl if arguments.target == "repl" else inprocess
+    results, elapsed = driver(sessions, schedule(sessions, arguments.rate))
+    summary, unexpected = report(results, elapsed, arguments)
+    display(summary, unexpected)
+
+    if arguments.output:
+        with open(arguments.output, "w") as target:
+            json.dump(summary, target, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""Per-stage benchmark suite for Validator, Tokenizer, Optimizer and Calculator
+
+    python benchmarks/suite.py run [--output results.json] [--repeat 5] [--seed 0]
+    python benchmarks/suite.py compare before.json after.json [--threshold 0.10]
+
+`run` times every stage separately, plus the end-to-end Session path with its cache disabled, over expressions
+generated with a controlled length, nesting depth, operator mix and variable density. `compare` flags every case and
+stage whose best time got slower than the threshold and exits with 1 when it found any.
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from calculator import Calculator, CustomError, Memory, Session  # noqa: E402
+from calculator.optimizers import Optimizer  # noqa: E402
+from calculator.tokens import Tokenizer  # noqa: E402
+from calculator.validators import Validator  # noqa: E402
+
+VARIABLES = ("a", "b", "c", "d", "e")
+CASES = {
+    "short": dict(terms=8, depth=0, operators="+-*/", density=0.25),
+    "sums": dict(terms=200, depth=0, operators="+-", density=0.0),
+    "mixed": dict(terms=200, depth=0, operators="+-*/^", density=0.25),
+    "variables": dict(terms=200, depth=0, operators="+-*/", density=0.9),
+    "nested": dict(terms=200, depth=20, operators="+-*/", density=0.25),
+    "deep": dict(terms=400, depth=150, operators="+-*", density=0.25),
+    "long": dict(terms=5000, depth=10, operators="+-*/^", density=0.25),
+}
+
+
+class Generator:
+    """Generate valid expressions out of a length, a nesting depth, an operator mix and a variable density"""
+
+    def __init__(self, terms, depth, operators, density, seed=0):
+        self.terms = terms
+        self.depth = depth
+        self.operators = operators
+        self.density = density
+        self.random = random.Random(seed)
+
+    def operand(self):
+        if self.random.random() < self.density:
+            return self.random.choice(VARIABLES)
+        return str(self.random.randint(1, 999))
+
+    def chain(self, terms):
+        parts = [self.operand()]
+        previous = None
+        for _ in range(terms - 1):
+            operator = self.random.choice(self.operators)
+            if operator == "^" and previous == "^":
+                operator = "+"
+
+            operand = str(self.random.randint(1, 3)) if operator == "^" else self.operand()
+            parts.append(f"{operator} {operand}")
+            previous = operator
+        return " ".join(parts)
+
+    def expression(self):
+        groups = self.depth + 1
+        size = max(1, self.terms // groups)
+        head = [self.chain(size) for _ in range(groups)]
+        tail = []
+
+        expression = ""
+        for index, group in enumerate(head):
+            if index:
+                operator = self.random.choice(self.operators.replace("^", "") or "+")
+                expression += f" {operator} ({group}"
+                tail.append(")")
+            else:
+                expression = group
+        return expression + "".join(tail)
+
+
+def memory():
+    store = Memory()
+    store.update({name: str(value) for value, name in enumerate(VARIABLES, 2)})
+    return store
+
+
+def measure(function, inputs, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in inputs:
+            try:
+                function(item)
+            except CustomError:
+                pass
+        timings.append((time.perf_counter() - start) / len(inputs))
+    return timings
+
+
+def run_case(name, parameters, repeat, seed, samples=20):
+    store = memory()
+    generator = Generator(seed=seed, **parameters)
+    expressions = [generator.expression() for _ in range(samples)]
+    tokens = [Tokenizer(buffer=expression).tokenize() for expression in expressions]
+    optimized = [Optimizer(buffer=buffer).optimize() for buffer in tokens]
+    session = Session(memory=store, cache_size=0)
+
+    stages = {
+        "validate": (lambda expression: Validator(expression, store).validate(), expressions),
+        "tokenize": (lambda expression: Tokenizer(buffer=expression).tokenize(), expressions),
+        "optimize": (lambda buffer: Optimizer(buffer=buffer).optimize(), tokens),
+        "calculate": (lambda buffer: Calculator(buffer=buffer, memory=store).calculate(), optimized),
+        "end_to_end": (session.process, expressions),
+    }
+
+    results = []
+    for stage, (function, inputs) in stages.items():
+        timings = measure(function, inputs, repeat)
+        results.append({
+            "case": name,
+            "stage": stage,
+            "parameters": parameters,
+            "characters": sum(map(len, expressions)) // len(expressions),
+            "tokens": sum(map(len, tokens)) // len(tokens),
+            "min": min(timings),
+            "mean": statistics.mean(timings),
+            "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            "repeat": repeat,
+        })
+    return results
+
+
+def run(arguments):
+    results = []
+    print(f"{'case':<10} {'stage':<11} {'tokens':>7} {'best':>12} {'mean':>12}")
+    for name, parameters in CASES.items():
+        if arguments.case and name not in arguments.case:
+            continue
+        for result in run_case(name, parameters, arguments.repeat, arguments.seed):
+            results.append(result)
+            print(f"{name:<10} {result['stage']:<11} {result['tokens']:>7} "
+                  f"{result['min'] * 1e6:>10.1f}us {result['mean'] * 1e6:>10.1f}us")
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "seed": arguments.seed,
+        "results": results,
+    }
+    if arguments.output:
+        Path(arguments.output).write_text(json.dumps(report, indent=2))
+        print(f"saved {arguments.output}")
+    return 0
+
+
+def compare(arguments):
+    before = {(r["case"], r["stage"]): r for r in json.loads(Path(arguments.before).read_text())["results"]}
+    after = {(r["case"], r["stage"]): r for r in json.loads(Path(arguments.after).read_text())["results"]}
+
+    regressions = 0
+    print(f"{'case':<10} {'stage':<11} {'before':>12} {'after':>12} {'change':>8}")
+    for key in sorted(before.keys() & after.keys()):
+        old, new = before[key]["min"], after[key]["min"]
+        change = new / old - 1 if old else 0.0
+        flag = ""
+        if change > arguments.threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{key[0]:<10} {key[1]:<11} {old * 1e6:>10.1f}us {new * 1e6:>10.1f}us {change:>+7.1%}{flag}")
+
+    print(f"{regressions} regression(s) beyond {arguments.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runner = commands.add_parser("run", help="time every stage and optionally save the results as JSON")
+    runner.add_argument("--output", metavar="FILE")
+    runner.add_argument("--repeat", type=int, default=5)
+    runner.add_argument("--seed", type=int, default=0)
+    runner.add_argument("--case", action="append", choices=sorted(CASES), help="only run the given case(s)")
+    runner.set_defaults(handler=run)
+
+    comparer = commands.add_parser("compare", help="flag regressions between two saved runs")
+    comparer.add_argument("before")
+    comparer.add_argument("after")
+    comparer.add_argument("--threshold", type=float, default=0.10, help="relative slowdown flagged, 0.10 is 10%%")
+    comparer.set_defaults(handler=compare)
+
+    arguments = parser.parse_args()
+    sys.exit(arguments.handler(arguments))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""A smart calculator, embeddable in-process
+
+    >>> import calculator
+    >>> calculator.evaluate("a * (b + 1)", {"a": 6, "b": 6})
+    42
+
+Every name below is imported from its module on first access, so `import calculator` alone stays cheap.
+"""
+import importlib
+
+EXPORTS = {
+    "evaluate": "calculator",
+    "evaluate_stream": "calculator",
+    "Session": "calculator",
+    "Calculator": "calculator",
+    "ConcurrentMemory": "concurrency",
+    "CustomError": "exceptions",
+    "Governor": "governors",
+    "Memory": "memories",
+    "Snapshot": "snapshots",
+    "Statistics": "instruments",
+}
+
+__all__ = list(EXPORTS)
+
+
+def __getattr__(name):
+    if name not in EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,4 @@
+from .calculator import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import decimal
+from abc import ABC, abstractmethod
+from fractions import Fraction
+from functools import reduce
+from operator import add, mul, sub, truediv
+
+from .exceptions import CustomError
+from .operators import Addition, Subtraction, Multiplication, Division, Exponentiation
+from .streams import OPERATIONS, OPERATORS
+
+
+class Backend(ABC):
+    """The numbers of a session: how literals are read, how operators apply on them and how their size is measured
+
+    `operations` applies an operator on two operands and `runs` on a run of operands, both indexed by opcode.
+    """
+
+    name = None
+    integral = False
+
+    @abstractmethod
+    def number(self, value):
+        """The number of the backend an integer or the text of a literal stands for"""
+
+    @staticmethod
+    def bits(value):
+        return 0
+
+    @staticmethod
+    def failure(error):
+        """The message of an ArithmeticError raised by an operation"""
+        if isinstance(error, (OverflowError, decimal.Overflow)):
+            return "Result too large"
+        return "Undefined result"
+
+    @staticmethod
+    def table(addition, subtraction, multiplication, division, exponentiation):
+        functions = {
+            Addition: addition, Subtraction: subtraction, Multiplication: multiplication, Division: division,
+            Exponentiation: exponentiation,
+        }
+        return tuple(functions.get(operator) for operator in OPERATORS)
+
+    def __reduce__(self):
+        return type(self), ()
+
+    def __repr__(self):
+        return f"Backend {self.name}"
+
+
+class Integer(Backend):
+    """Integers of any size with floor division, the fast path every other part of the calculator is tuned for"""
+
+    name = "int"
+    integral = True
+    operations = OPERATIONS
+    runs = tuple(operator.execute if operator in (Addition, Subtraction, Multiplication, Division) else None
+                 for operator in OPERATORS)
+    bits = staticmethod(int.bit_length)
+
+    def number(self, value):
+        return int(value)
+
+
+class Rational(Backend):
+    """Exact fractions, a power only being computed for an integer exponent"""
+
+    name = "fraction"
+
+    def __init__(self):
+        self.operations = self.table(add, sub, mul, truediv, self.power)
+        self.runs = self.table(
+            lambda *operands: sum(operands),
+            lambda first, *rest: first - sum(rest),
+            lambda *operands: reduce(mul, operands),
+            lambda *operands: reduce(truediv, operands),
+            None,
+        )
+
+    def number(self, value):
+        return Fraction(value)
+
+    @staticmethod
+    def bits(value):
+        return max(value.numerator.bit_length(), value.denominator.bit_length())
+
+    @staticmethod
+    def power(base, exponent):
+        if exponent.denominator != 1:
+            raise CustomError(message="Inexact result")
+        return base ** exponent.numerator
+
+
+class Real(Backend):
+    """Decimal numbers rounded to a number of significant digits"""
+
+    name = "decimal"
+    PRECISION = 28
+
+    def __init__(self, precision=None):
+        self.precision = self.PRECISION if precision is None else precision
+        self.context = context = decimal.Context(prec=self.precision)
+        self.operations = self.table(context.add, context.subtract, context.multiply, context.divide, self.power)
+        self.runs = self.table(
+            lambda *operands: reduce(context.add, operands),
+            lambda *operands: reduce(context.subtract, operands),
+            lambda *operands: reduce(context.multiply, operands),
+            lambda *operands: reduce(context.divide, operands),
+            None,
+        )
+
+    def number(self, value):
+        return self.context.create_decimal(value)
+
+    def power(self, base, exponent):
+        if not base and exponent < 0:
+            raise ZeroDivisionError
+        return self.context.power(base, exponent)
+
+    def __reduce__(self):
+        return type(self), (self.precision,)
+
+
+class Floating(Backend):
+    """Double precision floating point numbers, runs being applied left to right like their operators"""
+
+    name = "float"
+
+    def __init__(self):
+        self.operations = self.table(add, sub, mul, truediv, self.power)
+        self.runs = self.table(
+            lambda *operands: reduce(add, operands),
+            lambda *operands: reduce(sub, operands),
+            lambda *operands: reduce(mul, operands),
+            lambda *operands: reduce(truediv, operands),
+            None,
+        )
+
+    def number(self, value):
+        try:
+            return float(value)
+        except OverflowError:
+            raise CustomError(message="Result too large")
+
+    @staticmethod
+    def power(base, exponent):
+        if base < 0 and not exponent.is_integer():
+            raise CustomError(message="Undefined result")
+        if not base and exponent < 0:
+            raise ZeroDivisionError
+        return base ** exponent
+
+
+BACKENDS = {backend.name: backend for backend in (Integer, Rational, Real, Floating)}
+INTEGER = Integer()
+
+
+def numbers(name=None, precision=None):
+    """The Backend called name, int by default, precision only applying to decimal"""
+    if name is None or name == Integer.name:
+        return INTEGER
+
+    if name not in BACKENDS:
+        raise CustomError(message=f"Unknown numbers {name}")
+    return Real(precision) if name == Real.name else BACKENDS[name]()
@@ -1,85 +1,746 @@
-from collections import deque
+import sys
+import time
+from contextlib import redirect_stdout
+from functools import partial
 
-from commands import Command, CommandCenter
-from digits import Digit
-from exceptions import CustomError
-from memories import Memory
-from operators import Precedence, LeftBracket, RightBracket
-from tokens import Tokenizer
-from validators import Validator
+from .backends import INTEGER, Real, numbers
+from .caches import ExpressionCache
+from .commands import Command, CommandCenter
+from .compilers import compiled
+from .exceptions import CustomError
+from .functions import Call, Frame, Function, Functions
+from .governors import Governor
+from .instruments import Statistics
+from .memories import Memory
+from .optimizers import Optimizer, optimized
+from .histories import History, Reference
+from .streams import DIGIT, VARIABLE, LEFT_BRACKET, RIGHT_BRACKET, REFERENCE, CALL, COMMA, OPERATIONS, OPERATORS
+from .streams import ShuntingYard, TokenStream
+from .tokens import Tokenizer
+from .validators import Validator
 
 
-class Calculator:
-    """A Calculator for parsed mathematical equation based on operand and operator"""
+class Calculator(ShuntingYard):
+    """A Calculator for parsed mathematical equation based on operand and operator
 
-    def __init__(self, buffer):
-        self.buffer = buffer
-        self.__commands = None
-        self.__result = deque()
-        self.__operators = deque()
+    It runs over a TokenStream and dispatches on the opcode of every token through tables indexed by opcode. Any other
+    iterable of tokens, like the generator of `Tokenizer.stream`, is consumed as its tokens arrive.
 
-    @staticmethod
-    def peek(stack):
-        return stack[-1]
+    Operators and brackets are handled by ShuntingYard, shared with the Compiler. A run of the same left-associative
+    operator (`a + b + c`, `a - b - c`, ...) is kept as one operator on the stack with its arity and applied on all of
+    its operands at once, through `sum`, `math.prod` or a left fold.
+
+    Integers run straight through the tables of streams.py, the numbers of any other backend through the tables of
+    the backend, their literals being converted first. An integer TokenStream calculated again and again is compiled
+    to a Python function, run in place of the loop.
+
+    An expression calling the user-defined functions of a session runs through `call` instead, see Frame.
+    """
+
+    def __init__(self, buffer, memory=None, governor=None, history=None, backend=INTEGER, functions=None):
+        self.buffer = TokenStream(buffer) if isinstance(buffer, (list, tuple)) else buffer
+        self.memory = memory
+        self.governor = governor or Governor()
+        self.history = history
+        self.backend = backend
+        self.functions = functions
+        if not backend.integral:
+            self.check = partial(self.governor.check_number, bits=backend.bits)
+            self.reduce = self.calculate_result_stack = self.calculate_numbers
+            self.calculate_run = self.calculate_number_run
+        self.__result = []
+        self.__operators = []
+        self.__arities = []
+
+    def resolve(self, name):
+        value = self.memory.get(name) if self.memory is not None else None
+        if value is None:
+            raise CustomError(message="Unknown variable")
+        return value
+
+    def recall(self, index):
+        if self.history is None:
+            raise CustomError(message="Unknown result")
+        return self.history.get(index)
+
+    def calculate_result_stack(self, opcode, arity=2):
+        if arity > 2:
+            return self.calculate_run(opcode, arity)
+
+        second_operand = self.__result.pop()
+        first_operand = self.__result.pop()
+        self.governor.check(OPERATORS[opcode], first_operand, second_operand)
+        try:
+            result = OPERATIONS[opcode](first_operand, second_operand)
+        except ZeroDivisionError:
+            raise CustomError(message="Division by zero")
+        self.__result.append(result)
+
+    reduce = calculate_result_stack
+
+    def calculate_run(self, opcode, arity):
+        """Apply a run of the same left-associative operator on its last arity operands in one call"""
+        operands = self.__result[-arity:]
+        del self.__result[-arity:]
+
+        self.governor.check_run(OPERATORS[opcode], operands)
+        try:
+            result = INTEGER.runs[opcode](*operands)
+        except ZeroDivisionError:
+            raise CustomError(message="Division by zero")
+        self.__result.append(result)
+
+    def calculate_numbers(self, opcode, arity=2):
+        """calculate_result_stack for the numbers of any backend but int, through the tables of the backend"""
+        if arity > 2:
+            return self.calculate_run(opcode, arity)
 
-    def calculate_result_stack(self, operator):
         second_operand = self.__result.pop()
         first_operand = self.__result.pop()
-        result = operator.execute(first_operand, second_operand)
+        self.check(OPERATORS[opcode], first_operand, second_operand)
+        try:
+            result = self.backend.operations[opcode](first_operand, second_operand)
+        except ZeroDivisionError:
+            raise CustomError(message="Division by zero")
+        except ArithmeticError as error:
+            raise CustomError(message=self.backend.failure(error))
+        self.__result.append(result)
+
+    def calculate_number_run(self, opcode, arity):
+        """calculate_run for the numbers of any backend but int"""
+        operands = self.__result[-arity:]
+        del self.__result[-arity:]
+
+        self.governor.check_run(OPERATORS[opcode], operands, self.backend.bits)
+        try:
+            result = self.backend.runs[opcode](*operands)
+        except ZeroDivisionError:
+            raise CustomError(message="Division by zero")
+        except ArithmeticError as error:
+            raise CustomError(message=self.backend.failure(error))
         self.__result.append(result)
 
     def calculate(self):
-        for v in self.buffer:
-            if isinstance(v, Digit):
-                self.__result.append(v.number)
+        if not isinstance(self.buffer, TokenStream):
+            return self.consume(self.buffer)
+
+        self.governor.start()
+        stream = self.buffer
+        if stream.functions:
+            return self.call(stream)
+        if self.backend.integral:
+            function = compiled(stream)
+            if function is not None:
+                return self.run(function)
+            constants = stream.constants
+        else:
+            constants = list(map(self.backend.number, stream.constants))
+
+        names = stream.names
+        push = self.__result.append
+        operators = self.__operators
+        arities = self.__arities
 
-            elif v == LeftBracket:
-                self.__operators.append(v)
+        for opcode, operand in zip(stream.opcodes, stream.operands):
+            if opcode == DIGIT:
+                push(constants[operand])
 
-            elif v == RightBracket:
-                operator = self.__operators.pop()
+            elif opcode == VARIABLE:
+                push(self.resolve(names[operand]))
 
-                while not operator == LeftBracket:
-                    self.calculate_result_stack(operator=operator)
-                    operator = self.__operators.pop()
+            elif opcode == REFERENCE:
+                push(self.recall(operand))
+
+            elif opcode == LEFT_BRACKET:
+                self.open(opcode, operators, arities)
+
+            elif opcode == RIGHT_BRACKET:
+                self.close(operators, arities)
             else:
-                while len(self.__operators) and Precedence.lte(v, self.peek(self.__operators)):
-                    operator = self.__operators.pop()
-                    self.calculate_result_stack(operator=operator)
+                self.operate(opcode, operators, arities)
+
+        self.finish(operators, arities)
+        return self.__result.pop()
+
+    def call(self, stream):
+        """Calculate a TokenStream calling functions, every call running in a Frame of its own
+
+        Entering a call saves the Frame of the caller on a stack instead of recursing, so only the depth limit of the
+        Functions bounds how deep calls go. A call whose arguments were calculated before, none of the variables the
+        function reads having been written since, takes its result from the cache of the function.
+        """
+        functions = self.functions
+        if functions is None:
+            raise CustomError(message="Unknown function")
+
+        values = self.memory.values if self.memory is not None else None
+        converted = {}
+        frames = []
+        frame = Frame(None, (), stream, self.constants(stream, converted))
+
+        while True:
+            stream, bindings, constants = frame.stream, frame.bindings, frame.constants
+            opcodes, operands = stream.opcodes, stream.operands
+            result, operators, arities = frame.result, frame.operators, frame.arities
+            self.__result, self.__operators, self.__arities = result, operators, arities
+            position, size, called = frame.position, len(opcodes), None
+
+            while position < size:
+                opcode, operand = opcodes[position], operands[position]
+                position += 1
+
+                if opcode == DIGIT:
+                    result.append(constants[operand])
+
+                elif opcode == VARIABLE:
+                    value = bindings.get(stream.names[operand])
+                    result.append(self.resolve(stream.names[operand]) if value is None else value)
 
-                self.__operators.append(v)
+                elif opcode == REFERENCE:
+                    result.append(self.recall(operand))
 
-        while len(self.__operators):
-            operator = self.__operators.pop()
-            self.calculate_result_stack(operator=operator)
+                elif opcode == LEFT_BRACKET:
+                    self.open(opcode, operators, arities)
 
+                elif opcode == CALL:
+                    self.open(opcode, operators, arities)
+                    frame.calls.append(operand)
+
+                elif opcode == COMMA:
+                    self.separate(operators, arities)
+
+                elif opcode == RIGHT_BRACKET:
+                    top, count = self.close(operators, arities)
+                    if top == CALL:
+                        called = self.enter(stream.functions[frame.calls.pop()], count, result, values, converted)
+                        if called is not None:
+                            break
+                else:
+                    self.operate(opcode, operators, arities)
+
+            frame.position = position
+            if called is not None:
+                if len(frames) >= functions.depth:
+                    raise CustomError(message="Recursion limit exceeded")
+                frames.append(frame)
+                frame = called
+                continue
+
+            self.finish(operators, arities)
+            value = result.pop()
+
+            if not frames:
+                return value
+            frame.function.store(frame.arguments, values, value)
+            frame = frames.pop()
+            frame.result.append(value)
+
+    def enter(self, name, count, result, values, converted):
+        """The Frame of a call on the last count operands of result, or None when its result was cached and pushed"""
+        function = self.functions.get(name)
+        if count != len(function.parameters):
+            raise CustomError(message="Wrong number of arguments")
+
+        arguments = tuple(result[-count:])
+        del result[-count:]
+
+        entry = function.lookup(arguments, values, self.functions.variables(function))
+        if entry is not None:
+            result.append(entry[1])
+            return None
+        return Frame(function, arguments, function.body, self.constants(function.body, converted))
+
+    def constants(self, stream, converted):
+        """The constants of stream in the numbers of the backend, converted once per calculation"""
+        if self.backend.integral:
+            return stream.constants
+
+        constants = converted.get(id(stream))
+        if constants is None:
+            constants = converted[id(stream)] = list(map(self.backend.number, stream.constants))
+        return constants
+
+    def run(self, function):
+        """Calculate through the function the TokenStream was compiled to"""
+        try:
+            return function(self.resolve, self.recall, self.governor.check, self.governor.check_run)
+        except ZeroDivisionError:
+            raise CustomError(message="Division by zero")
+
+    def consume(self, tokens):
+        """Calculate over tokens as they arrive, keeping nothing but the operand and operator stacks
+
+        A run being applied every RUN operands, memory is bounded by the nesting depth of the expression alone.
+        """
+        self.governor.start()
+        push = self.__result.append
+        operators = self.__operators
+        arities = self.__arities
+        integral, number = self.backend.integral, self.backend.number
+
+        for token in tokens:
+            opcode = token.opcode
+            if opcode == DIGIT:
+                push(token.number if integral else number(token.number))
+
+            elif opcode == VARIABLE:
+                push(self.resolve(token.variable))
+
+            elif opcode == REFERENCE:
+                push(self.recall(token.index))
+
+            elif opcode == LEFT_BRACKET:
+                self.open(opcode, operators, arities)
+
+            elif opcode == RIGHT_BRACKET:
+                self.close(operators, arities)
+
+            elif opcode == CALL or opcode == COMMA:
+                raise CustomError(message="Unknown function")
+            else:
+                self.operate(opcode, operators, arities)
+
+        self.finish(operators, arities)
         return self.__result.pop()
 
 
-def main():
-    memory = Memory()
+class Session:
+    """A calculator session that runs every line through the same Memory and expression cache
+
+    Every result is kept in a bounded History, referred to as `$n` or `$_`, and memoized on its cached TokenStream
+    until one of the variables it read changes. A cached TokenStream is only optimized once it is calculated again.
+    With stats, every stage of process is timed into a Statistics, without it the stages cost one `is None` check.
+
+    The numbers of the session are those of backend, the backend of memory when it is not given. Its functions keep
+    up to function_cache results each and calls nest up to max_depth deep.
+    """
+
+    def __init__(self, memory=None, cache_size=1024, governor=None, stats=None, history_size=1000, backend=None,
+                 function_cache=None, max_depth=None):
+        self.memory = memory if memory is not None else Memory(backend=backend, governor=governor)
+        self.backend = backend or self.memory.backend
+        self.cache = ExpressionCache(maxsize=cache_size)
+        self.governor = self.memory.governor = governor or self.memory.governor
+        self.stats = stats
+        self.history = History(maxsize=history_size)
+        self.functions = Functions(cache_size=function_cache, depth=max_depth)
+
+    def resolve_references(self, assignment):
+        """Replace the formulas of an assignment that read the History or call functions by their value
+
+        Neither is tracked by the dependency graph of the Memory, so such a formula is fixed to its value when assigned.
+        """
+        for key, value in assignment.items():
+            if isinstance(value, Tokenizer) and any(isinstance(token, (Reference, Call)) for token in value.tokens):
+                calculator = Calculator(
+                    buffer=TokenStream(value.tokens), memory=self.memory, governor=self.governor,
+                    history=self.history, backend=self.backend, functions=self.functions
+                )
+                assignment[key] = calculator.calculate()
+        return assignment
+
+    def compile(self, tokens):
+        return TokenStream(Optimizer(buffer=tokens, governor=self.governor, backend=self.backend).optimize())
+
+    def define(self, function):
+        """Compile the body of a Function and define it, every function cache being cleared"""
+        function.body = self.compile(function.tokenizer.tokenize())
+        self.functions.define(function)
+
+    def process(self, user_input):
+        stats = self.stats
+        if stats is not None:
+            stats.lines += 1
+
+        content = ExpressionCache.normalize(user_input)
+        tokens = self.cache.get(content)
+
+        if tokens is None:
+            start = stats and stats.clock()
+            success, error = Validator(user_input, self.memory, stats, not self.backend.integral).validate()
+            if stats is not None:
+                stats.record("validate", start)
+
+            if isinstance(error, CustomError):
+                if stats is not None:
+                    stats.fail(error)
+                return Validator.format(error=error)
+
+            if isinstance(success, Function):
+                self.define(success)
+                return Validator.format()
+
+            if isinstance(success, dict):
+                start = stats and stats.clock()
+                try:
+                    self.memory.update(self.resolve_references(success))
+                except CustomError as error:
+                    if stats is not None:
+                        stats.fail(error)
+                    return Validator.format(error=error)
+                if stats is not None:
+                    stats.record("assign", start)
+                return Validator.format()
+
+            if not isinstance(success, Tokenizer):
+                return Validator.format(success=success)
+
+            if stats is not None:
+                stats.tokens.record(len(success.tokens))
+            tokens = TokenStream(success.tokenize())
+            self.cache.put(content, tokens)
+        else:
+            if stats is not None:
+                stats.hits += 1
+            if not tokens.optimized and tokens.evaluations >= Optimizer.THRESHOLD:
+                start = stats and stats.clock()
+                tokens = optimized(tokens, self.governor, self.backend)
+                if stats is not None:
+                    stats.record("optimize", start)
+                self.cache.put(content, tokens)
+
+        values = self.memory.values
+        if tokens.memo is not None and not values.changed(tokens.names, tokens.memo[0]):
+            result = tokens.memo[1]
+            if stats is not None:
+                stats.memoized += 1
+            self.history.append(result)
+            return Validator.format(success=result)
+
+        if stats is not None:
+            start = stats.clock()
+
+        version = values.version
+        calculator = Calculator(
+            buffer=tokens, memory=self.memory, governor=self.governor, history=self.history, backend=self.backend,
+            functions=self.functions
+        )
+        try:
+            result = calculator.calculate()
+        except CustomError as error:
+            if stats is not None:
+                stats.fail(error)
+            return Validator.format(error=error)
+
+        if stats is not None:
+            stats.record("calculate", start)
+        if not tokens.volatile:
+            tokens.memo = (version, result)
+        self.history.append(result)
+        return Validator.format(success=result)
+
+
+def as_memory(memory, backend=None, governor=None):
+    """The given Memory, or a new one holding the values of a mapping"""
+    if isinstance(memory, Memory):
+        return memory
+
+    values, memory = memory, Memory(backend=backend, governor=governor)
+    if values:
+        memory.update(dict(values))
+    return memory
+
+
+def evaluate(expression, memory=None, governor=None, backend=None):
+    """Evaluate one line in-process against a Memory, or a mapping of variable values, raising a CustomError on failure
+
+    Assignments update the Memory and return None, commands are rejected since there is no REPL to run them in.
+    backend is a Backend or the name of one (`fraction`, `decimal`, `float`), integers by default.
+    """
+    backend = numbers(backend) if backend is None or isinstance(backend, str) else backend
+    memory = as_memory(memory, backend, governor)
+    result, error = Session(memory=memory, cache_size=0, governor=governor, backend=backend).process(expression)
+
+    if isinstance(error, CustomError):
+        if error.message:
+            raise error
+        return None
+
+    if isinstance(result, Command):
+        raise CustomError(message="Unknown command")
+
+    return result
+
+
+def chunks(stream, size=1 << 16):
+    """Read a text stream size characters at a time"""
+    return iter(lambda: stream.read(size), "")
+
+
+def evaluate_stream(stream, memory=None, governor=None, size=1 << 16, backend=None):
+    """Evaluate one expression read from a text stream in chunks of size characters, raising a CustomError on failure
+
+    Tokens are validated and calculated as they are read, so memory is bounded by the nesting depth of the expression
+    and the chunk size, not by its length. The expression may span lines.
+    """
+    backend = numbers(backend) if backend is None or isinstance(backend, str) else backend
+    tokens = Tokenizer.stream(chunks(stream, size), decimals=not backend.integral)
+    return Calculator(
+        buffer=tokens, memory=as_memory(memory, backend, governor), governor=governor, backend=backend
+    ).calculate()
+
+
+def batch(stream, output=None, errors=None, buffer_size=1 << 16, cache_size=1024, governor=None, stats=None,
+          history_size=1000, backend=None, function_cache=None, max_depth=None):
+    """Evaluate every line of a stream, writing results through a single buffered writer"""
+    output = output or open(sys.stdout.fileno(), "w", buffering=buffer_size, closefd=False)
+    errors = errors or sys.stderr
+    session = Session(
+        cache_size=cache_size, governor=governor, stats=stats, history_size=history_size, backend=backend,
+        function_cache=function_cache, max_depth=max_depth
+    )
+    write = output.write
+    lines = failures = 0
+    start = time.perf_counter()
+
+    with redirect_stdout(output):
+        for lines, line in enumerate(stream, 1):
+            result, error = session.process(line.rstrip("\n"))
+
+            if isinstance(error, CustomError):
+                if error.message:
+                    failures += 1
+                    location = f"{lines}:{error.column}" if error.column else f"{lines}"
+                    errors.write(f"{location}: {error.message}\n")
+                continue
+
+            if isinstance(result, Command):
+                if result.instruction == "exit":
+                    break
+                CommandCenter(command=result, session=session).execute()
+                continue
+
+            if result is not None:
+                write(f"{result}\n")
+
+    output.flush()
+    elapsed = time.perf_counter() - start
+    rate = lines / elapsed if elapsed else 0.0
+    errors.write(f"{lines} lines in {elapsed:.3f}s ({rate:.0f} lines/s, {failures} errors)\n")
+    errors.write(f"{session.cache}\n")
+    if stats is not None:
+        errors.write(f"{stats.summary()}\n")
+
+    return lines, failures, elapsed
+
+
+def vectorize(expression, path, overflow="promote", output=None, buffer_size=1 << 16, governor=None):
+    """Evaluate one expression over the columns of a CSV file, writing one result, or the error of the row, per row"""
+    from .vectors import VectorCalculator, load_columns
+
+    output = output or open(sys.stdout.fileno(), "w", buffering=buffer_size, closefd=False)
+
+    try:
+        tokens = Optimizer(buffer=Tokenizer(buffer=expression).tokenize(), governor=governor).optimize()
+        calculator = VectorCalculator(buffer=tokens, columns=load_columns(path), overflow=overflow, governor=governor)
+        results = calculator.calculate()
+    except CustomError as error:
+        error.display()
+        return None
+
+    errors = calculator.errors
+    output.write("".join(f"{errors.get(row, result)}\n" for row, result in enumerate(results.tolist())))
+    output.flush()
+    return results
+
+
+def streaming(path, size=1 << 16, governor=None, backend=None):
+    """Print the value of the expression of a file, or stdin for -, evaluated while it is being read"""
+    try:
+        if path == "-":
+            result = evaluate_stream(sys.stdin, size=size, governor=governor, backend=backend)
+        else:
+            with open(path) as source:
+                result = evaluate_stream(source, size=size, governor=governor, backend=backend)
+    except CustomError as error:
+        location = f"{error.column}: " if error.column else ""
+        print(f"{location}{error.message}", file=sys.stderr)
+        return None
+
+    print(result)
+    return result
+
+
+def repl(governor=None, stats=None, history_size=1000, backend=None, function_cache=None, max_depth=None):
+    session = Session(
+        governor=governor, stats=stats, history_size=history_size, backend=backend, function_cache=function_cache,
+        max_depth=max_depth
+    )
     while True:
         user_input = input()
 
-        success, error = Validator(user_input, memory).validate()
+        result, error = session.process(user_input)
 
         if isinstance(error, CustomError):
             error.display()
             continue
 
-        if isinstance(success, Command):
-            command_center = CommandCenter(command=success)
+        if isinstance(result, Command):
+            command_center = CommandCenter(command=result, session=session)
             command_center.execute()
+            continue
 
-        if isinstance(success, dict):
-            memory.update(success)
+        if result is not None:
+            print(result)
 
-        if isinstance(success, Tokenizer):
-            parsed_tokens = success.tokenize()
 
-            calculator = Calculator(buffer=parsed_tokens)
-            result = calculator.calculate()
-            print(result)
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="A smart calculator")
+    parser.add_argument(
+        "--batch", nargs="?", const="-", metavar="FILE",
+        help="evaluate FILE (or stdin) line by line without prompting"
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=1024, metavar="N",
+        help="number of parsed expressions kept in the batch expression cache"
+    )
+    parser.add_argument(
+        "--vectorize", metavar="EXPRESSION",
+        help="evaluate EXPRESSION once over every row of the --columns CSV file"
+    )
+    parser.add_argument("--columns", metavar="FILE", help="CSV file with one column of integers per variable")
+    parser.add_argument(
+        "--overflow", default="promote", metavar="POLICY",
+        help="what to do when an int64 operation of --vectorize overflows: promote, raise or wrap"
+    )
+    parser.add_argument(
+        "--max-bits", type=int, default=Governor.MAX_BITS, metavar="BITS",
+        help="reject powers and products whose result would exceed BITS bits"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=Governor.TIMEOUT, metavar="SECONDS",
+        help="reject an expression still being calculated after SECONDS, 0 disables the limit"
+    )
+    parser.add_argument(
+        "--workers", type=int, metavar="N",
+        help="evaluate the --batch input in a pool of N processes (0 for one per core)"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=1024, metavar="LINES",
+        help="number of expression lines shipped to a worker at once"
+    )
+    parser.add_argument(
+        "--stream", metavar="FILE",
+        help="evaluate the single expression of FILE (- for stdin) while it is being read, for very large inputs"
+    )
+    parser.add_argument(
+        "--read-size", type=int, default=1 << 16, metavar="CHARACTERS",
+        help="size of the chunks --stream reads at once"
+    )
+    parser.add_argument(
+        "--watch", metavar="FILE",
+        help="evaluate FILE as a sheet and re-evaluate the lines an edit affects whenever it changes"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=0.5, metavar="SECONDS",
+        help="how often --watch checks FILE for changes"
+    )
+    parser.add_argument("--serve", type=int, metavar="PORT", help="serve the REPL line protocol on a TCP port")
+    parser.add_argument("--host", default="127.0.0.1", help="address the --serve server listens on")
+    parser.add_argument("--socket", metavar="PATH", help="serve the REPL line protocol on a Unix socket")
+    parser.add_argument(
+        "--max-connections", type=int, default=1024, metavar="N",
+        help="turn away connections to the server above N"
+    )
+    parser.add_argument(
+        "--history-size", type=int, default=1000, metavar="N",
+        help="number of results kept for $n references and /history"
+    )
+    parser.add_argument(
+        "--numbers", default="int", metavar="BACKEND",
+        help="numbers to calculate with: int (floor division), fraction, decimal or float"
+    )
+    parser.add_argument(
+        "--precision", type=int, default=Real.PRECISION, metavar="DIGITS",
+        help="significant digits of --numbers decimal"
+    )
+    parser.add_argument(
+        "--function-cache", type=int, default=Functions.CACHE_SIZE, metavar="N",
+        help="number of results memoized per user-defined function, 0 disables memoization"
+    )
+    parser.add_argument(
+        "--max-depth", type=int, default=Functions.DEPTH, metavar="N",
+        help="reject calls of user-defined functions nested deeper than N"
+    )
+    parser.add_argument(
+        "--stats", action="store_true",
+        help="time the validate, tokenize, optimize and calculate stages, reported by /stats"
+    )
+    args = parser.parse_args()
+    if args.vectorize is not None and args.columns is None:
+        parser.error("--vectorize requires --columns")
+
+    if hasattr(sys, "set_int_max_str_digits"):
+        sys.set_int_max_str_digits(0)
+    governor = Governor(max_bits=args.max_bits, timeout=args.timeout)
+    stats = Statistics() if args.stats else None
+    try:
+        backend = numbers(args.numbers, args.precision)
+    except CustomError as error:
+        return error.display()
+
+    if args.serve is not None or args.socket:
+        from .servers import Server
+
+        return Server(
+            session=lambda: Session(
+                cache_size=args.cache_size, governor=Governor(args.max_bits, args.timeout),
+                stats=Statistics() if args.stats else None, history_size=args.history_size, backend=backend,
+                function_cache=args.function_cache, max_depth=args.max_depth
+            ),
+            host=args.host, port=args.serve, path=args.socket, max_connections=args.max_connections,
+            workers=args.workers or None
+        ).run()
+
+    if args.watch is not None:
+        from .watchers import Watcher
+
+        return Watcher(
+            args.watch,
+            session=lambda: Session(
+                cache_size=args.cache_size, governor=governor, history_size=args.history_size, backend=backend,
+                function_cache=args.function_cache, max_depth=args.max_depth
+            ),
+            interval=args.interval
+        ).run()
+
+    if args.stream is not None:
+        return streaming(args.stream, size=args.read_size, governor=governor, backend=backend)
+
+    if args.vectorize is not None:
+        return vectorize(args.vectorize, args.columns, overflow=args.overflow, governor=governor)
+
+    if args.batch is None:
+        return repl(
+            governor=governor, stats=stats, history_size=args.history_size, backend=backend,
+            function_cache=args.function_cache, max_depth=args.max_depth
+        )
+
+    if args.workers is not None:
+        from .parallel import ParallelBatch
+
+        parallel = ParallelBatch(
+            workers=args.workers, chunk_size=args.chunk_size, cache_size=args.cache_size, governor=governor,
+            history_size=args.history_size, backend=backend, function_cache=args.function_cache,
+            max_depth=args.max_depth
+        )
+        if args.batch == "-":
+            return parallel.run(sys.stdin)
+
+        with open(args.batch) as stream:
+            return parallel.run(stream)
+
+    if args.batch == "-":
+        return batch(
+            sys.stdin, cache_size=args.cache_size, governor=governor, stats=stats, history_size=args.history_size,
+            backend=backend, function_cache=args.function_cache, max_depth=args.max_depth
+        )
 
+    with open(args.batch) as stream:
+        return batch(
+            stream, cache_size=args.cache_size, governor=governor, stats=stats, history_size=args.history_size,
+            backend=backend, function_cache=args.function_cache, max_depth=args.max_depth
+        )
 
-main()
@@ -1,12 +1,20 @@
+from .exceptions import CustomError
+
+
 class Command:
     """A basic list of command as methods"""
 
-    def __init__(self, instruction):
+    INSTRUCTIONS = ("help", "exit", "stats", "history", "functions", "save", "load")
+    MUTATING = ("load",)
+    LOCAL = ("save", "load")
+
+    def __init__(self, instruction, arguments=()):
         self.instruction = instruction
+        self.arguments = list(arguments)
 
     @staticmethod
-    def help():
-        print(
+    def help(output=print, session=None):
+        output(
             f"""
                 A smart calculator that evaluates results based on inputs, possible inputs:
                 - Integer value (positive or negative)
@@ -17,6 +25,12 @@ class Command:
                     - Variable Assignment
                     - Variable Equation (Sum and Substract)
                 - /help
+                - Previous results as $1, $2, ... and the last one as $_
+                - /history
+                - Functions as f(x, y) = x ^ 2 + y, called as f(2, 3)
+                - /functions, /functions clear
+                - /stats, /stats reset
+                - /save FILE, /load FILE
                 - /exit
 
                 Validation is included for a non operator and non digit
@@ -24,29 +38,90 @@ class Command:
         )
 
     @staticmethod
-    def error():
-        print("Unknown command")
+    def error(output=print, session=None):
+        output("Unknown command")
 
     @staticmethod
-    def exit():
-        print("Bye!")
+    def exit(output=print, session=None):
+        output("Bye!")
         exit()
 
+    def stats(self, output=print, session=None):
+        stats = getattr(session, "stats", None)
+        if stats is None:
+            output("Statistics are disabled, start with --stats")
+        elif self.arguments == ["reset"]:
+            stats.reset()
+            output("Statistics reset")
+        elif self.arguments:
+            self.error(output)
+        else:
+            output(stats.summary())
+
+    def history(self, output=print, session=None):
+        if self.arguments or session is None:
+            return self.error(output)
+
+        for index, result in session.history.items():
+            output(f"${index}: {result}")
+
+    def functions(self, output=print, session=None):
+        functions = getattr(session, "functions", None)
+        if functions is None:
+            return self.error(output)
+
+        if self.arguments == ["clear"]:
+            functions.clear()
+            output("Function caches cleared")
+        elif self.arguments:
+            self.error(output)
+        elif not functions:
+            output("No functions")
+        else:
+            for function in functions:
+                output(function.summary())
+
+    def save(self, output=print, session=None):
+        if len(self.arguments) != 1 or session is None:
+            return self.error(output)
+
+        try:
+            count = session.memory.save(self.arguments[0])
+        except OSError:
+            return output("Cannot write snapshot")
+        except CustomError as error:
+            return output(error.message)
+        output(f"Saved {count} variables")
+
+    def load(self, output=print, session=None):
+        if len(self.arguments) != 1 or session is None:
+            return self.error(output)
+
+        try:
+            count = session.memory.load(self.arguments[0])
+        except OSError:
+            return output("Cannot read snapshot")
+        except CustomError as error:
+            return output(error.message)
+        output(f"Loaded {count} variables")
+
     def __repr__(self):
-        return f"Command {self.instruction}"
+        return f"Command {' '.join([self.instruction] + self.arguments)}"
 
 
 class CommandCenter:
-    """Execute commands based on parsed result"""
+    """Execute commands based on parsed result, writing what they print through output"""
 
-    def __init__(self, command):
+    def __init__(self, command, output=print, session=None):
         self.command = command
+        self.output = output
+        self.session = session
 
     def execute(self):
         if self.command:
-            try:
-                getattr(self.command, self.command.instruction)()
-            except AttributeError:
-                self.command.error()
+            if self.command.instruction in self.command.INSTRUCTIONS:
+                getattr(self.command, self.command.instruction)(self.output, self.session)
+            else:
+                self.command.error(self.output, self.session)
         else:
             pass
@@ -0,0 +1,156 @@
+import threading
+from functools import lru_cache
+
+from .calculator import Calculator
+from .governors import Governor
+from .memories import Memory
+from .optimizers import Optimizer
+from .streams import TokenStream
+from .tokens import Tokenizer
+
+PAGE_BITS = 6
+PAGE_SIZE = 1 << PAGE_BITS
+PAGE_MASK = PAGE_SIZE - 1
+
+
+class View:
+    """One immutable version of the values of a ConcurrentMemory, read by any number of threads at once
+
+    Values are kept by symbol id in pages of PAGE_SIZE entries, a persistent vector: the next version only copies the
+    pages holding a written value and shares every other page with this one. The symbol table is shared by every
+    version, a name interned after this one was published having an id past its `size`.
+    """
+
+    __slots__ = ("symbols", "pages", "size", "version")
+
+    def __init__(self, symbols, pages, size, version):
+        self.symbols = symbols
+        self.pages = pages
+        self.size = size
+        self.version = version
+
+    @staticmethod
+    def build(values):
+        """The View of every value of a Values store"""
+        size = len(values.symbols)
+        pages = tuple(
+            tuple(values[name] for name in values.symbols.names[start:min(start + PAGE_SIZE, size)])
+            for start in range(0, size, PAGE_SIZE)
+        )
+        return View(values.symbols, pages, size, values.version)
+
+    def evolve(self, values, names):
+        """The View of values after names, and any name interned since this View, were written"""
+        size = len(values.symbols)
+        numbers = {values.ids[name] for name in names if name in values.ids}
+        numbers.update(range(self.size, size))
+
+        pages, copied = list(self.pages), {}
+        for number in numbers:
+            if number < self.size and values.versions[number] <= self.version:
+                continue
+
+            index = number >> PAGE_BITS
+            page = copied.get(index)
+            if page is None:
+                page = copied[index] = list(pages[index]) if index < len(pages) else []
+            offset = number & PAGE_MASK
+            if offset >= len(page):
+                page.extend([None] * (offset + 1 - len(page)))
+            page[offset] = values[values.symbols.names[number]]
+
+        for index in sorted(copied):
+            if index == len(pages):
+                pages.append(())
+            pages[index] = tuple(copied[index])
+        return View(self.symbols, tuple(pages), size, values.version)
+
+    def get(self, key, default=None):
+        number = self.symbols.ids.get(key)
+        if number is None or number >= self.size:
+            return default
+        return self.pages[number >> PAGE_BITS][number & PAGE_MASK]
+
+    @property
+    def values(self):
+        """The View itself, read like the Values of a Memory by the caches of functions"""
+        return self
+
+    def changed(self, names, version):
+        """Whether anything was written between version and this View, names being ignored"""
+        return version != self.version
+
+    def __contains__(self, key):
+        number = self.symbols.ids.get(key)
+        return number is not None and number < self.size
+
+    def __len__(self):
+        return self.size
+
+    def items(self):
+        for number, name in enumerate(self.symbols.names[:self.size]):
+            yield name, self.pages[number >> PAGE_BITS][number & PAGE_MASK]
+
+    def __repr__(self):
+        return f"View {self.size} variables at version {self.version}"
+
+
+@lru_cache(maxsize=1024)
+def parse(expression, backend):
+    """The TokenStream of an expression, shared by every thread calculating it"""
+    tokens = Tokenizer(buffer=expression, decimals=not backend.integral).tokenize()
+    return TokenStream(Optimizer(buffer=tokens, backend=backend).optimize())
+
+
+class ConcurrentMemory:
+    """A Memory shared between threads: readers calculate against immutable Views while writers publish new ones
+
+    Writers take turns on a lock to update one Memory, formulas being recomputed as usual, then publish the View of
+    the values it holds afterwards. Readers never take the lock: `view` is a single attribute read and a whole
+    expression is calculated against the View it started with, whatever is published meanwhile.
+
+    The symbol table is shared with the readers and only ever grows under the lock, one dict insertion at a time.
+    """
+
+    def __init__(self, backend=None, governor=None):
+        self.memory = Memory(backend=backend, governor=governor)
+        self.backend = self.memory.backend
+        self.governor = self.memory.governor
+        self.lock = threading.Lock()
+        self.current = View.build(self.memory.values)
+
+    def view(self):
+        return self.current
+
+    def get(self, key):
+        return self.current.get(key)
+
+    def update(self, args):
+        """Assign literals or formulas like `Memory.update`, publish the new View and return the formulas recomputed"""
+        with self.lock:
+            memory = self.memory
+            try:
+                return memory.update(args)
+            finally:
+                written = {name for key in args for name in memory.downstream(key)}
+                self.current = self.current.evolve(memory.values, written)
+
+    def restore(self, values):
+        """Replace every variable by those of a mapping and publish their View"""
+        with self.lock:
+            self.memory.restore(values)
+            self.current = View.build(self.memory.values)
+
+    def snapshot(self):
+        return dict(self.current.items())
+
+    def evaluate(self, expression, view=None):
+        """Calculate an expression against view, the current View by default, raising a CustomError on failure"""
+        governor = Governor(max_bits=self.governor.max_bits, timeout=self.governor.timeout)
+        return Calculator(
+            buffer=parse(expression, self.backend), memory=self.current if view is None else view, governor=governor,
+            backend=self.backend
+        ).calculate()
+
+    def __repr__(self):
+        return f"ConcurrentMemory {self.current!r}"
@@ -1,8 +1,14 @@
+from decimal import Decimal
+
+
 class Digit:
-    """A representation of digit"""
+    """A representation of digit, a literal with a decimal point being kept exactly as a Decimal"""
+
+    __slots__ = ("number",)
+    opcode = 0
 
     def __init__(self, number):
-        self.number = int(number)
+        self.number = Decimal(number) if isinstance(number, str) and "." in number else int(number)
 
     def __repr__(self):
         return f"Digit {self.number}"
@@ -1,8 +1,10 @@
-class CustomError:
-    """A representation of errors"""
+class CustomError(Exception):
+    """A representation of errors, optionally pointing at the column where they happened"""
 
-    def __init__(self, message):
+    def __init__(self, message, column=None):
+        super().__init__(message)
         self.message = message
+        self.column = column
 
     def display(self):
         if self.message:
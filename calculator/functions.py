@@ -0,0 +1,179 @@
+import re
+from collections import OrderedDict
+
+from .exceptions import CustomError
+
+DEFINITION = re.compile(r"\s*([A-Za-z]+)\(([^()]*)\)\s*$")
+
+
+class Call:
+    """The call of a function by name, `f(`, opening the bracket its arguments are written in"""
+
+    __slots__ = ("name",)
+    opcode = 10
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"Call {self.name}"
+
+    def __str__(self):
+        return f"{self.name}("
+
+
+class Comma:
+    """The separator of the arguments of a Call"""
+
+    opcode = 11
+
+    def __repr__(self):
+        return "Comma"
+
+
+class Function:
+    """A user-defined function, `f(x, y) = x ^ 2 + y`, with a bounded memoization cache keyed by its arguments
+
+    A cached result is kept with the version of the Values it was calculated against and only returned while none of
+    the variables read by the function, or by the functions it calls, has been written since.
+    """
+
+    def __init__(self, name, parameters, tokenizer):
+        self.name = name
+        self.parameters = tuple(parameters)
+        self.tokenizer = tokenizer
+        self.body = None
+        self.maxsize = 0
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def parse(key):
+        """The name and parameters of the left side of a definition, or None when it is not one"""
+        match = DEFINITION.match(key)
+        if match is None:
+            return None
+        return match.group(1), [parameter.strip() for parameter in match.group(2).split(",")]
+
+    @property
+    def text(self):
+        return f"{self.name}({', '.join(self.parameters)}) = {self.tokenizer.buffer.strip()}"
+
+    def lookup(self, arguments, values, reads):
+        entry = self.cache.get(arguments)
+        if entry is None or values is None or values.changed(reads, entry[0]):
+            self.misses += 1
+            return None
+
+        self.cache.move_to_end(arguments)
+        self.hits += 1
+        return entry
+
+    def store(self, arguments, values, result):
+        if self.maxsize <= 0 or values is None:
+            return
+
+        self.cache[arguments] = (values.version, result)
+        self.cache.move_to_end(arguments)
+        while len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.cache.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def summary(self):
+        calls = self.hits + self.misses
+        rate = self.hits / calls if calls else 0.0
+        return (
+            f"{self.text}  (cache {len(self.cache)}/{self.maxsize}, hits {self.hits}, misses {self.misses}, "
+            f"hit rate {rate:.1%})"
+        )
+
+    def __repr__(self):
+        return f"Function {self.text}"
+
+
+class Frame:
+    """The state of one call being calculated: where its body is at, the values of its parameters and its stacks"""
+
+    __slots__ = ("function", "arguments", "stream", "constants", "bindings", "position", "result", "operators",
+                 "arities", "calls")
+
+    def __init__(self, function, arguments, stream, constants):
+        self.function = function
+        self.arguments = arguments
+        self.stream = stream
+        self.constants = constants
+        self.bindings = dict(zip(function.parameters, arguments)) if function is not None else {}
+        self.position = 0
+        self.result = []
+        self.operators = []
+        self.arities = []
+        self.calls = []
+
+    def __repr__(self):
+        return f"Frame {self.function.name if self.function is not None else '<expression>'} at {self.position}"
+
+
+class Functions:
+    """The functions of a session by name, with the depth limit of the calls between them
+
+    Defining a function clears every cache, since any of them may call it, as well as the sets of variables read.
+    """
+
+    CACHE_SIZE = 128
+    DEPTH = 1000
+
+    def __init__(self, cache_size=None, depth=None):
+        self.cache_size = self.CACHE_SIZE if cache_size is None else cache_size
+        self.depth = self.DEPTH if depth is None else depth
+        self.functions = {}
+        self.reads = {}
+
+    def define(self, function):
+        function.maxsize = self.cache_size
+        self.functions[function.name] = function
+        self.reads = {}
+        for defined in self.functions.values():
+            defined.cache.clear()
+
+    def get(self, name):
+        function = self.functions.get(name)
+        if function is None:
+            raise CustomError(message="Unknown function")
+        return function
+
+    def variables(self, function):
+        """The variables read by function and every function it may call, parameters aside"""
+        reads = self.reads.get(function.name)
+        if reads is not None:
+            return reads
+
+        reads, seen, stack = set(), {function.name}, [function]
+        while stack:
+            current = stack.pop()
+            reads.update(name for name in current.body.names if name not in current.parameters)
+            for name in current.body.functions:
+                if name not in seen and name in self.functions:
+                    seen.add(name)
+                    stack.append(self.functions[name])
+
+        reads = self.reads[function.name] = tuple(reads)
+        return reads
+
+    def clear(self):
+        for function in self.functions.values():
+            function.clear()
+
+    def __iter__(self):
+        return iter(self.functions.values())
+
+    def __len__(self):
+        return len(self.functions)
+
+    def __repr__(self):
+        return f"Functions {len(self.functions)} defined"
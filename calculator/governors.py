@@ -0,0 +1,79 @@
+import math
+import time
+
+from .exceptions import CustomError
+from .operators import Exponentiation, Multiplication
+
+
+class Governor:
+    """A budget on the bit length of computed results and on the wall-clock time spent on one expression
+
+    The size of a power or product is estimated before it is computed, so an input like `9 ^ 9 ^ 9` is rejected
+    instead of locking the process. The deadline covers everything else an expression may spend its time on.
+    """
+
+    MAX_BITS = 1 << 16
+    TIMEOUT = 2.0
+
+    def __init__(self, max_bits=None, timeout=None):
+        self.max_bits = self.MAX_BITS if max_bits is None else max_bits
+        self.timeout = self.TIMEOUT if timeout is None else timeout
+        self.deadline = None
+
+    def start(self):
+        self.deadline = time.monotonic() + self.timeout if self.timeout else None
+
+    def check(self, operator, first_operand, second_operand):
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise CustomError(message="Calculation timed out")
+
+        if self.estimate(operator, first_operand, second_operand) > self.max_bits:
+            raise CustomError(message="Result too large")
+
+    def check_number(self, operator, first_operand, second_operand, bits):
+        """Check an operation on numbers of any backend, bits measuring the size of an operand"""
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise CustomError(message="Calculation timed out")
+
+        if operator is Exponentiation:
+            size = bits(first_operand)
+            estimate = size and abs(second_operand) * size
+        elif operator is Multiplication:
+            estimate = bits(first_operand) + bits(second_operand)
+        else:
+            estimate = max(bits(first_operand), bits(second_operand)) + 1
+
+        if estimate > self.max_bits:
+            raise CustomError(message="Result too large")
+
+    def check_run(self, operator, operands, bits=int.bit_length):
+        """Check a run of the same operator applied left to right on operands at once"""
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise CustomError(message="Calculation timed out")
+
+        if self.estimate_run(operator, operands, bits) > self.max_bits:
+            raise CustomError(message="Result too large")
+
+    @staticmethod
+    def estimate(operator, first_operand, second_operand):
+        """An estimate of the bit length of the result of applying operator on both operands"""
+        if operator is Exponentiation:
+            if second_operand <= 0 or abs(first_operand) <= 1:
+                return 1
+            try:
+                return second_operand * math.log2(abs(first_operand))
+            except OverflowError:
+                return math.inf
+
+        if operator is Multiplication:
+            return first_operand.bit_length() + second_operand.bit_length()
+
+        return max(first_operand.bit_length(), second_operand.bit_length()) + 1
+
+    @staticmethod
+    def estimate_run(operator, operands, bits=int.bit_length):
+        """An estimate of the bit length of the result of applying operator on a run of operands at once"""
+        lengths = list(map(bits, operands))
+        if operator is Multiplication:
+            return 0 if 0 in lengths else sum(lengths)
+        return max(lengths) + len(lengths).bit_length()
@@ -0,0 +1,52 @@
+from collections import deque
+
+from .exceptions import CustomError
+
+
+class Reference:
+    """A reference to the n-th result of a session, `$n`, or to the last one, `$_`, kept as index 0"""
+
+    __slots__ = ("index",)
+    opcode = 9
+
+    def __init__(self, index):
+        self.index = int(index)
+
+    def __repr__(self):
+        return f"Reference ${self.index or '_'}"
+
+    def __str__(self):
+        return f"${self.index or '_'}"
+
+
+class History:
+    """The last maxsize results of a session, numbered from 1 in the order they were produced"""
+
+    def __init__(self, maxsize=1000):
+        self.maxsize = maxsize
+        self.results = deque(maxlen=maxsize)
+        self.count = 0
+
+    def append(self, result):
+        if self.maxsize > 0:
+            self.results.append(result)
+        self.count += 1
+
+    def get(self, index):
+        if not index:
+            index = self.count
+
+        position = index - (self.count - len(self.results)) - 1
+        if not 0 <= position < len(self.results) or index > self.count:
+            raise CustomError(message="Unknown result")
+        return self.results[position]
+
+    def items(self):
+        first = self.count - len(self.results) + 1
+        return enumerate(self.results, first)
+
+    def __len__(self):
+        return len(self.results)
+
+    def __repr__(self):
+        return f"History {len(self.results)} of {self.count} results"
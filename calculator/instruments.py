@@ -0,0 +1,91 @@
+import time
+from collections import Counter
+
+STAGES = ("validate", "tokenize", "optimize", "calculate", "assign")
+
+
+class Histogram:
+    """Counts of recorded values bucketed by powers of two, the bucket of a value being its bit length"""
+
+    def __init__(self):
+        self.buckets = [0] * 64
+        self.count = 0
+        self.total = 0
+        self.maximum = 0
+
+    def record(self, value):
+        self.buckets[min(value.bit_length(), 63)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of the recorded values"""
+        if not self.count:
+            return 0
+
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= fraction * self.count:
+                return min((1 << bucket) - 1, self.maximum)
+        return self.maximum
+
+
+class Statistics:
+    """Per-stage counters and latency histograms (in nanoseconds) of a Session, with error counts per message"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.stages = {stage: Histogram() for stage in STAGES}
+        self.tokens = Histogram()
+        self.errors = Counter()
+        self.lines = 0
+        self.hits = 0
+        self.memoized = 0
+
+    @staticmethod
+    def clock():
+        return time.perf_counter_ns()
+
+    def record(self, stage, start):
+        self.stages[stage].record(time.perf_counter_ns() - start)
+
+    def fail(self, error):
+        if error.message:
+            self.errors[error.message] += 1
+
+    @staticmethod
+    def duration(nanoseconds):
+        for unit, scale in (("s", 10 ** 9), ("ms", 10 ** 6), ("us", 10 ** 3)):
+            if nanoseconds >= scale:
+                return f"{nanoseconds / scale:.1f}{unit}"
+        return f"{nanoseconds:.0f}ns"
+
+    def summary(self):
+        lines = [f"lines: {self.lines} (cache hits {self.hits}, memoized results {self.memoized})"]
+        lines.append(f"{'stage':<10} {'count':>8} {'mean':>9} {'p50':>9} {'p99':>9} {'max':>9}")
+        for stage, histogram in self.stages.items():
+            lines.append(
+                f"{stage:<10} {histogram.count:>8} {self.duration(histogram.mean):>9} "
+                f"{self.duration(histogram.percentile(0.5)):>9} {self.duration(histogram.percentile(0.99)):>9} "
+                f"{self.duration(histogram.maximum):>9}"
+            )
+        lines.append(
+            f"tokens per parsed expression: mean {self.tokens.mean:.1f}, p50 {self.tokens.percentile(0.5)}, "
+            f"p99 {self.tokens.percentile(0.99)}, max {self.tokens.maximum}"
+        )
+        lines.append(f"errors: {sum(self.errors.values())}")
+        for message, count in self.errors.most_common():
+            lines.append(f"  {message}: {count}")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return self.summary()
@@ -1,21 +1,249 @@
+import re
+from numbers import Number
+
+from .backends import INTEGER
+from .exceptions import CustomError
+from .governors import Governor
+from .optimizers import Optimizer
+from .snapshots import Snapshot
+from .streams import TokenStream
+from .symbols import Values
+from .tokens import Tokenizer
+from .variables import Variable
+
+NAMES = re.compile(r"[A-Za-z]+")
+
+
 class Memory:
-    """A representation of memory to store variables as key along with their values"""
+    """A representation of memory to store variables as key along with their values
+
+    A variable is either a literal or a formula over other variables (`c = n`, `total = price * qty + tax`).
+    Every variable keeps its resolved value and the formulas are linked in a dependency graph, so an update only
+    recomputes the formulas downstream of the changed variable, in topological order.
+
+    Values are kept by interned symbol id in a Values store, `memory` only holds the text of the formulas.
+
+    A Memory loaded from a Snapshot only parses its formulas up front, every other value is read from the mapped file
+    the first time it is used.
 
-    def __init__(self):
+    Literals and formulas are read and calculated with the numbers of backend, integers by default, formulas being
+    optimized and calculated under governor like any other expression of the session.
+    """
+
+    def __init__(self, calculator=None, backend=None, governor=None):
+        self.calculator = calculator
+        self.backend = backend or INTEGER
+        self.governor = governor or Governor()
         self.memory = {}
+        self.values = Values()
+        self.formulas = {}
+        self.dependencies = {}
+        self.dependents = {}
+        self.recomputed = 0
+        self.mapped = None
+        self.bind()
+
+    def bind(self):
+        """Route get straight to Values unless a mapped Snapshot may still hold the key"""
+        if self.mapped is None:
+            self.get = self.values.get
+        else:
+            self.__dict__.pop("get", None)
 
     def get(self, key):
-        try:
-            return int(self.memory.get(key))
-        except (TypeError, ValueError):
-            reference_value = self.memory.get(key)
-            if reference_value:
-                return self.get(reference_value)
+        value = self.values.get(key)
+        if value is None and self.mapped is not None and key not in self.values:
+            value = self.fault(key)
+        return value
+
+    def fault(self, key):
+        """Read the value of key from the mapped Snapshot into values"""
+        number = self.mapped.find(key)
+        if number is None:
             return None
 
+        value = self.mapped.value(number)
+        self.values[key] = value
+        return value
+
+    def materialize(self):
+        """Read every value still in the mapped Snapshot and release the file"""
+        if self.mapped is None:
+            return
+
+        for key, value in self.mapped.items():
+            if key not in self.values:
+                self.values[key] = value
+        self.mapped.close()
+        self.mapped = None
+        self.bind()
+
+    def save(self, path):
+        """Write every variable to a Snapshot file and return how many were written"""
+        self.materialize()
+        return Snapshot.write(path, self.values, self.memory, self.backend.name)
+
+    def load(self, path):
+        """Replace every variable by those of a Snapshot file of the same numbers and return how many it holds"""
+        mapped = Snapshot(path)
+        if mapped.kind != self.backend.name:
+            mapped.close()
+            raise CustomError(message=f"Snapshot holds {mapped.kind} numbers, not {self.backend.name}")
+
+        try:
+            texts = dict(mapped.formulas())
+        except UnicodeDecodeError:
+            mapped.close()
+            raise CustomError(message="Invalid snapshot")
+
+        self.restore({})
+        self.mapped = mapped
+        self.bind()
+        self.formulas = dict(texts)
+        self.memory = texts
+        for key, text in texts.items():
+            self.dependencies[key] = dependencies = set(NAMES.findall(text))
+            for dependency in dependencies:
+                self.dependents.setdefault(dependency, set()).add(key)
+
+        return len(mapped)
+
+    @staticmethod
+    def extract_dependencies(tokens):
+        return {token.variable for token in tokens if isinstance(token, Variable)}
+
+    def is_cyclic(self, key, dependencies):
+        if key in dependencies:
+            return True
+
+        return any(dependent in dependencies for dependent in self.downstream(key)[1:])
+
+    def downstream(self, key):
+        """The key followed by every variable depending on it, in topological order"""
+        order = []
+        visited = {key}
+        stack = [(key, iter(self.dependents.get(key, ())))]
+
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if child not in visited:
+                    visited.add(child)
+                    stack.append((child, iter(self.dependents.get(child, ()))))
+                    break
+            else:
+                stack.pop()
+                order.append(node)
+
+        order.reverse()
+        return order
+
+    def formula(self, key):
+        """The TokenStream of a formula, parsed from its text the first time when it was loaded from a Snapshot"""
+        tokens = self.formulas[key]
+        if isinstance(tokens, str):
+            tokens = self.formulas[key] = self.compile(tokens)
+        return tokens
+
+    def tokenizer(self, text):
+        return Tokenizer(buffer=text, decimals=not self.backend.integral)
+
+    def compile(self, value):
+        tokenizer = value if isinstance(value, Tokenizer) else self.tokenizer(value)
+        return TokenStream(
+            Optimizer(buffer=tokenizer.tokenize(), governor=self.governor, backend=self.backend).optimize()
+        )
+
+    def evaluate(self, tokens):
+        if tokens.is_alias():
+            return self.get(tokens.names[0])
+
+        if self.calculator is None:
+            from .calculator import Calculator
+
+            self.calculator = Calculator
+
+        return self.calculator(buffer=tokens, memory=self, governor=self.governor, backend=self.backend).calculate()
+
+    def snapshot(self):
+        self.materialize()
+        return dict(self.values.items())
+
+    def restore(self, values):
+        """Replace every variable by the resolved values of a snapshot, dropping their formulas"""
+        if self.mapped is not None:
+            self.mapped.close()
+            self.mapped = None
+        self.memory = {}
+        self.values = Values(values)
+        self.bind()
+        self.formulas = {}
+        self.dependencies = {}
+        self.dependents = {}
+
     def update(self, args):
-        self.memory.update(args)
+        self.recomputed = 0
+        for key, value in args.items():
+            self.recomputed += self.assign(key, value)
+        return self.recomputed
+
+    def assign(self, key, value):
+        """Store a literal or a formula under key and return how many dependent formulas were recomputed"""
+        try:
+            resolved = self.backend.number(value if isinstance(value, Number) else int(value))
+            tokens = None
+            dependencies = set()
+            text = None
+        except (TypeError, ValueError):
+            tokenizer = value if isinstance(value, Tokenizer) else self.tokenizer(value)
+            tokens = self.compile(tokenizer)
+            dependencies = set(tokens.names)
+            text = tokenizer.buffer.strip()
+
+            if self.is_cyclic(key, dependencies):
+                raise CustomError(message="Cyclic assignment")
+            resolved = self.evaluate(tokens)
+
+        for dependency in self.dependencies.pop(key, ()):
+            self.dependents[dependency].discard(key)
+
+        self.formulas.pop(key, None)
+        if tokens is not None:
+            self.formulas[key] = tokens
+            self.dependencies[key] = dependencies
+            for dependency in dependencies:
+                self.dependents.setdefault(dependency, set()).add(key)
+
+        if text is None:
+            self.memory.pop(key, None)
+        else:
+            self.memory[key] = text
+        return self.propagate(key, resolved)
+
+    def propagate(self, key, resolved):
+        if not self.dependents.get(key):
+            self.values[key] = resolved
+            return 0
+
+        changed = {key} if self.values.get(key, resolved) != resolved or key not in self.values else set()
+        self.values[key] = resolved
+        recomputed = 0
+
+        for node in self.downstream(key)[1:]:
+            if changed.isdisjoint(self.dependencies[node]):
+                continue
+
+            try:
+                value = self.evaluate(self.formula(node))
+            except CustomError:
+                value = None
+            recomputed += 1
+
+            if value != self.values.get(node):
+                self.values[node] = value
+                changed.add(node)
+
+        return recomputed
 
     def __repr__(self):
-        for key, value in self.memory.items():
-            return f"Memory -- {key}: {value}"
+        return f"Memory -- {len(self.values)} variables, {len(self.formulas)} formulas"
@@ -1,4 +1,6 @@
 from functools import reduce
+from math import prod
+from operator import floordiv
 
 OPERATORS = {
     "-",
@@ -49,6 +51,8 @@ class Operator:
 
 
 class Addition:
+    opcode = 4
+
     def __repr__(self):
         return f"Addition"
 
@@ -57,10 +61,12 @@ class Addition:
 
     @staticmethod
     def execute(*operands):
-        return reduce(lambda a, b: a + b, operands)
+        return sum(operands)
 
 
 class Subtraction:
+    opcode = 5
+
     def __repr__(self):
         return f"Subtraction"
 
@@ -69,10 +75,12 @@ class Subtraction:
 
     @staticmethod
     def execute(*operands):
-        return reduce(lambda a, b: a - b, operands)
+        return operands[0] - sum(operands[1:])
 
 
 class Multiplication:
+    opcode = 6
+
     def __repr__(self):
         return f"Multiplication"
 
@@ -81,10 +89,12 @@ class Multiplication:
 
     @staticmethod
     def execute(*operands):
-        return reduce(lambda a, b: a * b, operands)
+        return prod(operands)
 
 
 class Division:
+    opcode = 7
+
     def __repr__(self):
         return f"Division"
 
@@ -93,22 +103,36 @@ class Division:
 
     @staticmethod
     def execute(*operands):
-        return reduce(lambda a, b: a // b, operands)
+        return reduce(floordiv, operands)
 
 
 class Exponentiation:
+    opcode = 8
+
     def __repr__(self):
         return f"Exponentiation"
 
     def __hash__(self):
         return hash("^")
 
+    @staticmethod
+    def power(base, exponent):
+        if exponent >= 0:
+            return base ** exponent
+
+        if abs(base) <= 1:
+            return 1 // base ** -exponent
+
+        return -1 if base < 0 and exponent % 2 else 0
+
     @staticmethod
     def execute(*operands):
-        return reduce(lambda a, b: a ^ b, operands)
+        return reduce(lambda a, b: Exponentiation.power(b, a), reversed(operands))
 
 
 class LeftBracket:
+    opcode = 2
+
     def __hash__(self):
         return hash(")")
 
@@ -117,6 +141,8 @@ class LeftBracket:
 
 
 class RightBracket:
+    opcode = 3
+
     def __hash__(self):
         return hash("(")
 
@@ -135,7 +161,22 @@ class Precedence:
         LeftBracket: -1,
     }
 
+    RIGHT_ASSOCIATIVE = {Exponentiation}
+
     @staticmethod
     def lte(*operators):
         op1, op2 = operators
         return Precedence.LEVEL.get(op1) <= Precedence.LEVEL.get(op2)
+
+    @staticmethod
+    def lt(*operators):
+        op1, op2 = operators
+        return Precedence.LEVEL.get(op1) < Precedence.LEVEL.get(op2)
+
+    @staticmethod
+    def yields(*operators):
+        """Whether the incoming operator waits for the one on top of the stack to be applied first"""
+        op1, op2 = operators
+        if op1 in Precedence.RIGHT_ASSOCIATIVE:
+            return Precedence.lt(op1, op2)
+        return Precedence.lte(op1, op2)
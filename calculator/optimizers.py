@@ -0,0 +1,262 @@
+from .backends import INTEGER
+from .digits import Digit
+from .exceptions import CustomError
+from .functions import Call
+from .governors import Governor
+from .histories import Reference
+from .operators import Addition, Subtraction, Multiplication, Division, Exponentiation, LeftBracket, RightBracket
+from .operators import Precedence
+from .streams import TokenStream
+from .variables import Variable
+
+
+class Node:
+    """A representation of an operator applied on a run of operands, evaluated like `operator.execute(*operands)`"""
+
+    def __init__(self, operator, operands):
+        self.operator = operator
+        self.operands = operands
+
+    def __repr__(self):
+        return f"Node {self.operator!r} {self.operands}"
+
+
+class Optimizer:
+    """Build an expression tree out of tokens, simplify it and emit the tokens of the simplified expression
+
+    Runs of the same operator are flattened into one Node, constant operands are folded, identities (`x * 1`,
+    `x + 0`, `x - 0`, `x / 1`, `x ^ 1`) are dropped and the constant of a sum is kept positive by picking between
+    addition and subtraction, whatever run of signs it was written with. Every fold is checked by the governor like
+    the Calculator checks the operation, a fold over budget leaving its operands as they were written, and constants
+    are folded before identities are dropped so `3891 ^ 1` is checked too.
+
+    Folding follows integer arithmetic, so the tokens of any other backend are left as they are, as are the tokens of
+    an expression calling functions.
+
+    Optimizing costs several times what calculating the expression once does, so it only pays off for tokens that
+    are calculated again: the formulas of a Memory, the bodies of functions and, through `optimized`, the expressions
+    of a Session once they have been calculated THRESHOLD times.
+    """
+
+    THRESHOLD = 2
+
+    def __init__(self, buffer, governor=None, backend=INTEGER):
+        self.buffer = buffer
+        self.governor = governor or Governor()
+        self.backend = backend
+
+    def optimize(self):
+        if not self.backend.integral:
+            return list(self.buffer)
+
+        self.buffer = list(self.buffer)
+        if any(isinstance(token, Call) for token in self.buffer):
+            return self.buffer
+        return self.emit(self.build())
+
+    def build(self):
+        self.governor.start()
+        operands = []
+        operators = []
+
+        for v in self.buffer:
+            if isinstance(v, (Digit, Variable, Reference)):
+                operands.append(v)
+
+            elif v == LeftBracket:
+                operators.append(v)
+
+            elif v == RightBracket:
+                operator = operators.pop()
+
+                while not operator == LeftBracket:
+                    self.reduce_stack(operator, operands)
+                    operator = operators.pop()
+            else:
+                while operators and Precedence.yields(v, operators[-1]):
+                    self.reduce_stack(operators.pop(), operands)
+
+                operators.append(v)
+
+        while operators:
+            self.reduce_stack(operators.pop(), operands)
+
+        return operands.pop()
+
+    def reduce_stack(self, operator, operands):
+        second_operand = operands.pop()
+        first_operand = operands.pop()
+        operands.append(self.combine(operator, first_operand, second_operand))
+
+    def combine(self, operator, first_operand, second_operand):
+        if operator is Exponentiation:
+            terms = [first_operand]
+            terms += self.flatten(operator, second_operand)
+        elif operator in (Addition, Multiplication):
+            terms = self.flatten(operator, first_operand) + self.flatten(operator, second_operand)
+        else:
+            terms = self.flatten(operator, first_operand) + [second_operand]
+
+        return getattr(self, f"simplify_{operator.__name__.lower()}")(terms)
+
+    @staticmethod
+    def flatten(operator, operand):
+        if isinstance(operand, Node) and operand.operator is operator:
+            return list(operand.operands)
+        return [operand]
+
+    @staticmethod
+    def is_constant(operand):
+        return isinstance(operand, Digit)
+
+    def fold(self, operator, operands):
+        """Apply operator on constant operands, or None when the result is over budget or undefined"""
+        try:
+            if operator is Exponentiation:
+                result = operands[-1]
+                for operand in reversed(operands[:-1]):
+                    self.governor.check(operator, operand, result)
+                    result = operator.execute(operand, result)
+            else:
+                result = operands[0]
+                for operand in operands[1:]:
+                    self.governor.check(operator, result, operand)
+                    result = operator.execute(result, operand)
+        except (CustomError, ZeroDivisionError):
+            return None
+
+        return result
+
+    @staticmethod
+    def node(operator, operands):
+        return operands[0] if len(operands) == 1 else Node(operator, operands)
+
+    def split(self, terms):
+        constants = [term.number for term in terms if self.is_constant(term)]
+        others = [term for term in terms if not self.is_constant(term)]
+        return constants, others
+
+    def simplify_addition(self, terms):
+        constants, others = self.split(terms)
+        constant = self.fold(Addition, constants) if constants else 0
+
+        if constant is None:
+            return Node(Addition, terms)
+
+        if not others:
+            return Digit(constant)
+
+        if constant > 0:
+            return Node(Addition, others + [Digit(constant)])
+
+        if constant < 0:
+            return Node(Subtraction, [self.node(Addition, others), Digit(-constant)])
+
+        return self.node(Addition, others)
+
+    def simplify_subtraction(self, terms):
+        first, rest = terms[0], terms[1:]
+        constants, others = self.split(rest)
+        constant = self.fold(Addition, constants) if constants else 0
+
+        if constant is None:
+            return Node(Subtraction, terms)
+
+        if self.is_constant(first) and not others:
+            difference = self.fold(Subtraction, [first.number, constant])
+            return Node(Subtraction, terms) if difference is None else Digit(difference)
+
+        if constant > 0:
+            return Node(Subtraction, [first] + others + [Digit(constant)])
+
+        if constant < 0:
+            return Node(Addition, [self.node(Subtraction, [first] + others), Digit(-constant)])
+
+        return self.node(Subtraction, [first] + others)
+
+    def simplify_multiplication(self, terms):
+        constants, others = self.split(terms)
+        constant = self.fold(Multiplication, constants) if constants else 1
+
+        if constant is None:
+            return Node(Multiplication, terms)
+
+        if not others:
+            return Digit(constant)
+
+        if constant != 1:
+            return Node(Multiplication, others + [Digit(constant)])
+
+        return self.node(Multiplication, others)
+
+    def simplify_division(self, terms):
+        while len(terms) > 1 and self.is_constant(terms[0]) and self.is_constant(terms[1]):
+            result = self.fold(Division, [terms[0].number, terms[1].number])
+            if result is None:
+                return Node(Division, terms)
+            terms[:2] = [Digit(result)]
+
+        terms = [terms[0]] + [term for term in terms[1:] if not (self.is_constant(term) and term.number == 1)]
+        return self.node(Division, terms)
+
+    def simplify_exponentiation(self, terms):
+        while len(terms) > 1:
+            last = terms[-1]
+            if self.is_constant(terms[-2]) and self.is_constant(last):
+                result = self.fold(Exponentiation, [terms[-2].number, last.number])
+                if result is None:
+                    break
+                terms[-2:] = [Digit(result)]
+            elif self.is_constant(last) and last.number == 1:
+                terms.pop()
+            else:
+                break
+
+        return self.node(Exponentiation, terms)
+
+    @staticmethod
+    def needs_bracket(node, position, operand):
+        if not isinstance(operand, Node):
+            return False
+
+        parent = Precedence.LEVEL[node.operator]
+        child = Precedence.LEVEL[operand.operator]
+
+        if node.operator in Precedence.RIGHT_ASSOCIATIVE:
+            return child < parent if position == len(node.operands) - 1 else child <= parent
+        return child < parent if position == 0 else child <= parent
+
+    def emit(self, tree):
+        tokens = []
+        stack = [tree]
+
+        while stack:
+            item = stack.pop()
+            if not isinstance(item, Node):
+                tokens.append(item)
+                continue
+
+            parts = []
+            for position, operand in enumerate(item.operands):
+                if position:
+                    parts.append(item.operator)
+
+                if self.needs_bracket(item, position, operand):
+                    parts += [LeftBracket, operand, RightBracket]
+                else:
+                    parts.append(operand)
+
+            stack.extend(reversed(parts))
+
+        return tokens
+
+
+def optimized(stream, governor=None, backend=INTEGER):
+    """The optimized TokenStream of stream once it has been calculated THRESHOLD times, stream itself before"""
+    if stream.optimized or stream.evaluations < Optimizer.THRESHOLD:
+        return stream
+
+    tokens = TokenStream(Optimizer(buffer=stream, governor=governor, backend=backend).optimize())
+    tokens.optimized = True
+    tokens.evaluations, tokens.memo = stream.evaluations, stream.memo
+    return tokens
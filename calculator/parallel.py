@@ -0,0 +1,167 @@
+import os
+import pickle
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import redirect_stdout
+
+from .calculator import Session
+from .commands import Command, CommandCenter
+from .exceptions import CustomError
+from .validators import Validator
+
+CALLS = re.compile(r"[A-Za-z]\(")
+
+
+class Worker:
+    """The warmed-up Session of one process of a ParallelBatch, kept across the chunks it evaluates"""
+
+    current = None
+
+    def __init__(self, cache_size, governor, backend=None):
+        self.session = Session(cache_size=cache_size, governor=governor, backend=backend)
+        self.version = None
+
+    @staticmethod
+    def start(cache_size, governor, backend=None):
+        Worker.current = Worker(cache_size=cache_size, governor=governor, backend=backend)
+
+    @staticmethod
+    def run(version, snapshot, lines, start):
+        return Worker.current.evaluate(version, snapshot, lines, start)
+
+    def evaluate(self, version, snapshot, lines, start):
+        if version != self.version:
+            self.session.memory.restore(pickle.loads(snapshot))
+            self.version = version
+
+        outcomes = []
+        for lineno, line in enumerate(lines, start):
+            result, error = self.session.process(line)
+
+            if isinstance(error, CustomError):
+                if error.message:
+                    outcomes.append((lineno, None, error.message, error.column))
+            elif result is not None:
+                outcomes.append((lineno, result, None, None))
+
+        return outcomes
+
+
+class ParallelBatch:
+    """Evaluate the lines of a stream in a process pool, writing the results in input order
+
+    Expression lines are shipped to the workers in chunks along with a snapshot of Memory. Assignments and commands run
+    in this process, in order, so every chunk sees exactly the variables assigned by the lines before it. The results
+    of the workers are added to the History of this process as they are reported, and lines referring to it (`$n`)
+    or calling the functions defined here run here once every line before them has been reported.
+    """
+
+    def __init__(self, workers=None, chunk_size=1024, cache_size=1024, governor=None, output=None, errors=None,
+                 buffer_size=1 << 16, history_size=1000, backend=None, function_cache=None, max_depth=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.cache_size = cache_size
+        self.session = Session(
+            cache_size=cache_size, governor=governor, history_size=history_size, backend=backend,
+            function_cache=function_cache, max_depth=max_depth
+        )
+        self.output = output or open(sys.stdout.fileno(), "w", buffering=buffer_size, closefd=False)
+        self.errors = errors or sys.stderr
+        self.pending = deque()
+        self.failures = 0
+        self.version = 0
+        self.snapshot = None
+
+    def submit(self, executor, chunk, start):
+        if not chunk:
+            return
+        if self.snapshot is None:
+            self.snapshot = pickle.dumps(self.session.memory.snapshot(), protocol=pickle.HIGHEST_PROTOCOL)
+        self.pending.append(executor.submit(Worker.run, self.version, self.snapshot, chunk, start))
+
+    def report(self, lineno, result, message, column):
+        if message is None:
+            self.session.history.append(result)
+            self.output.write(f"{result}\n")
+            return
+
+        self.failures += 1
+        location = f"{lineno}:{column}" if column else f"{lineno}"
+        self.errors.write(f"{location}: {message}\n")
+
+    def drain(self, keep=0):
+        while len(self.pending) > keep:
+            item = self.pending.popleft()
+
+            if isinstance(item, Future):
+                for outcome in item.result():
+                    self.report(*outcome)
+            elif isinstance(item, Command):
+                CommandCenter(command=item, session=self.session).execute()
+            else:
+                self.report(*item)
+
+    def run(self, stream):
+        lines = 0
+        chunk, chunk_start = [], 1
+        start = time.perf_counter()
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=Worker.start,
+            initargs=(self.cache_size, self.session.governor, self.session.backend)
+        )
+
+        with executor, redirect_stdout(self.output):
+            for lines, line in enumerate(stream, 1):
+                line = line.rstrip("\n")
+                content = line.strip()
+                local = "$" in content or CALLS.search(content) is not None
+
+                if not (Validator.is_command(content) or Validator.is_assignment(content) or local):
+                    if not chunk:
+                        chunk_start = lines
+                    chunk.append(line)
+                    if len(chunk) >= self.chunk_size:
+                        self.submit(executor, chunk, chunk_start)
+                        chunk = []
+                        self.drain(keep=self.workers * 4)
+                    continue
+
+                self.submit(executor, chunk, chunk_start)
+                chunk = []
+                if local:
+                    self.drain()
+
+                result, error = self.session.process(line)
+                if isinstance(error, CustomError):
+                    self.pending.append((lines, None, error.message, error.column))
+                elif isinstance(result, Command):
+                    if result.instruction == "exit":
+                        break
+                    if result.instruction not in Command.MUTATING:
+                        self.pending.append(result)
+                        continue
+
+                    self.drain()
+                    CommandCenter(command=result, session=self.session).execute()
+                    self.version += 1
+                    self.snapshot = None
+                elif result is not None:
+                    self.output.write(f"{result}\n")
+                else:
+                    self.version += 1
+                    self.snapshot = None
+
+            self.submit(executor, chunk, chunk_start)
+            self.drain()
+
+        self.output.flush()
+        elapsed = time.perf_counter() - start
+        rate = lines / elapsed if elapsed else 0.0
+        self.errors.write(
+            f"{lines} lines in {elapsed:.3f}s ({rate:.0f} lines/s, {self.failures} errors, {self.workers} workers)\n"
+        )
+
+        return lines, self.failures, elapsed
@@ -0,0 +1,94 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from .commands import Command, CommandCenter
+from .exceptions import CustomError
+
+
+class Server:
+    """An asyncio server speaking the REPL line protocol, with an isolated Session per connection
+
+    Every line is evaluated in a thread pool so a slow expression never stalls the event loop, the replies of a line
+    are drained to the client before its next line is read, and connections above the limit are turned away.
+    """
+
+    def __init__(self, session, host="127.0.0.1", port=8765, path=None, max_connections=1024, workers=None,
+                 line_limit=1 << 20):
+        self.session = session
+        self.host = host
+        self.port = port
+        self.path = path
+        self.max_connections = max_connections
+        self.line_limit = line_limit
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.connections = 0
+
+    async def reply(self, writer, lines):
+        if lines:
+            writer.write("".join(f"{line}\n" for line in lines).encode())
+            await writer.drain()
+
+    async def handle(self, reader, writer):
+        if self.connections >= self.max_connections:
+            await self.reply(writer, ["Too many connections"])
+            writer.close()
+            return
+
+        self.connections += 1
+        session = self.session()
+        loop = asyncio.get_running_loop()
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    await self.reply(writer, ["Line too long"])
+                    break
+
+                if not line:
+                    break
+
+                result, error = await loop.run_in_executor(
+                    self.executor, session.process, line.decode(errors="replace").rstrip("\r\n")
+                )
+
+                lines = []
+                if isinstance(error, CustomError):
+                    if error.message:
+                        lines.append(error.message)
+                elif isinstance(result, Command) and result.instruction in Command.LOCAL:
+                    lines.append("Command not available")
+                elif isinstance(result, Command):
+                    try:
+                        CommandCenter(command=result, output=lines.append, session=session).execute()
+                    except SystemExit:
+                        await self.reply(writer, lines)
+                        break
+                elif result is not None:
+                    lines.append(result)
+
+                await self.reply(writer, lines)
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def start(self):
+        if self.path:
+            return await asyncio.start_unix_server(self.handle, path=self.path, limit=self.line_limit)
+        return await asyncio.start_server(self.handle, host=self.host, port=self.port, limit=self.line_limit)
+
+    async def serve(self):
+        server = await self.start()
+        async with server:
+            await server.serve_forever()
+
+    def run(self):
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.executor.shutdown(wait=False)
@@ -0,0 +1,182 @@
+import mmap
+import struct
+from decimal import Decimal
+from fractions import Fraction
+
+from .exceptions import CustomError
+
+MAGIC = b"CALC"
+VERSION = 1
+KINDS = ("int", "fraction", "decimal", "float")
+TYPES = {"int": int, "fraction": Fraction, "decimal": Decimal, "float": float}
+HEADER = struct.Struct("<4sHHIIQQ")
+ENTRY = struct.Struct("<IIQI")
+FORMULA = struct.Struct("<III")
+MISSING = 0xFFFFFFFF
+
+
+class Snapshot:
+    """A binary snapshot of Memory, read on demand through mmap
+
+    The file is a header, an index of fixed-size entries sorted by name, the entries holding a formula, a string table
+    of names and formula texts and the values as little-endian two's complement integers of any size, or as their text
+    for the numbers of the other backends:
+
+        header   magic, version, kind (index in KINDS), count, formula count, string table offset, values offset
+        entry    name offset, name length, value offset, value length (MISSING for a formula without a value)
+        formula  entry number, text offset, text length
+
+    Looking a variable up is a binary search over the index, so only the pages it touches are ever read. Opening a
+    file reads the index once to check that every table and every offset it holds lies within the file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as stream:
+            try:
+                self.buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise CustomError(message="Invalid snapshot")
+
+        if len(self.buffer) < HEADER.size:
+            self.close()
+            raise CustomError(message="Invalid snapshot")
+
+        header = HEADER.unpack_from(self.buffer)
+        magic, version, kind, self.count, self.formula_count, self.strings, self.values = header
+        if magic != MAGIC or version != VERSION or kind >= len(KINDS) or not self.is_bounded():
+            self.close()
+            raise CustomError(message="Invalid snapshot")
+        self.kind = KINDS[kind]
+
+    def is_bounded(self):
+        """Whether every table, and every name, text and value the entries point at, lies within the file"""
+        index = HEADER.size + self.count * ENTRY.size
+        if not index + self.formula_count * FORMULA.size <= self.strings <= self.values <= len(self.buffer):
+            return False
+
+        strings, values = self.values - self.strings, len(self.buffer) - self.values
+        for name_offset, name_length, value_offset, value_length in ENTRY.iter_unpack(self.buffer[HEADER.size:index]):
+            if name_offset + name_length > strings:
+                return False
+            if value_length != MISSING and value_offset + value_length > values:
+                return False
+
+        formulas = FORMULA.iter_unpack(self.buffer[index:index + self.formula_count * FORMULA.size])
+        return all(number < self.count and offset + length <= strings for number, offset, length in formulas)
+
+    def __len__(self):
+        return self.count
+
+    def entry(self, number):
+        return ENTRY.unpack_from(self.buffer, HEADER.size + number * ENTRY.size)
+
+    def string(self, offset, length):
+        return self.buffer[self.strings + offset:self.strings + offset + length].decode()
+
+    def name(self, number):
+        offset, length, _, _ = self.entry(number)
+        return self.buffer[self.strings + offset:self.strings + offset + length]
+
+    def value(self, number):
+        _, _, offset, length = self.entry(number)
+        if length == MISSING:
+            return None
+
+        data = self.buffer[self.values + offset:self.values + offset + length]
+        if self.kind == "int":
+            return int.from_bytes(data, "little", signed=True)
+        try:
+            return TYPES[self.kind](data.decode())
+        except (ArithmeticError, ValueError):
+            raise CustomError(message="Invalid snapshot")
+
+    def find(self, key):
+        """The entry number of key, or None"""
+        key = key.encode()
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.name(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < self.count and self.name(low) == key:
+            return low
+        return None
+
+    def get(self, key):
+        number = self.find(key)
+        return None if number is None else self.value(number)
+
+    def __contains__(self, key):
+        return self.find(key) is not None
+
+    def names(self):
+        for number in range(self.count):
+            yield self.name(number).decode()
+
+    def items(self):
+        for number in range(self.count):
+            yield self.name(number).decode(), self.value(number)
+
+    def formulas(self):
+        """Every (name, formula text) pair of the snapshot"""
+        start = HEADER.size + self.count * ENTRY.size
+        for index in range(self.formula_count):
+            number, offset, length = FORMULA.unpack_from(self.buffer, start + index * FORMULA.size)
+            yield self.name(number).decode(), self.string(offset, length)
+
+    def close(self):
+        self.buffer.close()
+
+    @staticmethod
+    def encode(value):
+        if type(value) is not int:
+            return str(value).encode()
+        return value.to_bytes(value.bit_length() // 8 + 1, "little", signed=True)
+
+    @staticmethod
+    def write(path, values, formulas, kind="int"):
+        """Write a mapping of resolved values of kind and a mapping of formula texts, return the number of variables"""
+        names = sorted(set(values.keys()).union(formulas), key=str.encode)
+        strings, data = bytearray(), bytearray()
+        entries, texts = [], []
+
+        for number, name in enumerate(names):
+            encoded = name.encode()
+            name_offset = len(strings)
+            strings += encoded
+
+            value = values.get(name)
+            if value is not None and type(value) is not TYPES[kind]:
+                raise CustomError(message=f"Snapshots of {kind} numbers only hold {kind} values")
+            if value is None:
+                entries.append(ENTRY.pack(name_offset, len(encoded), 0, MISSING))
+            else:
+                encoded_value = Snapshot.encode(value)
+                entries.append(ENTRY.pack(name_offset, len(encoded), len(data), len(encoded_value)))
+                data += encoded_value
+
+            if name in formulas:
+                text = formulas[name].encode()
+                texts.append(FORMULA.pack(number, len(strings), len(text)))
+                strings += text
+
+        strings_offset = HEADER.size + len(entries) * ENTRY.size + len(texts) * FORMULA.size
+        header = HEADER.pack(
+            MAGIC, VERSION, KINDS.index(kind), len(entries), len(texts), strings_offset, strings_offset + len(strings)
+        )
+
+        with open(path, "wb") as stream:
+            stream.write(header)
+            stream.write(b"".join(entries))
+            stream.write(b"".join(texts))
+            stream.write(strings)
+            stream.write(data)
+
+        return len(names)
+
+    def __repr__(self):
+        return f"Snapshot {self.path} ({self.count} {self.kind} variables, {self.formula_count} formulas)"
@@ -0,0 +1,170 @@
+from abc import ABC, abstractmethod
+from array import array
+from operator import add, floordiv, mul, sub
+
+from .digits import Digit
+from .functions import Call, Comma
+from .histories import Reference
+from .operators import Addition, Subtraction, Multiplication, Division, Exponentiation, LeftBracket, RightBracket
+from .operators import Precedence
+from .variables import Variable
+
+DIGIT = Digit.opcode
+VARIABLE = Variable.opcode
+LEFT_BRACKET = LeftBracket.opcode
+RIGHT_BRACKET = RightBracket.opcode
+REFERENCE = Reference.opcode
+CALL = Call.opcode
+COMMA = Comma.opcode
+
+OPERATORS = (
+    None, None, LeftBracket, RightBracket, Addition, Subtraction, Multiplication, Division, Exponentiation, None,
+    None, Comma,
+)
+OPERATIONS = (None, None, None, None, add, sub, mul, floordiv, Exponentiation.power, None, None, None)
+YIELDS = tuple(
+    tuple(
+        incoming in Precedence.LEVEL and top in Precedence.LEVEL and Precedence.yields(incoming, top)
+        for top in OPERATORS
+    )
+    for incoming in OPERATORS
+)
+
+
+class ShuntingYard(ABC):
+    """The operator and bracket handling shared by every loop running over the opcodes of an expression
+
+    Operators wait on a stack next to the stack of their arities. `operate` applies the operators an incoming one
+    yields to, or adds an operand to the run of the same left-associative operator (`a + b + c`) instead, applying the
+    run every RUN operands so a flat run of any length keeps at most RUN of them. A bracket or a Call is opened with
+    `open` and closed with `close`, a Comma moves on to the next argument of the innermost Call with `separate`.
+
+    Applying an operator on the last arity operands is left to `reduce`: the Calculator applies it on numbers, the
+    Compiler emits the code that will.
+    """
+
+    RUN = 256
+
+    @abstractmethod
+    def reduce(self, opcode, arity):
+        """Apply the operator of opcode on the last arity operands"""
+
+    @staticmethod
+    def open(opcode, operators, arities):
+        operators.append(opcode)
+        arities.append(1 if opcode == CALL else 0)
+
+    def operate(self, opcode, operators, arities):
+        yields = YIELDS[opcode]
+        while operators and yields[operators[-1]]:
+            if operators[-1] == opcode:
+                if arities[-1] < self.RUN:
+                    arities[-1] += 1
+                else:
+                    self.reduce(opcode, arities[-1])
+                    arities[-1] = 2
+                return
+            self.reduce(operators.pop(), arities.pop())
+
+        operators.append(opcode)
+        arities.append(2)
+
+    def close(self, operators, arities):
+        """Apply the operators of the innermost bracket or Call and return its opcode with its arity"""
+        top = operators.pop()
+        while top != LEFT_BRACKET and top != CALL:
+            self.reduce(top, arities.pop())
+            top = operators.pop()
+        return top, arities.pop()
+
+    def separate(self, operators, arities):
+        while operators[-1] != CALL:
+            self.reduce(operators.pop(), arities.pop())
+        arities[-1] += 1
+
+    def finish(self, operators, arities):
+        while operators:
+            self.reduce(operators.pop(), arities.pop())
+
+
+class TokenStream:
+    """Tokens packed into parallel arrays: one opcode per token and the index of the value of every operand
+
+    Integers, variable names and the names of the functions called are stored once each in `constants`, `names` and
+    `functions`, a Reference keeps its index as the operand and operators only take their opcode. Iterating a
+    TokenStream gives the tokens it was packed from back. Constants other than integers are told apart by their type
+    and how they print, so `1.0` and `1` or `2.50` and `2.5` each keep their own entry.
+
+    `memo` holds the last result of the expression with the version of the Values it was calculated against, unless
+    the expression is `volatile`, reading the results of its session (`$n`, `$_`), which the History moves past and
+    evicts whatever the Values do, or calling functions. `compiled` holds the function the expression is compiled to
+    once it has been calculated `evaluations` times, see compilers.py, and `optimized` whether it replaced the stream
+    it was packed from after optimizing it, see `optimizers.optimized`.
+    """
+
+    __slots__ = (
+        "opcodes", "operands", "constants", "names", "functions", "volatile", "memo", "evaluations", "compiled",
+        "optimized",
+    )
+
+    def __init__(self, tokens=()):
+        self.opcodes = array("B")
+        self.operands = array("L")
+        self.constants = []
+        self.names = []
+        self.functions = []
+        self.volatile = False
+        self.memo = None
+        self.evaluations = 0
+        self.compiled = None
+        self.optimized = False
+
+        constants, names, functions = {}, {}, {}
+        for token in tokens:
+            opcode = token.opcode
+            if opcode == DIGIT:
+                number = token.number
+                key = number if type(number) is int else (type(number), str(number))
+                index = constants.setdefault(key, len(constants))
+                if index == len(self.constants):
+                    self.constants.append(number)
+            elif opcode == VARIABLE:
+                index = names.setdefault(token.variable, len(names))
+                if index == len(self.names):
+                    self.names.append(token.variable)
+            elif opcode == REFERENCE:
+                index = token.index
+                self.volatile = True
+            elif opcode == CALL:
+                index = functions.setdefault(token.name, len(functions))
+                if index == len(self.functions):
+                    self.functions.append(token.name)
+                self.volatile = True
+            else:
+                index = 0
+
+            self.opcodes.append(opcode)
+            self.operands.append(index)
+
+    def __len__(self):
+        return len(self.opcodes)
+
+    def __iter__(self):
+        for opcode, operand in zip(self.opcodes, self.operands):
+            if opcode == DIGIT:
+                yield Digit(self.constants[operand])
+            elif opcode == VARIABLE:
+                yield Variable(self.names[operand])
+            elif opcode == REFERENCE:
+                yield Reference(operand)
+            elif opcode == CALL:
+                yield Call(self.functions[operand])
+            else:
+                yield OPERATORS[opcode]
+
+    def is_alias(self):
+        """Whether the stream is a single Variable, evaluated by looking its value up"""
+        return len(self.opcodes) == 1 and self.opcodes[0] == VARIABLE
+
+    def __repr__(self):
+        return f"TokenStream {list(self)}"
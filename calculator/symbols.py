@@ -0,0 +1,125 @@
+from array import array
+from itertools import count
+
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+SPILLED = INT64_MIN
+CLOCK = count(1)
+
+
+class SymbolTable:
+    """Interned variable names, each mapped to a dense integer id in the order they were first seen
+
+    The dict key is the only copy of a name kept, `names` refers to the same string objects.
+    """
+
+    __slots__ = ("ids", "names")
+
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+
+    def intern(self, name):
+        number = self.ids.get(name)
+        if number is None:
+            number = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return number
+
+    def find(self, name):
+        return self.ids.get(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def __iter__(self):
+        return iter(self.names)
+
+
+class Values:
+    """Resolved values of variables by symbol id
+
+    Integers fitting in int64 are packed in an array, bigger integers, the numbers of other backends and the None of a
+    formula that failed are spilled to a dict under the SPILLED marker. It reads like a dict from name to value.
+
+    Every write takes a tick of a process-wide clock as the version of the store and of the variable written, so a
+    result calculated at some version stays valid as long as none of the variables it read was written since.
+    """
+
+    __slots__ = ("symbols", "ids", "packed", "spilled", "versions", "version")
+
+    def __init__(self, values=()):
+        self.symbols = SymbolTable()
+        self.ids = self.symbols.ids
+        self.packed = array("q")
+        self.spilled = {}
+        self.versions = array("Q")
+        self.version = next(CLOCK)
+        self.update(values)
+
+    def get(self, key, default=None):
+        number = self.ids.get(key)
+        if number is None:
+            return default
+
+        value = self.packed[number]
+        if value == SPILLED:
+            return self.spilled[number]
+        return value
+
+    def __getitem__(self, key):
+        number = self.ids[key]
+        value = self.packed[number]
+        return self.spilled[number] if value == SPILLED else value
+
+    def __setitem__(self, key, value):
+        number = self.symbols.intern(key)
+        if number == len(self.packed):
+            self.packed.append(SPILLED)
+            self.versions.append(0)
+        self.version = self.versions[number] = next(CLOCK)
+
+        if type(value) is int and INT64_MIN < value <= INT64_MAX:
+            self.packed[number] = value
+            self.spilled.pop(number, None)
+        else:
+            self.packed[number] = SPILLED
+            self.spilled[number] = value
+
+    def changed(self, names, version):
+        """Whether any of names was written, or is unknown, since version"""
+        if version == self.version:
+            return False
+
+        for name in names:
+            number = self.ids.get(name)
+            if number is None or self.versions[number] > version:
+                return True
+        return False
+
+    def __contains__(self, key):
+        return key in self.ids
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __iter__(self):
+        return iter(self.symbols)
+
+    def keys(self):
+        return self.symbols.names
+
+    def items(self):
+        for key in self.symbols.names:
+            yield key, self[key]
+
+    def update(self, values):
+        items = values.items() if hasattr(values, "items") else values
+        for key, value in items:
+            self[key] = value
+
+    def __repr__(self):
+        return f"Values {len(self)} variables, {len(self.spilled)} spilled"
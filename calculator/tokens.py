@@ -1,62 +1,230 @@
-from digits import Digit
-from operators import Operator
-from variables import Variable
+import string
+from itertools import chain
 
+from .digits import Digit
+from .exceptions import CustomError
+from .functions import Call, Comma
+from .histories import Reference
+from .operators import Operator, LeftBracket, RightBracket
+from .variables import Variable
 
-class Tokenizer:
-    """Tokenize a complex equation into a list of Digits and Operators exclusively"""
-
-    def __init__(self, buffer, memory):
-        self.buffer = buffer
-        self.memory = memory
-        self.pos = 0
-        self.tokens = []
-
-    def __next_token(self):
-        atom = self.__get_atom()
-        while atom and atom.isspace():
-            self.pos += 1
-            atom = self.__get_atom()
-
-        if atom is None:
-            return None
-
-        if Digit.is_check(atom):
-            return self.__tokenize(Digit)
+DIGITS = frozenset(string.digits)
+LETTERS = frozenset(string.ascii_letters)
+WORD = DIGITS | LETTERS
+SIGNS = frozenset("+-")
+OPERATIONS = frozenset("*/^")
 
-        if Operator.is_check(atom):
-            return self.__tokenize(Operator).operator
 
-        if Variable.is_check(atom):
-            var = self.__tokenize(Variable).variable
-            digit = self.memory.get(var)
-            return Digit(digit)
-
-    def __tokenize(self, meta):
-        end_pos = self.pos + 1
-        while self.__get_atom(end_pos) and meta.is_check(self.__get_atom(end_pos)):
-            end_pos += 1
+class Tokenizer:
+    """Validate and tokenize an equation in a single pass into Digits, Operators and unresolved Variables
 
-        value = self.buffer[self.pos:end_pos]
-        self.pos = end_pos
+    Literals with a decimal point (`2.5`) are only read with decimals, for the sessions whose numbers are not integers.
+    A name directly followed by a bracket is the Call of a function, its arguments being separated by Commas.
+    """
 
-        return meta(value)
+    def __init__(self, buffer, decimals=False):
+        self.buffer = buffer
+        self.decimals = decimals
+        self.tokens = []
+        self.error = None
+        self.scanned = False
 
-    def __get_atom(self, pos=None):
-        current_pos = pos or self.pos
+    def scan(self):
+        if self.scanned:
+            return self.error
+        self.scanned = True
 
         try:
-            return self.buffer[current_pos]
-        except IndexError:
-            return None
+            self.tokens.extend(self.stream([self.buffer], self.decimals))
+        except CustomError as error:
+            self.error = error
+        return self.error
 
     def tokenize(self):
-        while True:
-            token = self.__next_token()
-
-            if not token:
-                break
-            else:
-                self.tokens.append(token)
+        error = self.scan()
+        if error:
+            raise error
 
         return self.tokens
+
+    def column(self, token):
+        """The column of a Digit, Variable or Reference of the scanned tokens, scanning the buffer again to find it"""
+        columns = []
+        for _ in self.stream([self.buffer], self.decimals, columns):
+            pass
+
+        operands = (token for token in self.tokens if isinstance(token, (Digit, Variable, Reference)))
+        return next(column for operand, column in zip(operands, columns) if operand is token)
+
+    @staticmethod
+    def boundary(buffer):
+        """Where the trailing run of buffer that the next chunk could still extend starts"""
+        pos = len(buffer)
+        if not pos:
+            return pos
+
+        last = buffer[pos - 1]
+        if last in WORD or last == ".":
+            while pos and (buffer[pos - 1] in WORD or buffer[pos - 1] == "."):
+                pos -= 1
+            if pos and buffer[pos - 1] == "$":
+                pos -= 1
+        elif last in SIGNS or last.isspace():
+            while pos and (buffer[pos - 1] in SIGNS or buffer[pos - 1].isspace()):
+                pos -= 1
+        elif last in OPERATIONS or last == "$":
+            pos -= 1
+        elif last == "_" and pos > 1 and buffer[pos - 2] == "$":
+            pos -= 2
+        return pos
+
+    @staticmethod
+    def stream(chunks, decimals=False, columns=None):
+        """Validate and tokenize an equation read in chunks, yielding every token as soon as it is complete
+
+        A token may span chunks, so the trailing run of a chunk that could still grow is carried over to the next one.
+        Between chunks only the positions of the unclosed brackets are kept. Raises a CustomError pointing at the
+        column of the first invalid token. With columns, a list, the column of every Digit, Variable and Reference is
+        appended to it in the order they are yielded.
+        """
+        expect_operand = True
+        brackets = []
+        calls = []
+        offset = 0
+        carry = ""
+
+        def fail(message, pos):
+            return CustomError(message=message, column=offset + pos + 1)
+
+        for chunk in chain(chunks, [None]):
+            buffer = carry + chunk if chunk is not None else carry
+            size = len(buffer)
+            limit = size if chunk is None else Tokenizer.boundary(buffer)
+            pos = 0
+
+            while pos < limit:
+                atom = buffer[pos]
+
+                if atom.isspace():
+                    pos += 1
+                    continue
+
+                if atom in WORD:
+                    end_pos = pos + 1
+                    while end_pos < size and buffer[end_pos] in WORD:
+                        end_pos += 1
+
+                    if decimals and atom in DIGITS and end_pos < size and buffer[end_pos] == ".":
+                        end_pos += 1
+                        while end_pos < size and buffer[end_pos] in WORD:
+                            end_pos += 1
+
+                    value = buffer[pos:end_pos]
+                    if end_pos < size and buffer[end_pos] == "(" and atom not in DIGITS:
+                        if not expect_operand or not value.isalpha():
+                            raise fail("Invalid Expression", pos)
+
+                        brackets.append(offset + end_pos)
+                        calls.append(True)
+                        yield Call(value)
+                        pos = end_pos + 1
+                        continue
+
+                    if atom in DIGITS:
+                        if not value.isdigit():
+                            whole, point, fraction = value.partition(".")
+                            if not (point and whole.isdigit() and fraction.isdigit()):
+                                raise fail("Unknown variable", pos)
+                        token = Digit(value)
+                    else:
+                        if not value.isalpha():
+                            raise fail("Unknown variable", pos)
+                        token = Variable(value)
+
+                    if not expect_operand:
+                        raise fail("Invalid Expression", pos)
+
+                    if columns is not None:
+                        columns.append(offset + pos + 1)
+                    yield token
+                    expect_operand = False
+                    pos = end_pos
+
+                elif atom == "$":
+                    end_pos = pos + 1
+                    if end_pos < size and buffer[end_pos] == "_":
+                        end_pos += 1
+                        index = 0
+                    else:
+                        while end_pos < size and buffer[end_pos] in WORD:
+                            end_pos += 1
+                        index = buffer[pos + 1:end_pos]
+                        if not index.isdigit() or not int(index):
+                            raise fail("Invalid Expression", pos)
+
+                    if not expect_operand:
+                        raise fail("Invalid Expression", pos)
+
+                    if columns is not None:
+                        columns.append(offset + pos + 1)
+                    yield Reference(index)
+                    expect_operand = False
+                    pos = end_pos
+
+                elif atom == "(":
+                    if not expect_operand:
+                        raise fail("Invalid Expression", pos)
+
+                    brackets.append(offset + pos)
+                    calls.append(False)
+                    yield LeftBracket
+                    pos += 1
+
+                elif atom == ")":
+                    if expect_operand or not brackets:
+                        raise fail("Invalid Expression", pos)
+
+                    brackets.pop()
+                    calls.pop()
+                    yield RightBracket
+                    pos += 1
+
+                elif atom == ",":
+                    if expect_operand or not calls or not calls[-1]:
+                        raise fail("Invalid Expression", pos)
+
+                    yield Comma
+                    expect_operand = True
+                    pos += 1
+
+                elif atom in SIGNS:
+                    if expect_operand:
+                        raise fail("Invalid Expression", pos)
+
+                    end_pos = pos + 1
+                    while end_pos < size and (buffer[end_pos] in SIGNS or buffer[end_pos].isspace()):
+                        end_pos += 1
+
+                    yield Operator.determine_operator_method(buffer[pos:end_pos])
+                    expect_operand = True
+                    pos = end_pos
+
+                elif atom in OPERATIONS:
+                    if expect_operand or (pos + 1 < size and buffer[pos + 1] == atom):
+                        raise fail("Invalid Expression", pos)
+
+                    yield Operator.determine_operator_method(atom)
+                    expect_operand = True
+                    pos += 1
+
+                else:
+                    raise fail("Invalid Expression", pos)
+
+            carry = buffer[limit:]
+            offset += limit
+
+        if expect_operand:
+            raise fail("Invalid Expression", 0)
+
+        if brackets:
+            raise CustomError(message="Invalid Expression", column=brackets[-1] + 1)
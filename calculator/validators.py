@@ -1,73 +1,128 @@
-import re
-
-from commands import Command
-from exceptions import CustomError
-from operators import OPERATORS
-from tokens import Tokenizer
-from variables import Variable
+from .commands import Command
+from .exceptions import CustomError
+from .functions import Function
+from .histories import Reference
+from .tokens import Tokenizer
+from .variables import Variable
 
 
 class Validator:
-    """Validates user input before any actions occur"""
+    """Validates user input before any actions occur
+
+    Every error points at the column of the input it was found at: the identifier, the `=` of an assignment missing
+    its value, or the token of the value or expression at fault.
+    """
 
-    def __init__(self, content, memory):
+    def __init__(self, content, memory, stats=None, decimals=False):
         self.content = content
         self.memory = memory
+        self.stats = stats
+        self.decimals = decimals
 
     def validate(self):
-        if not self.content:
+        content = self.content.strip()
+        if not content:
             return self.format(error=CustomError(message=None))
 
-        if self.is_command(content=self.content):
-            return self.format(success=Command(instruction=self.content.split("/")[1]))
+        if self.is_command(content=content):
+            instruction, *arguments = content[1:].split() or [""]
+            return self.format(success=Command(instruction=instruction, arguments=arguments))
 
         if self.is_assignment(content=self.content):
             key = self.extract_key(self.content)
             value = self.extract_value(self.content)
 
+            definition = Function.parse(key)
+            if definition is not None:
+                return self.define(*definition, value)
+
             if not Variable.is_check(key):
-                return self.format(error=CustomError(message="Invalid identifier"))
+                return self.fail("Invalid identifier", self.content.index(key) + 1)
 
-            if not Validator.is_valid_assignee(value):
-                return self.format(error=CustomError(message="Invalid assignment"))
+            if self.is_literal(value):
+                return self.format(success=({key: value}))
 
-            if not self.is_in_memory(value):
-                return self.format(error=CustomError(message="Unknown variable"))
+            if value is None:
+                return self.fail("Invalid assignment", self.content.rindex("=") + 1)
 
-            return self.format(success=({key: value}))
+            tokenizer = Tokenizer(buffer=value, decimals=self.decimals)
+            error = tokenizer.scan()
+            if error:
+                return self.fail("Invalid assignment", self.value_offset(value) + error.column)
 
-        if self.is_variable_valid_and_exists(content=self.content):
-            return self.format(error=CustomError(message="Unknown variable"))
+            unknown = self.find_unknown_variable(tokenizer)
+            if unknown is not None:
+                return self.fail("Unknown variable", self.value_offset(value) + unknown)
 
-        if self.is_valid_single_character(content=self.content):
-            return self.format(error=CustomError(message="Unknown variable"))
+            dependencies = self.memory.extract_dependencies(tokenizer.tokens)
+            if self.memory.is_cyclic(key, dependencies):
+                return self.fail("Cyclic assignment", self.value_offset(value) + 1)
 
-        if self.is_open_and_close_bracket_balance(content=self.content):
-            return self.format(error=CustomError(message="Invalid Expression"))
+            return self.format(success=({key: tokenizer}))
 
-        if self.is_valid_operator_repetition(content=self.content):
-            return self.format(error=CustomError(message="Invalid Expression"))
+        tokenizer = Tokenizer(buffer=self.content, decimals=self.decimals)
+        if self.stats is None:
+            error = tokenizer.scan()
+        else:
+            start = self.stats.clock()
+            error = tokenizer.scan()
+            self.stats.record("tokenize", start)
+        if error:
+            return self.format(error=error)
 
-        if self.is_operator_placement_valid(content=self.content):
-            return self.format(error=CustomError(message="Invalid Expression"))
+        unknown = self.find_unknown_variable(tokenizer)
+        if unknown is not None:
+            return self.fail("Unknown variable", unknown)
 
-        else:
-            return self.format(success=Tokenizer(buffer=self.content, memory=self.memory))
+        return self.format(success=tokenizer)
+
+    def define(self, name, parameters, value):
+        """A Function out of a definition, `f(x, y) = x ^ 2 + y`, its body only reading parameters and variables"""
+        start = self.content.index("(")
+        for number, parameter in enumerate(parameters):
+            start = self.content.index(parameter, start)
+            if not Variable.is_check(parameter) or parameter in parameters[:number]:
+                return self.fail("Invalid identifier", start + 1)
+            start += len(parameter)
+
+        if value is None:
+            return self.fail("Invalid assignment", self.content.rindex("=") + 1)
+
+        tokenizer = Tokenizer(buffer=value, decimals=self.decimals)
+        error = tokenizer.scan()
+        if error:
+            return self.fail("Invalid assignment", self.value_offset(value) + error.column)
+
+        reference = next((token for token in tokenizer.tokens if isinstance(token, Reference)), None)
+        if reference is not None:
+            return self.fail("Invalid assignment", self.value_offset(value) + tokenizer.column(reference))
+
+        unknown = self.find_unknown_variable(tokenizer, parameters)
+        if unknown is not None:
+            return self.fail("Unknown variable", self.value_offset(value) + unknown)
+
+        return self.format(success=Function(name, parameters, tokenizer))
 
     @staticmethod
     def format(success=None, error=None):
         return success, error
 
+    def fail(self, message, column):
+        return self.format(error=CustomError(message=message, column=column))
+
+    def value_offset(self, value):
+        """The offset of the value of an assignment in the input, added to a column of the value to give its column"""
+        return self.content.index(value, self.content.index("="))
+
     def is_in_memory(self, content):
-        try:
-            return type(int(content)) == int
-        except ValueError:
-            return type(self.memory.get(content)) == int
+        if content.isdigit():
+            return True
+        return self.memory.get(content) is not None
 
     @staticmethod
-    def is_valid_assignee(content):
+    def is_literal(content):
         try:
-            return Variable.is_check(variable=content) or type(int(content)) == int
+            return type(int(content)) == int
         except (TypeError, ValueError):
             return False
 
@@ -88,31 +143,15 @@ class Validator:
         except ValueError:
             return None
 
-    @staticmethod
-    def is_valid_operator_repetition(content):
-        multiple_multiplication = re.search(r"(\*)\1+", content)
-        multiple_division = re.search(r"(/)\1+", content)
-        multiple_Exponentiation = re.search(r"(\^)\1+", content)
-
-        return any([multiple_multiplication, multiple_division, multiple_Exponentiation])
-
-    @staticmethod
-    def is_open_and_close_bracket_balance(content):
-        return not content.count("(") == content.count(")")
-
-    def is_valid_single_character(self, content):
-        return len(content.split()) == 1 and not self.is_valid_assignee(content=content)
-
     @staticmethod
     def is_command(content):
         return content.startswith("/")
 
-    def is_variable_valid_and_exists(self, content):
-        return Variable.is_check(variable=content) and not self.is_in_memory(content=content)
-
-    @staticmethod
-    def is_operator_placement_valid(content):
-        startswith = any([content.startswith(op) for op in OPERATORS])
-        endswith = any([content.endswith(op) for op in OPERATORS])
+    def find_unknown_variable(self, tokenizer, parameters=()):
+        """The column of the first Variable of tokenizer that is neither in memory nor a parameter, or None"""
+        for token in tokenizer.tokens:
+            if isinstance(token, Variable) and token.variable not in parameters:
+                if not self.is_in_memory(token.variable):
+                    return tokenizer.column(token)
+        return None
 
-        return any([startswith, endswith])
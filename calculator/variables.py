@@ -1,9 +1,9 @@
-import string
-
-
 class Variable:
     """A representation of variable"""
 
+    __slots__ = ("variable",)
+    opcode = 1
+
     def __init__(self, variable):
         self.variable = variable
 
@@ -12,9 +12,4 @@ class Variable:
 
     @staticmethod
     def is_check(variable):
-        alphabet = string.ascii_letters
-        count = 0
-        for k in variable:
-            count += alphabet.count(k)
-
-        return count == len(variable)
+        return variable.isascii() and variable.isalpha()
@@ -0,0 +1,272 @@
+import csv
+from collections import deque
+
+from .digits import Digit
+from .exceptions import CustomError
+from .functions import Call
+from .histories import Reference
+from .governors import Governor
+from .operators import Addition, Subtraction, Multiplication, Division, Exponentiation, LeftBracket, RightBracket
+from .operators import Precedence
+from .variables import Variable
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+POLICIES = ("promote", "raise", "wrap")
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+
+class VectorCalculator:
+    """A Calculator running one parsed equation over whole columns of variable values
+
+    Every operator is applied once per column with int64 array operations. The overflow policy decides what happens
+    when an int64 operation overflows: `promote` falls back to Python ints for that operation and what follows, `raise`
+    fails the rows that overflowed and `wrap` keeps the wrapped around int64 values.
+
+    A row fails on its own, like the same expression would in the scalar Calculator: `errors` maps it to its first
+    message and its operands are replaced by 1 so the other rows carry on. The Governor checks the whole column at
+    once and only goes row by row when the largest operands of the column are too large.
+    """
+
+    def __init__(self, buffer, columns, overflow="promote", governor=None):
+        if numpy is None:
+            raise CustomError(message="Vectorized evaluation requires numpy")
+
+        if overflow not in POLICIES:
+            raise CustomError(message=f"Unknown overflow policy {overflow}")
+
+        self.buffer = buffer
+        self.columns = {name: self.to_array(values) for name, values in columns.items()}
+        if len({len(column) for column in self.columns.values()}) > 1:
+            raise CustomError(message="Columns differ in length")
+        self.overflow = overflow
+        self.governor = governor or Governor()
+        self.size = max((len(column) for column in self.columns.values()), default=1)
+        self.errors = {}
+        self.__result = deque()
+        self.__operators = deque()
+        self.__operations = {
+            Addition: self.add,
+            Subtraction: self.subtract,
+            Multiplication: self.multiply,
+            Division: self.divide,
+            Exponentiation: self.exponentiate,
+        }
+
+    @staticmethod
+    def to_array(values):
+        try:
+            return numpy.asarray(values, dtype=numpy.int64)
+        except OverflowError:
+            return numpy.asarray([int(value) for value in values], dtype=object)
+
+    @staticmethod
+    def peek(stack):
+        return stack[-1]
+
+    def resolve(self, variable):
+        try:
+            return self.columns[variable.variable]
+        except KeyError:
+            raise CustomError(message="Unknown variable")
+
+    def fail(self, rows, message, *operands):
+        """Give message to the rows of a mask that have not failed yet and replace the operands of every row by 1"""
+        rows = numpy.broadcast_to(rows, (self.size,))
+        if not numpy.any(rows):
+            return operands
+
+        for row in numpy.flatnonzero(rows).tolist():
+            self.errors.setdefault(row, message)
+        replaced = []
+        for operand in operands:
+            operand = numpy.array(numpy.broadcast_to(operand, (self.size,)))
+            operand[rows] = 1
+            replaced.append(operand)
+        return replaced
+
+    def checked(self, result, overflowed, fallback):
+        if not numpy.any(overflowed):
+            return result
+
+        if self.overflow == "raise":
+            result, = self.fail(overflowed, "Integer overflow", result)
+            return result
+
+        if self.overflow == "wrap":
+            return result
+
+        return fallback()
+
+    @staticmethod
+    def promote(*operands):
+        return [operand.astype(object) if isinstance(operand, numpy.ndarray) else operand for operand in operands]
+
+    @staticmethod
+    def is_native(*operands):
+        for operand in operands:
+            if isinstance(operand, numpy.ndarray):
+                if operand.dtype != numpy.int64:
+                    return False
+            elif not INT64_MIN <= operand <= INT64_MAX:
+                return False
+        return True
+
+    def add(self, first, second):
+        if not self.is_native(first, second):
+            return numpy.add(first, second, dtype=object)
+
+        result = numpy.add(first, second)
+        overflowed = ((first ^ result) & (second ^ result)) < 0
+        return self.checked(result, overflowed, lambda: numpy.add(*self.promote(first, second)))
+
+    def subtract(self, first, second):
+        if not self.is_native(first, second):
+            return numpy.subtract(first, second, dtype=object)
+
+        result = numpy.subtract(first, second)
+        overflowed = ((first ^ second) & (first ^ result)) < 0
+        return self.checked(result, overflowed, lambda: numpy.subtract(*self.promote(first, second)))
+
+    def multiply(self, first, second):
+        if not self.is_native(first, second):
+            return numpy.multiply(first, second, dtype=object)
+
+        result = numpy.multiply(first, second)
+        with numpy.errstate(divide="ignore", over="ignore"):
+            divisor = numpy.where(first == 0, 1, first)
+            overflowed = (first != 0) & ((result // divisor != second) | ((first == -1) & (second == INT64_MIN)))
+        return self.checked(result, overflowed, lambda: numpy.multiply(*self.promote(first, second)))
+
+    def divide(self, first, second):
+        first, second = self.fail(numpy.asarray(second) == 0, "Division by zero", first, second)
+
+        if not self.is_native(first, second):
+            return numpy.floor_divide(first, second, dtype=object)
+
+        with numpy.errstate(over="ignore"):
+            result = numpy.floor_divide(first, second)
+        overflowed = (numpy.asarray(first) == INT64_MIN) & (numpy.asarray(second) == -1)
+        return self.checked(result, overflowed, lambda: numpy.floor_divide(*self.promote(first, second)))
+
+    def exponentiate(self, first, second):
+        zero = (numpy.asarray(first) == 0) & (numpy.asarray(second) < 0)
+        first, second = self.fail(zero, "Division by zero", first, second)
+
+        if self.is_native(first, second) and numpy.all(numpy.asarray(second) >= 0):
+            estimate = Governor.estimate(Exponentiation, self.magnitude(first), int(numpy.max(second)))
+            if estimate < 63:
+                return numpy.power(first, second)
+
+        result = numpy.frompyfunc(Exponentiation.power, 2, 1)(*self.promote(first, second))
+        if not self.is_native(first, second):
+            return result
+
+        overflowed = (result < INT64_MIN) | (result > INT64_MAX)
+        wrapped = ((result - INT64_MIN) % (1 << 64) + INT64_MIN).astype(numpy.int64)
+        return self.checked(wrapped, overflowed, lambda: result)
+
+    @staticmethod
+    def magnitude(operand):
+        if not isinstance(operand, numpy.ndarray):
+            return abs(operand)
+        if not operand.size:
+            return 0
+        return max(abs(int(operand.max())), abs(int(operand.min())))
+
+    def check(self, operator, first, second):
+        """The operands of an operation, the rows whose result the Governor finds too large being failed"""
+        exponent = int(numpy.max(second)) if operator is Exponentiation else self.magnitude(second)
+        try:
+            self.governor.check(operator, self.magnitude(first), exponent)
+            return first, second
+        except CustomError as error:
+            if error.message != "Result too large":
+                raise
+
+        rows = zip(numpy.broadcast_to(first, (self.size,)).tolist(), numpy.broadcast_to(second, (self.size,)).tolist())
+        too_large = numpy.fromiter(
+            (Governor.estimate(operator, abs(base), value) > self.governor.max_bits for base, value in rows),
+            dtype=bool, count=self.size
+        )
+        return self.fail(too_large, "Result too large", first, second)
+
+    def calculate_result_stack(self, operator):
+        second_operand = self.__result.pop()
+        first_operand = self.__result.pop()
+        first_operand, second_operand = self.check(operator, first_operand, second_operand)
+        self.__result.append(self.__operations[operator](first_operand, second_operand))
+
+    def calculate(self):
+        self.governor.start()
+        for v in self.buffer:
+            if isinstance(v, Digit):
+                self.__result.append(v.number)
+
+            elif isinstance(v, Variable):
+                self.__result.append(self.resolve(v))
+
+            elif isinstance(v, Reference):
+                raise CustomError(message="Unknown result")
+
+            elif isinstance(v, Call):
+                raise CustomError(message="Unknown function")
+
+            elif v == LeftBracket:
+                self.__operators.append(v)
+
+            elif v == RightBracket:
+                operator = self.__operators.pop()
+
+                while not operator == LeftBracket:
+                    self.calculate_result_stack(operator=operator)
+                    operator = self.__operators.pop()
+            else:
+                while len(self.__operators) and Precedence.yields(v, self.peek(self.__operators)):
+                    operator = self.__operators.pop()
+                    self.calculate_result_stack(operator=operator)
+
+                self.__operators.append(v)
+
+        while len(self.__operators):
+            operator = self.__operators.pop()
+            self.calculate_result_stack(operator=operator)
+
+        return numpy.broadcast_to(self.__result.pop(), (self.size,))
+
+
+def load_columns(path):
+    """Read a CSV file with a header row of variable names into one column of integers per variable
+
+    Every row must hold one integer per name of the header, the CustomError of a bad row giving its line number.
+    """
+    try:
+        with open(path, newline="") as stream:
+            reader = csv.reader(stream)
+            names = [name.strip() for name in next(reader, [])]
+            rows = [(reader.line_num, row) for row in reader if row]
+    except (OSError, UnicodeDecodeError, csv.Error):
+        raise CustomError(message=f"Cannot read {path}")
+
+    if not names:
+        raise CustomError(message="No columns")
+
+    for name in names:
+        if not Variable.is_check(name):
+            raise CustomError(message="Invalid identifier")
+
+    columns = [[] for _ in names]
+    for number, row in rows:
+        if len(row) != len(names):
+            raise CustomError(message=f"Row {number} has {len(row)} values for {len(names)} columns")
+        for column, value in zip(columns, row):
+            try:
+                column.append(int(value))
+            except ValueError:
+                raise CustomError(message=f"Invalid integer {value.strip()!r} on row {number}")
+
+    return dict(zip(names, columns))
@@ -0,0 +1,221 @@
+import difflib
+import hashlib
+import os
+import sys
+import time
+
+from .calculator import Calculator
+from .commands import Command
+from .exceptions import CustomError
+from .functions import Function
+from .validators import Validator
+
+
+class Row:
+    """One line of a watched file with its content hash, the name it assigns and its last result"""
+
+    __slots__ = ("text", "digest", "key", "stream", "version", "output", "failed", "shown")
+
+    def __init__(self, text):
+        self.text = text
+        self.digest = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        self.key = self.assigned(text)
+        self.stream = None
+        self.version = None
+        self.output = None
+        self.failed = False
+        self.shown = None
+
+    @staticmethod
+    def assigned(text):
+        """The variable, or `f()` for a function, a line assigns, or None for any other line"""
+        if Validator.is_command(text.strip()) or not Validator.is_assignment(text):
+            return None
+
+        try:
+            key = Validator.extract_key(text)
+        except ValueError:
+            return None
+        definition = Function.parse(key)
+        return key if definition is None else f"{definition[0]}()"
+
+    def reset(self):
+        self.stream = None
+        self.version = None
+        self.output = None
+        self.failed = False
+
+    def fail(self, error):
+        self.output = error.message
+        self.failed = bool(error.message)
+
+    def __repr__(self):
+        return f"Row {self.text!r}"
+
+
+class Watcher:
+    """Keep the results of a file of assignments and expressions up to date while it is being edited
+
+    The file is polled every interval seconds and read again when its size or modification time changed. Its lines
+    are matched with those of the previous read by content hash, so an edit only reaches the lines it touched:
+
+    - the file is a sheet, every variable holding its last assignment in the file. Only the assignments that changed
+      are applied, the Memory recomputing the formulas downstream of them, and an assignment failing on a variable
+      assigned further down is retried until no more of them succeed
+    - an expression is calculated again when its text changed or one of the variables it reads was written since,
+      every other result comes from the previous read
+    - removing the last assignment of a variable, or breaking one that held, starts the sheet over in a new Session
+
+    Only the results that changed are printed, as `line: result`, followed by the time the update took.
+    """
+
+    INTERVAL = 0.5
+
+    def __init__(self, path, session, interval=None, output=print, errors=None):
+        self.path = path
+        self.factory = session
+        self.session = session()
+        self.interval = self.INTERVAL if interval is None else interval
+        self.output = output
+        self.errors = errors or sys.stderr
+        self.rows = []
+        self.definitions = {}
+        self.stamp = None
+
+    def read(self):
+        """The lines of the file, or None when it did not change since the last read"""
+        try:
+            status = os.stat(self.path)
+            stamp = (status.st_mtime_ns, status.st_size)
+            if stamp == self.stamp:
+                return None
+
+            with open(self.path) as source:
+                texts = source.read().splitlines()
+        except (OSError, UnicodeDecodeError):
+            if self.stamp is not False:
+                self.errors.write(f"Cannot read {self.path}\n")
+            self.stamp = False
+            return None
+
+        self.stamp = stamp
+        return texts
+
+    def match(self, texts):
+        """The Rows of texts, reusing the Row of every line the previous read had too"""
+        rows = [Row(text) for text in texts]
+        matcher = difflib.SequenceMatcher(
+            None, [row.digest for row in self.rows], [row.digest for row in rows], autojunk=False
+        )
+        for tag, first, last, start, _ in matcher.get_opcodes():
+            if tag == "equal":
+                rows[start:start + last - first] = self.rows[first:last]
+        return rows
+
+    def assign(self, rows):
+        """Apply rows in file order, retrying those that failed as long as another one succeeded"""
+        while rows:
+            failed = []
+            for row in rows:
+                result, error = self.session.process(row.text)
+                if isinstance(error, CustomError):
+                    row.fail(error)
+                    failed.append(row)
+                else:
+                    row.output, row.failed = None, False
+
+            if len(failed) == len(rows):
+                break
+            rows = failed
+
+    def calculate(self, row):
+        """Validate a changed expression and calculate it against the Memory of the session"""
+        session = self.session
+        if row.stream is None:
+            success, error = Validator(row.text, session.memory, decimals=not session.backend.integral).validate()
+            if isinstance(error, CustomError):
+                return row.fail(error)
+            if isinstance(success, Command):
+                row.output, row.failed = None, False
+                return None
+            row.stream = session.compile(success.tokenize())
+
+        row.version = session.memory.values.version
+        calculator = Calculator(
+            buffer=row.stream, memory=session.memory, governor=session.governor, backend=session.backend,
+            functions=session.functions
+        )
+        try:
+            row.output, row.failed = str(calculator.calculate()), False
+        except CustomError as error:
+            row.fail(error)
+
+    def update(self, rows):
+        """Bring the results of rows up to date and return how many lines were applied or calculated
+
+        Lines that failed are only tried again once an assignment changed, since nothing else can make them succeed.
+        """
+        definitions = {row.key: row for row in rows if row.key is not None}
+        effective = [row for row in rows if row.key is not None and definitions[row.key] is row]
+        held = {key for key, row in self.definitions.items() if not row.failed}
+        changed = [row for row in effective if row is not self.definitions.get(row.key)]
+        if changed:
+            changed = [row for row in effective if row.failed or row is not self.definitions.get(row.key)]
+        self.assign(changed)
+
+        rebuild = any(key not in definitions for key in self.definitions)
+        if rebuild or any(row.failed and row.key in held for row in changed):
+            self.session = self.factory()
+            for row in rows:
+                row.reset()
+            changed = effective
+            self.assign(changed)
+
+        for row in rows:
+            if row.key is not None and definitions[row.key] is not row:
+                row.reset()
+        self.rows, self.definitions = rows, definitions
+
+        work = len(changed)
+        values = self.session.memory.values
+        for row in rows:
+            if row.key is not None or not row.text.strip() or Validator.is_command(row.text.strip()):
+                continue
+            if row.stream is None:
+                stale = not row.failed or changed
+            else:
+                stale = (changed and row.stream.volatile) or values.changed(row.stream.names, row.version)
+            if stale:
+                self.calculate(row)
+                work += 1
+        return work
+
+    def poll(self):
+        """Read the file if it changed and print the results that changed, returning how many did"""
+        texts = self.read()
+        if texts is None:
+            return 0
+
+        start = time.perf_counter()
+        rows = self.match(texts)
+        work = self.update(rows)
+        elapsed = time.perf_counter() - start
+
+        shown = 0
+        for number, row in enumerate(rows, 1):
+            if row.output != row.shown:
+                row.shown = row.output
+                if row.output is not None:
+                    self.output(f"{number}: {row.output}")
+                    shown += 1
+        self.errors.write(f"{shown} results changed, {work} of {len(rows)} lines evaluated in {elapsed * 1e3:.1f}ms\n")
+        return shown
+
+    def run(self):
+        try:
+            while True:
+                self.poll()
+                sys.stdout.flush()
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            return None
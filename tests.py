@@ -198,4 +198,4 @@ class CalcTest(StageTest):
 
 
 if __name__ == '__main__':
-    CalcTest("calculator.calculator").run_tests()
+    CalcTest("calculator.__main__").run_tests()
@@ -0,0 +1,65 @@
+import pickle
+import unittest
+from decimal import Decimal
+from fractions import Fraction
+
+from calculator import CustomError, Session
+from calculator.backends import BACKENDS, INTEGER, Backend, numbers
+
+
+def outcome(session, line):
+    """The result of a line, or the message of the error it ended with"""
+    result, error = session.process(line)
+    return error.message if isinstance(error, CustomError) else result
+
+
+class BackendTest(unittest.TestCase):
+    EXPECTED = {
+        "int": (0, 3),
+        "fraction": (Fraction(1, 3), Fraction(7, 2)),
+        "decimal": (Decimal(1) / Decimal(3), Decimal("3.5")),
+        "float": (1 / 3, 3.5),
+    }
+
+    def test_division(self):
+        for name in BACKENDS:
+            session = Session(backend=numbers(name))
+            self.assertEqual((outcome(session, "1 / 3"), outcome(session, "7 / 2")), self.EXPECTED[name], name)
+
+    def test_division_by_zero(self):
+        for name in BACKENDS:
+            session = Session(backend=numbers(name))
+            self.assertEqual(outcome(session, "1 / 0"), "Division by zero", name)
+            self.assertEqual(outcome(session, "0 ^ (0 - 1)"), "Division by zero", name)
+
+    def test_decimal_literals(self):
+        self.assertEqual(outcome(Session(), "x = 1.5"), "Invalid assignment")
+        session = Session(backend=numbers("fraction"))
+        outcome(session, "x = 1.5")
+        self.assertEqual(outcome(session, "x * 2"), 3)
+
+    def test_backend_is_abstract(self):
+        with self.assertRaises(TypeError):
+            Backend()
+
+    def test_failures_are_reported_per_backend(self):
+        self.assertEqual(outcome(Session(backend=numbers("fraction")), "4 ^ (1 / 2)"), "Inexact result")
+        session = Session(backend=numbers("float"))
+        self.assertEqual(outcome(session, "10 ^ 400"), "Result too large")
+        self.assertEqual(outcome(session, "(0 - 8) ^ (1 / 3)"), "Undefined result")
+
+    def test_decimal_precision(self):
+        session = Session(backend=numbers("decimal", precision=5))
+        self.assertEqual(outcome(session, "1 / 3"), Decimal("0.33333"))
+        self.assertEqual(pickle.loads(pickle.dumps(session.backend)).precision, 5)
+
+    def test_lookup(self):
+        self.assertIs(numbers(), INTEGER)
+        self.assertIs(numbers("int"), INTEGER)
+        with self.assertRaises(CustomError) as context:
+            numbers("complex")
+        self.assertEqual(context.exception.message, "Unknown numbers complex")
+
+
+if __name__ == "__main__":
+    unittest.main()
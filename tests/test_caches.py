@@ -0,0 +1,55 @@
+import unittest
+
+from calculator import Session
+from calculator.caches import ExpressionCache
+
+
+class ExpressionCacheTest(unittest.TestCase):
+    def test_least_recently_used_is_evicted(self):
+        cache = ExpressionCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+        self.assertEqual(cache.stats(), {"size": 2, "maxsize": 2, "hits": 3, "misses": 1, "evictions": 1})
+
+    def test_put_refreshes_an_entry(self):
+        cache = ExpressionCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.put("a", 10)
+        cache.put("c", 3)
+        self.assertEqual((cache.get("a"), cache.get("b")), (10, None))
+
+    def test_zero_size_keeps_nothing(self):
+        cache = ExpressionCache(maxsize=0)
+        cache.put("a", 1)
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.get("a"))
+
+    def test_normalize(self):
+        self.assertEqual(ExpressionCache.normalize("  x   +\t1 "), "x + 1")
+
+
+class LateBindingTest(unittest.TestCase):
+    def test_cached_expression_reads_current_values(self):
+        session = Session(cache_size=8)
+        session.process("x = 2")
+        self.assertEqual(session.process("x * 10"), (20, None))
+        session.process("x = 3")
+        self.assertEqual(session.process("x  *  10"), (30, None))
+        self.assertEqual((session.cache.hits, len(session.cache)), (1, 1))
+
+    def test_evicted_expression_is_parsed_again(self):
+        session = Session(cache_size=1)
+        session.process("x = 2")
+        for line in ("x + 1", "x + 2", "x + 1"):
+            session.process(line)
+        self.assertEqual(session.cache.stats()["evictions"], 2)
+        self.assertEqual(session.process("x + 1"), (3, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import io
+import unittest
+from contextlib import redirect_stderr
+from unittest import mock
+
+from calculator import CustomError, evaluate
+from calculator.calculator import batch, evaluate_stream, main
+
+
+def run(text, **options):
+    output, errors = io.StringIO(), io.StringIO()
+    batch(io.StringIO(text), output=output, errors=errors, **options)
+    return output.getvalue(), errors.getvalue().splitlines()
+
+
+class BatchTest(unittest.TestCase):
+    def test_results_in_input_order(self):
+        output, _ = run("1 + 2\nx = 4\nx * 2\n\n0 - 10\n")
+        self.assertEqual(output, "3\n8\n-10\n")
+
+    def test_errors_are_reported_with_their_line(self):
+        output, errors = run("1 + 2\nmissing\n7\n")
+        self.assertEqual(output, "3\n7\n")
+        self.assertEqual(errors[0], "2:1: Unknown variable")
+        self.assertIn("3 lines", errors[1])
+        self.assertIn("1 errors", errors[1])
+
+    def test_exit_stops_the_run(self):
+        output, errors = run("1\n/exit\n2\n")
+        self.assertEqual(output, "1\n")
+        self.assertIn("2 lines", errors[0])
+
+    def test_cache_summary(self):
+        _, errors = run("1 + 1\n1 + 1\n", cache_size=8)
+        self.assertIn("'hits': 1", errors[-1])
+
+
+class StreamTest(unittest.TestCase):
+    VARIABLES = {"abc": 3, "bc": 4}
+
+    def test_every_chunk_size_gives_the_same_result(self):
+        for expression in ("12 + 345 * (67 - 8)", "abc * bc - (abc + 1000) / bc", "2 ^ 3 ^ 2 - 511"):
+            expected = evaluate(expression, self.VARIABLES)
+            for size in range(1, len(expression) + 2):
+                result = evaluate_stream(io.StringIO(expression), self.VARIABLES, size=size)
+                self.assertEqual(result, expected, (expression, size))
+
+    def test_expression_may_span_lines(self):
+        self.assertEqual(evaluate_stream(io.StringIO("abc * 2 +\n bc\n"), self.VARIABLES, size=3), 10)
+
+    def test_decimal_point_split_across_chunks(self):
+        for size in (1, 2, 3, 4):
+            self.assertEqual(str(evaluate_stream(io.StringIO("1.25 + 2.50"), size=size, backend="decimal")), "3.75")
+
+    def test_long_expression_in_small_chunks(self):
+        expression = " + ".join(str(value) for value in range(10000))
+        self.assertEqual(evaluate_stream(io.StringIO(expression), size=7), sum(range(10000)))
+
+    def test_errors_keep_their_column_across_chunks(self):
+        for size in (1, 3, 64):
+            with self.assertRaises(CustomError) as context:
+                evaluate_stream(io.StringIO("1 + 2 +* 3"), size=size)
+            self.assertEqual((context.exception.message, context.exception.column), ("Invalid Expression", 8))
+
+        with self.assertRaises(CustomError) as context:
+            evaluate_stream(io.StringIO("10 / (5 - 5)"), size=2)
+        self.assertEqual(context.exception.message, "Division by zero")
+
+
+class MainTest(unittest.TestCase):
+    def parse(self, *arguments):
+        with mock.patch("sys.argv", ["calculator", *arguments]), redirect_stderr(io.StringIO()) as errors:
+            with self.assertRaises(SystemExit) as context:
+                main()
+        return context.exception.code, errors.getvalue()
+
+    def test_unknown_flag_is_an_error(self):
+        code, errors = self.parse("--vectorise", "x")
+        self.assertEqual(code, 2)
+        self.assertIn("unrecognized arguments: --vectorise", errors)
+
+    def test_vectorize_requires_columns(self):
+        code, errors = self.parse("--vectorize", "x")
+        self.assertEqual(code, 2)
+        self.assertIn("--vectorize requires --columns", errors)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from calculator import Calculator, CustomError, Governor, Memory
+from calculator.compilers import Compiler
+from calculator.streams import TokenStream
+from calculator.tokens import Tokenizer
+
+
+def stream(expression):
+    return TokenStream(Tokenizer(buffer=expression).tokenize())
+
+
+def calculate(tokens, memory=None, governor=None):
+    """The result of calculating tokens, or the message of the error it ended with"""
+    try:
+        return Calculator(buffer=tokens, memory=memory, governor=governor).calculate()
+    except CustomError as error:
+        return error.message
+
+
+class CompiledTest(unittest.TestCase):
+    def setUp(self):
+        self.memory = Memory()
+        self.memory.update({"x": "1023", "y": "-4"})
+
+    def results(self, expression, governor=None):
+        tokens = stream(expression)
+        results = [calculate(tokens, self.memory, governor) for _ in range(Compiler.THRESHOLD + 2)]
+        self.assertIsNotNone(tokens.compiled)
+        return results
+
+    def test_compiled_only_after_threshold(self):
+        tokens = stream("x + 1")
+        for _ in range(Compiler.THRESHOLD - 1):
+            calculate(tokens, self.memory)
+        self.assertIsNone(tokens.compiled)
+        calculate(tokens, self.memory)
+        self.assertIsNotNone(tokens.compiled)
+
+    def test_compiled_results_match_the_loop(self):
+        for expression in ("x + 1", "x * y - 3 / 2", "(x - y) / (y + 4)", "2 ^ y", "x - x - x - 1", "y / (x - x)"):
+            results = self.results(expression)
+            self.assertEqual(len(set(map(repr, results))), 1, expression)
+
+    def test_compiled_expression_keeps_the_limit(self):
+        self.assertEqual(set(self.results("x + 1", Governor(max_bits=10))), {"Result too large"})
+        self.assertEqual(set(self.results("x * 2 * 2", Governor(max_bits=10))), {"Result too large"})
+
+    def test_source_checks_every_operation(self):
+        source = Compiler(stream("x * 2 + 1 + y")).source()
+        self.assertIn("check(MULTIPLICATION, t0, k0)", source)
+        self.assertIn("check_run(ADDITION, (t1, k1, t2))", source)
+
+    def test_functions_are_not_compiled(self):
+        self.assertFalse(Compiler.eligible(TokenStream(Tokenizer(buffer="f(1) + 1").tokenize())))
+        self.assertFalse(Compiler.eligible(stream(" + ".join(["1"] * Compiler.MAX_TOKENS))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import threading
+import unittest
+
+from calculator import ConcurrentMemory, CustomError
+from calculator.concurrency import PAGE_SIZE
+
+
+class ViewTest(unittest.TestCase):
+    def setUp(self):
+        self.memory = ConcurrentMemory()
+        self.memory.update({"x": "1", "y": "x * 2"})
+
+    def test_view_keeps_its_values(self):
+        view = self.memory.view()
+        self.memory.update({"x": "5", "z": "7"})
+        self.assertEqual((view.get("x"), view.get("y"), view.get("z")), (1, 2, None))
+        self.assertNotIn("z", view)
+        self.assertEqual(self.memory.evaluate("x + y", view), 3)
+        self.assertEqual(self.memory.evaluate("x + y + z"), 22)
+
+    def test_unknown_variable_in_old_view(self):
+        view = self.memory.view()
+        self.memory.update({"z": "7"})
+        with self.assertRaises(CustomError) as context:
+            self.memory.evaluate("z", view)
+        self.assertEqual(context.exception.message, "Unknown variable")
+
+    def test_pages_are_shared(self):
+        self.memory.update({f"v{number}": str(number) for number in range(PAGE_SIZE * 3)})
+        view = self.memory.view()
+        self.memory.update({"x": "2"})
+        current = self.memory.view()
+        self.assertEqual(sum(old is new for old, new in zip(view.pages, current.pages)), len(view.pages) - 1)
+        self.assertEqual(dict(current.items()), {**dict(view.items()), "x": 2, "y": 4})
+
+    def test_failed_update_publishes_nothing_new(self):
+        view = self.memory.view()
+        with self.assertRaises(CustomError):
+            self.memory.update({"x": "y + 1"})
+        self.assertEqual(self.memory.snapshot(), dict(view.items()))
+
+    def test_restore_publishes_a_new_view(self):
+        view = self.memory.view()
+        self.memory.restore({"a": 4})
+        self.assertEqual(self.memory.snapshot(), {"a": 4})
+        self.assertEqual(self.memory.evaluate("a * 2"), 8)
+        self.assertEqual(self.memory.evaluate("x + y", view), 3)
+
+
+class ThreadTest(unittest.TestCase):
+    WRITES = 300
+    READERS = 4
+
+    def test_readers_see_consistent_views(self):
+        memory = ConcurrentMemory()
+        memory.update({"x": "0", "y": "x * 2", "z": "y + x"})
+        failures, done = [], threading.Event()
+
+        def write():
+            for value in range(1, self.WRITES + 1):
+                memory.update({"x": str(value)})
+            done.set()
+
+        def read():
+            version = -1
+            while not done.is_set():
+                view = memory.view()
+                if view.version < version:
+                    failures.append(f"version {view.version} after {version}")
+                version = view.version
+                check = memory.evaluate("z - x * 3", view)
+                if check != 0:
+                    failures.append(f"z - x * 3 = {check} at version {version}")
+
+        threads = [threading.Thread(target=read) for _ in range(self.READERS)]
+        threads.append(threading.Thread(target=write))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(failures, [])
+        self.assertEqual(memory.evaluate("z"), self.WRITES * 3)
+
+    def test_concurrent_writers(self):
+        memory = ConcurrentMemory()
+        memory.update({"total": "0"})
+        names = [[f"w{writer}_{number}" for number in range(50)] for writer in range(4)]
+
+        def write(own):
+            for number, name in enumerate(own):
+                memory.update({name: str(number)})
+
+        threads = [threading.Thread(target=write, args=(own,)) for own in names]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        expected = {name: number for own in names for number, name in enumerate(own)}
+        self.assertEqual(memory.snapshot(), {"total": 0, **expected})
+
+
+if __name__ == "__main__":
+    unittest.main()
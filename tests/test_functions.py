@@ -0,0 +1,94 @@
+import unittest
+
+from calculator import CustomError, Session
+from calculator.commands import CommandCenter
+
+
+def outcome(session, line):
+    """The result of a line, or the message of the error it ended with"""
+    result, error = session.process(line)
+    return error.message if isinstance(error, CustomError) else result
+
+
+def command(session, line):
+    lines = []
+    instruction, _ = session.process(line)
+    CommandCenter(command=instruction, output=lines.append, session=session).execute()
+    return lines
+
+
+class FunctionTest(unittest.TestCase):
+    def setUp(self):
+        self.session = Session(max_depth=5)
+        for line in ("y = 1", "f(x) = x * 2 + y", "k(x) = x + 1"):
+            self.assertIsNone(outcome(self.session, line))
+
+    def test_call(self):
+        self.assertEqual(outcome(self.session, "f(3)"), 7)
+        self.assertEqual(outcome(self.session, "f(k(2)) * 2"), 14)
+
+    def test_cached_result_follows_variables(self):
+        self.assertEqual(outcome(self.session, "f(3)"), 7)
+        outcome(self.session, "y = 10")
+        self.assertEqual(outcome(self.session, "f(3)"), 16)
+
+    def test_wrong_number_of_arguments(self):
+        self.assertEqual(outcome(self.session, "f(1, 2)"), "Wrong number of arguments")
+
+    def test_unknown_function(self):
+        self.assertEqual(outcome(self.session, "g(1)"), "Unknown function")
+
+    def test_nested_calls_within_depth(self):
+        self.assertEqual(outcome(self.session, "k(k(k(k(k(k(1))))))"), 7)
+
+    def test_recursion_limit(self):
+        outcome(self.session, "h(x) = h(x - 1)")
+        self.assertEqual(outcome(self.session, "h(3)"), "Recursion limit exceeded")
+        outcome(self.session, "a(x) = b(x)")
+        outcome(self.session, "b(x) = a(x)")
+        self.assertEqual(outcome(self.session, "a(1)"), "Recursion limit exceeded")
+
+    def test_calls_nest_deeper_than_the_interpreter_stack(self):
+        session = Session()
+        outcome(session, "k(x) = x + 1")
+        self.assertEqual(outcome(session, "k(" * 900 + "0" + ")" * 900), 900)
+
+    def test_redefinition_reaches_callers(self):
+        for line in ("a(x) = x + 1", "b(x) = a(x) * 2", "c(x) = b(x) + y"):
+            outcome(self.session, line)
+        self.assertEqual(outcome(self.session, "c(1)"), 5)
+        outcome(self.session, "a(x) = x + 100")
+        self.assertEqual(outcome(self.session, "c(1)"), 203)
+
+
+class FunctionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.session = Session(function_cache=2)
+        outcome(self.session, "f(x) = x * 2")
+
+    def test_least_recently_used_result_is_evicted(self):
+        for line in ("f(1)", "f(1)", "f(2)", "f(3)", "f(1)"):
+            outcome(self.session, line)
+        function = self.session.functions.get("f")
+        self.assertEqual((function.hits, function.misses, function.evictions), (1, 4, 2))
+        self.assertEqual(list(function.cache), [(3,), (1,)])
+
+    def test_functions_command(self):
+        outcome(self.session, "f(1)")
+        outcome(self.session, "f(1)")
+        self.assertEqual(
+            command(self.session, "/functions"), ["f(x) = x * 2  (cache 1/2, hits 1, misses 1, hit rate 50.0%)"]
+        )
+        self.assertEqual(command(self.session, "/functions clear"), ["Function caches cleared"])
+        self.assertEqual(self.session.functions.get("f").cache, {})
+        self.assertEqual(command(Session(), "/functions"), ["No functions"])
+
+    def test_disabled_cache(self):
+        session = Session(function_cache=0)
+        outcome(session, "f(x) = x * 2")
+        self.assertEqual((outcome(session, "f(4)"), outcome(session, "f(4)")), (8, 8))
+        self.assertEqual(len(session.functions.get("f").cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+from calculator import Calculator, CustomError, Governor
+from calculator.operators import Addition, Exponentiation, Multiplication
+from calculator.streams import TokenStream
+from calculator.tokens import Tokenizer
+
+
+def stream(expression):
+    return TokenStream(Tokenizer(buffer=expression).tokenize())
+
+
+def calculate(tokens, memory=None, governor=None):
+    """The result of calculating tokens, or the message of the error it ended with"""
+    try:
+        return Calculator(buffer=tokens, memory=memory, governor=governor).calculate()
+    except CustomError as error:
+        return error.message
+
+
+class PowerTest(unittest.TestCase):
+    def test_exponentiation_is_right_associative(self):
+        self.assertEqual(calculate(stream("2 ^ 3 ^ 2")), 512)
+        self.assertEqual(calculate(stream("(2 ^ 3) ^ 2")), 64)
+
+    def test_negative_exponents(self):
+        self.assertEqual(calculate(stream("2 ^ (0 - 1)")), 0)
+        self.assertEqual(calculate(stream("1 ^ (0 - 5)")), 1)
+        self.assertEqual(calculate(stream("0 ^ (0 - 1)")), "Division by zero")
+
+
+class GovernorTest(unittest.TestCase):
+    def test_estimates(self):
+        self.assertEqual(Governor.estimate(Exponentiation, 1, 10 ** 9), 1)
+        self.assertEqual(Governor.estimate(Exponentiation, 2, 100), 100)
+        self.assertEqual(Governor.estimate(Multiplication, 255, 255), 16)
+        self.assertEqual(Governor.estimate(Addition, 255, 1), 9)
+
+    def test_huge_power_is_rejected(self):
+        self.assertEqual(calculate(stream("9 ^ 9 ^ 9")), "Result too large")
+
+    def test_limit_applies_to_every_operator(self):
+        governor = Governor(max_bits=10)
+        self.assertEqual(calculate(stream("1000 * 1000"), governor=governor), "Result too large")
+        self.assertEqual(calculate(stream("1023 + 1"), governor=governor), "Result too large")
+        self.assertEqual(calculate(stream("2 ^ 11"), governor=governor), "Result too large")
+        self.assertEqual(calculate(stream("1 + 2 + 3"), governor=governor), 6)
+
+    def test_timeout(self):
+        governor = Governor(timeout=1e-9)
+        self.assertEqual(calculate(stream(" + ".join(["7 * 7"] * 2000)), governor=governor), "Calculation timed out")
+
+    def test_timeout_disabled(self):
+        self.assertEqual(calculate(stream(" + ".join(["7 * 7"] * 2000)), governor=Governor(timeout=0)), 98000)
+
+
+if __name__ == "__main__":
+    unittest.main()
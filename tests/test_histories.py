@@ -0,0 +1,77 @@
+import unittest
+
+from calculator import CustomError, Session
+from calculator.commands import CommandCenter
+from calculator.histories import History
+
+
+def outcome(session, line):
+    """The result of a line, or the message of the error it ended with"""
+    result, error = session.process(line)
+    return error.message if isinstance(error, CustomError) else result
+
+
+class HistoryStoreTest(unittest.TestCase):
+    def test_results_are_numbered_from_one(self):
+        history = History(maxsize=3)
+        for result in (10, 20, 30, 40):
+            history.append(result)
+        self.assertEqual(list(history.items()), [(2, 20), (3, 30), (4, 40)])
+        self.assertEqual((history.get(0), history.get(2), len(history)), (40, 20, 3))
+        for index in (1, 5):
+            with self.assertRaises(CustomError):
+                history.get(index)
+
+    def test_empty_and_disabled(self):
+        with self.assertRaises(CustomError):
+            History().get(0)
+
+        history = History(maxsize=0)
+        history.append(1)
+        self.assertEqual((len(history), history.count), (0, 1))
+        with self.assertRaises(CustomError):
+            history.get(1)
+
+
+class HistoryTest(unittest.TestCase):
+    def test_references(self):
+        session = Session()
+        for line in ("1 + 1", "10", "$1 * $2"):
+            outcome(session, line)
+        self.assertEqual(outcome(session, "$_ + 1"), 21)
+        self.assertEqual(outcome(session, "$3"), 20)
+        self.assertEqual(outcome(session, "$9"), "Unknown result")
+
+    def test_evicted_results_are_unknown(self):
+        session = Session(history_size=2)
+        for line in ("1", "2", "3"):
+            outcome(session, line)
+        self.assertEqual(outcome(session, "$1"), "Unknown result")
+        self.assertEqual(outcome(session, "1 + $1"), "Unknown result")
+        self.assertEqual(outcome(session, "$2"), 2)
+
+    def test_memoized_reference_follows_history(self):
+        session = Session()
+        outcome(session, "5")
+        self.assertEqual(outcome(session, "$_ + 1"), 6)
+        self.assertEqual(outcome(session, "$_ + 1"), 7)
+
+    def test_formula_reading_history_is_fixed(self):
+        session = Session()
+        outcome(session, "4")
+        outcome(session, "x = $1 * 2")
+        outcome(session, "100")
+        self.assertEqual(outcome(session, "x"), 8)
+
+    def test_history_command_lists_kept_results(self):
+        session = Session(history_size=2)
+        for line in ("1", "x = 5", "2", "3"):
+            outcome(session, line)
+        lines = []
+        command, _ = session.process("/history")
+        CommandCenter(command=command, output=lines.append, session=session).execute()
+        self.assertEqual(lines, ["$2: 2", "$3: 3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
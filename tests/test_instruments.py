@@ -0,0 +1,75 @@
+import unittest
+
+from calculator import Session
+from calculator.commands import CommandCenter
+from calculator.instruments import Histogram, Statistics
+
+
+class HistogramTest(unittest.TestCase):
+    def test_values_are_bucketed_by_bit_length(self):
+        histogram = Histogram()
+        for value in (0, 1, 3, 4, 1000):
+            histogram.record(value)
+        self.assertEqual(histogram.buckets[:4], [1, 1, 1, 1])
+        self.assertEqual(histogram.buckets[10], 1)
+        self.assertEqual((histogram.count, histogram.total, histogram.maximum), (5, 1008, 1000))
+        self.assertEqual(histogram.mean, 201.6)
+
+    def test_percentiles_are_bucket_bounds(self):
+        histogram = Histogram()
+        for value in [5] * 99 + [3000]:
+            histogram.record(value)
+        self.assertEqual(histogram.percentile(0.5), 7)
+        self.assertEqual(histogram.percentile(0.99), 7)
+        self.assertEqual(histogram.percentile(1.0), 3000)
+
+    def test_empty(self):
+        self.assertEqual((Histogram().mean, Histogram().percentile(0.5)), (0, 0))
+
+
+class StatisticsTest(unittest.TestCase):
+    def setUp(self):
+        self.session = Session(stats=Statistics())
+        for line in ("x = 2", "x + 1", "x + 1", "x + 1", "missing", "1 +* 2", "missing"):
+            self.session.process(line)
+
+    def command(self, line):
+        lines = []
+        command, _ = self.session.process(line)
+        CommandCenter(command=command, output=lines.append, session=self.session).execute()
+        return lines
+
+    def test_stages_are_counted(self):
+        stats = self.session.stats
+        self.assertEqual((stats.lines, stats.hits, stats.memoized), (7, 2, 2))
+        self.assertEqual(stats.stages["assign"].count, 1)
+        self.assertEqual(stats.stages["calculate"].count, 1)
+        self.assertEqual(stats.stages["validate"].count, 5)
+        self.assertEqual(stats.tokens.count, 1)
+        self.assertEqual(stats.errors, {"Unknown variable": 2, "Invalid Expression": 1})
+
+    def test_summary(self):
+        summary, = self.command("/stats")
+        lines = summary.splitlines()
+        self.assertEqual(lines[0], "lines: 8 (cache hits 2, memoized results 2)")
+        self.assertEqual(lines[1].split(), ["stage", "count", "mean", "p50", "p99", "max"])
+        self.assertEqual(lines[-3:], ["errors: 3", "  Unknown variable: 2", "  Invalid Expression: 1"])
+
+    def test_reset(self):
+        self.assertEqual(self.command("/stats reset"), ["Statistics reset"])
+        self.assertEqual((self.session.stats.lines, sum(self.session.stats.errors.values())), (0, 0))
+        self.assertEqual(self.command("/stats everything"), ["Unknown command"])
+
+    def test_disabled(self):
+        self.session = Session()
+        self.assertEqual(self.command("/stats"), ["Statistics are disabled, start with --stats"])
+
+    def test_durations(self):
+        self.assertEqual(
+            [Statistics.duration(value) for value in (512, 1500, 2 * 10 ** 6, 3 * 10 ** 9)],
+            ["512ns", "1.5us", "2.0ms", "3.0s"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from argparse import Namespace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+import loadtest  # noqa: E402
+
+
+def arguments(target="inprocess", sessions=2, replay=None):
+    return Namespace(target=target, sessions=sessions, seed=0, rate=0, replay=replay)
+
+
+class WorkloadTest(unittest.TestCase):
+    def test_sessions_are_seeded(self):
+        first = loadtest.Workload(3).sessions(2, 50)
+        again = loadtest.Workload(3).session(0, 50)
+        self.assertEqual([repr(line) for line in first[0]], [repr(line) for line in again])
+        self.assertNotEqual([line.text for line in first[0]], [line.text for line in first[1]])
+        self.assertEqual([len(session) for session in first], [50, 50])
+        self.assertEqual([line.text[:4] for line in first[0][:4]], ["a = ", "b = ", "c = ", "d = "])
+
+    def test_record_and_replay(self):
+        sessions = loadtest.Workload(1).sessions(3, 20)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "sessions.txt")
+        loadtest.record(path, sessions)
+
+        replayed = loadtest.load(path)
+        self.assertEqual([[line.text for line in session] for session in replayed],
+                         [[line.text for line in session] for session in sessions])
+        self.assertNotIn("invalid", {line.kind for session in replayed for line in session})
+
+    def test_schedule(self):
+        self.assertEqual(loadtest.schedule([[1, 2]], 0), [[None, None]])
+        self.assertEqual(loadtest.schedule([[1, 2], [3, 4]], 4), [[0.0, 0.5], [0.25, 0.75]])
+
+
+class InProcessTest(unittest.TestCase):
+    def test_every_line_ends_as_expected(self):
+        sessions = loadtest.Workload(0).sessions(2, 300)
+        results, elapsed = loadtest.inprocess(sessions, loadtest.schedule(sessions, 0))
+        summary, unexpected = loadtest.report(results, elapsed, arguments())
+
+        self.assertEqual(unexpected, [])
+        self.assertEqual(summary["lines"], 600)
+        self.assertEqual(summary["latency"]["all"]["count"], 600)
+        invalid = sum(line.kind == "invalid" for session in sessions for line in session)
+        self.assertEqual(sum(summary["errors"].values()), invalid)
+
+
+class ReplTest(unittest.TestCase):
+    def setUp(self):
+        self.process = subprocess.Popen(
+            loadtest.COMMAND, cwd=loadtest.ROOT, env=dict(os.environ, PYTHONUNBUFFERED="1"), stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1
+        )
+        self.addCleanup(self.process.wait)
+        self.addCleanup(self.process.stdin.close)
+        loadtest.exchange(self.process, "")
+
+    def test_exchange_reads_up_to_the_markers(self):
+        self.assertEqual(loadtest.exchange(self.process, "1 + 1"), ["2"])
+        self.assertEqual(loadtest.exchange(self.process, "x = 4"), [])
+        self.assertEqual(loadtest.exchange(self.process, "/unknown"), ["Unknown command"])
+        self.assertEqual(loadtest.exchange(self.process, "1 +* 2"), ["Invalid Expression"])
+        self.assertEqual(loadtest.exchange(self.process, "$_ * x"), ["8"])
+
+    def test_repl_matches_inprocess(self):
+        sessions = loadtest.Workload(2).sessions(2, 60)
+        due = loadtest.schedule(sessions, 0)
+        outcomes = {}
+        for target, driver in (("inprocess", loadtest.inprocess), ("repl", loadtest.repl)):
+            results, elapsed = driver(sessions, due)
+            summary, unexpected = loadtest.report(results, elapsed, arguments(target))
+            self.assertEqual(unexpected, [], target)
+            outcomes[target] = sorted((line.text, message) for line, _, message in results)
+        self.assertEqual(outcomes["repl"], outcomes["inprocess"])
+
+
+if __name__ == "__main__":
+    unittest.main()
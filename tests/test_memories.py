@@ -0,0 +1,117 @@
+import unittest
+
+from calculator import CustomError, Governor, Memory, Session
+
+
+def outcome(session, line):
+    """The result of a line, or the message of the error it ended with"""
+    result, error = session.process(line)
+    return error.message if isinstance(error, CustomError) else result
+
+
+class MemoryTest(unittest.TestCase):
+    def setUp(self):
+        self.memory = Memory()
+        self.memory.update({"n": "4", "c": "n", "d": "c"})
+
+    def test_references_resolve_through_the_graph(self):
+        self.assertEqual((self.memory.get("c"), self.memory.get("d")), (4, 4))
+        self.memory.update({"n": "9"})
+        self.assertEqual((self.memory.get("c"), self.memory.get("d")), (9, 9))
+
+    def test_downstream_is_topological(self):
+        self.memory.update({"e": "n + d"})
+        order = self.memory.downstream("n")
+        self.assertEqual(order[0], "n")
+        self.assertLess(order.index("c"), order.index("d"))
+        self.assertLess(order.index("d"), order.index("e"))
+
+    def test_values_are_cached(self):
+        self.memory.update({"e": "d * 2"})
+        self.assertEqual(self.memory.update({"x": "1"}), 0)
+        self.assertEqual(self.memory.values.get("e"), 8)
+
+    def test_unchanged_value_stops_propagation(self):
+        self.memory.update({"e": "d * 0", "f": "e + 1"})
+        self.assertEqual(self.memory.update({"n": "5"}), 3)
+
+    def test_cycles_are_detected(self):
+        self.assertTrue(self.memory.is_cyclic("n", {"d"}))
+        self.assertTrue(self.memory.is_cyclic("n", {"n"}))
+        self.assertFalse(self.memory.is_cyclic("d", {"n"}))
+        with self.assertRaises(CustomError) as context:
+            self.memory.update({"n": "d"})
+        self.assertEqual(context.exception.message, "Cyclic assignment")
+        self.assertEqual(self.memory.get("n"), 4)
+
+    def test_reassignment_drops_old_edges(self):
+        self.memory.update({"c": "7"})
+        self.memory.update({"n": "1"})
+        self.assertEqual((self.memory.get("c"), self.memory.get("d")), (7, 7))
+        self.assertFalse(self.memory.is_cyclic("n", {"c"}))
+
+
+class FormulaTest(unittest.TestCase):
+    def setUp(self):
+        self.session = Session()
+        for line in ("price = 10", "qty = 3", "total = price * qty + 1"):
+            self.assertIsNone(outcome(self.session, line))
+
+    def test_formula_reads_its_variables(self):
+        self.assertEqual(outcome(self.session, "total"), 31)
+        self.assertEqual(self.session.memory.memory["total"], "price * qty + 1")
+
+    def test_formula_is_recomputed_downstream(self):
+        outcome(self.session, "double = total * 2")
+        outcome(self.session, "price = 20")
+        self.assertEqual(outcome(self.session, "total"), 61)
+        self.assertEqual(outcome(self.session, "double"), 122)
+
+    def test_only_changed_formulas_are_recomputed(self):
+        outcome(self.session, "other = qty + 1")
+        self.assertEqual(self.session.memory.update({"price": "11"}), 1)
+
+    def test_literal_assignment_replaces_formula(self):
+        outcome(self.session, "total = 5")
+        outcome(self.session, "price = 100")
+        self.assertEqual(outcome(self.session, "total"), 5)
+        self.assertNotIn("total", self.session.memory.memory)
+
+    def test_cycles_are_rejected(self):
+        self.assertEqual(outcome(self.session, "price = total + 1"), "Cyclic assignment")
+        self.assertEqual(outcome(self.session, "qty = qty + 1"), "Cyclic assignment")
+        self.assertEqual(outcome(self.session, "total"), 31)
+
+    def test_failing_formula_has_no_value_until_it_recovers(self):
+        outcome(self.session, "ratio = total / qty")
+        outcome(self.session, "qty = 0")
+        self.assertEqual(outcome(self.session, "ratio"), "Unknown variable")
+        outcome(self.session, "qty = 2")
+        self.assertEqual(outcome(self.session, "ratio"), 10)
+
+
+class MemoryGovernorTest(unittest.TestCase):
+    def test_assignment_follows_session_limit(self):
+        session = Session(governor=Governor(max_bits=10))
+        self.assertIs(session.memory.governor, session.governor)
+        self.assertEqual(outcome(session, "h = 2 ^ 100"), "Result too large")
+        outcome(session, "k = 3")
+        self.assertEqual(outcome(session, "j = k ^ 40"), "Result too large")
+
+    def test_assignment_follows_raised_limit(self):
+        session = Session(governor=Governor(max_bits=200000))
+        self.assertIsNone(outcome(session, "h = 2 ^ 70000 / 2 ^ 69999"))
+        self.assertEqual(outcome(session, "h"), 2)
+
+    def test_recomputed_formula_follows_limit(self):
+        session = Session(governor=Governor(max_bits=64))
+        outcome(session, "k = 3")
+        outcome(session, "j = k ^ 10")
+        outcome(session, "k = 1000")
+        self.assertEqual(outcome(session, "j"), "Unknown variable")
+        outcome(session, "k = 2")
+        self.assertEqual(outcome(session, "j"), 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
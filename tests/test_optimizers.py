@@ -0,0 +1,70 @@
+import unittest
+
+from calculator import Calculator, CustomError, Governor, Memory, Session
+from calculator.optimizers import Optimizer
+from calculator.streams import TokenStream
+from calculator.tokens import Tokenizer
+
+
+def calculate(tokens, memory=None, governor=None):
+    """The result of calculating tokens, or the message of the error it ended with"""
+    try:
+        return Calculator(buffer=TokenStream(tokens), memory=memory, governor=governor).calculate()
+    except CustomError as error:
+        return error.message
+
+
+def outcome(session, line):
+    """The result of a line, or the message of the error it ended with"""
+    result, error = session.process(line)
+    return error.message if isinstance(error, CustomError) else result
+
+
+class OptimizerTest(unittest.TestCase):
+    def optimize(self, expression, governor=None):
+        tokens = Tokenizer(buffer=expression).tokenize()
+        return tokens, Optimizer(buffer=tokens, governor=governor).optimize()
+
+    def test_folds_constants_and_drops_identities(self):
+        tokens, optimized = self.optimize("x * 1 + 2 * 3 - 0")
+        self.assertEqual(len(optimized), 3)
+
+        memory = Memory()
+        memory.update({"x": "5"})
+        self.assertEqual(calculate(optimized, memory), calculate(tokens, memory))
+
+    def test_folds_over_budget_are_left_as_written(self):
+        governor = Governor(max_bits=10)
+        for expression in ("1023 + 1 - 1", "0 - 1023 - 1 + 1", "1000 * 1000 / 1000", "3891 ^ 1", "2 ^ 11 / 2"):
+            tokens, optimized = self.optimize(expression, governor)
+            self.assertEqual(calculate(optimized, governor=governor), "Result too large", expression)
+            self.assertEqual(calculate(tokens, governor=governor), "Result too large", expression)
+
+    def test_folds_within_budget(self):
+        governor = Governor(max_bits=10)
+        _, optimized = self.optimize("500 + 10 - 400", governor)
+        self.assertEqual(len(optimized), 1)
+        self.assertEqual(calculate(optimized, governor=governor), 110)
+
+
+class SessionTest(unittest.TestCase):
+    def test_session_optimizes_repeated_expressions_only(self):
+        session = Session()
+        session.process("x = 2")
+        self.assertEqual(session.process("x * 1 + 4"), (6, None))
+        self.assertFalse(session.cache.get("x * 1 + 4").optimized)
+
+        for value in range(Optimizer.THRESHOLD + 1):
+            session.process(f"x = {value}")
+            self.assertEqual(session.process("x * 1 + 2 * 3"), (value + 6, None))
+        self.assertTrue(session.cache.get("x * 1 + 2 * 3").optimized)
+
+    def test_result_does_not_change_once_optimized(self):
+        session = Session(governor=Governor(max_bits=10))
+        for _ in range(Optimizer.THRESHOLD + 2):
+            self.assertEqual(outcome(session, "1023 + 1 - 1"), "Result too large")
+        self.assertTrue(session.cache.get("1023 + 1 - 1").optimized)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import io
+import unittest
+
+from calculator.parallel import ParallelBatch
+
+
+def run(text, **options):
+    output, errors = io.StringIO(), io.StringIO()
+    lines, failures, _ = ParallelBatch(output=output, errors=errors, **options).run(io.StringIO(text))
+    return output.getvalue().splitlines(), errors.getvalue().splitlines(), (lines, failures)
+
+
+class ParallelBatchTest(unittest.TestCase):
+    def test_results_in_input_order_across_chunks(self):
+        output, _, counts = run("".join(f"{value} * 2\n" for value in range(50)), workers=2, chunk_size=3)
+        self.assertEqual(output, [str(value * 2) for value in range(50)])
+        self.assertEqual(counts, (50, 0))
+
+    def test_chunks_see_the_assignments_before_them(self):
+        output, _, _ = run("x = 1\nx + 1\nx + 2\nx = 10\nx + 1\nx + 2\n", workers=2, chunk_size=1)
+        self.assertEqual(output, ["2", "3", "11", "12"])
+
+    def test_errors_are_reported_with_line_and_column(self):
+        output, errors, counts = run("1 + 2\nx = 1\nx + missing\n1 +* 2\n7\n", workers=2, chunk_size=2)
+        self.assertEqual(output, ["3", "7"])
+        self.assertEqual(errors[:2], ["3:5: Unknown variable", "4:4: Invalid Expression"])
+        self.assertIn("2 errors, 2 workers", errors[2])
+        self.assertEqual(counts, (5, 2))
+
+    def test_references_and_calls_wait_for_the_lines_before(self):
+        text = "2 + 3\n4 * 4\n$1 + $2\nf(a) = a * 10\nf($_)\n"
+        output, _, _ = run(text, workers=2, chunk_size=1)
+        self.assertEqual(output, ["5", "16", "21", "210"])
+
+    def test_exit_stops_the_run(self):
+        output, errors, counts = run("1\n2\n/exit\n3\n", workers=2, chunk_size=1)
+        self.assertEqual(output, ["1", "2"])
+        self.assertEqual(counts, (3, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import asyncio
+import unittest
+
+from calculator import Session
+from calculator.servers import Server
+
+
+class ServerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = Server(Session, port=0, max_connections=2, workers=2, line_limit=64)
+        self.listener = await self.server.start()
+        self.port = self.listener.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.listener.close()
+        await self.listener.wait_closed()
+        self.server.executor.shutdown(wait=True)
+
+    async def connect(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        self.addAsyncCleanup(self.close, writer)
+        return reader, writer
+
+    @staticmethod
+    async def close(writer):
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    @staticmethod
+    async def ask(reader, writer, line):
+        writer.write(f"{line}\n".encode())
+        await writer.drain()
+        return (await reader.readline()).decode().rstrip("\n")
+
+    async def test_sessions_are_isolated(self):
+        first, second = await self.connect(), await self.connect()
+        first[1].write(b"x = 3\n")
+        self.assertEqual(await self.ask(*first, "x * 2"), "6")
+        self.assertEqual(await self.ask(*second, "x * 2"), "Unknown variable")
+
+    async def test_connections_above_the_limit_are_turned_away(self):
+        first, second = await self.connect(), await self.connect()
+        self.assertEqual(await self.ask(*first, "1 + 1"), "2")
+        self.assertEqual(await self.ask(*second, "2 + 2"), "4")
+
+        reader, _ = await self.connect()
+        self.assertEqual(await reader.readline(), b"Too many connections\n")
+        self.assertEqual(await reader.readline(), b"")
+
+        await self.close(first[1])
+        while self.server.connections == 2:
+            await asyncio.sleep(0.01)
+        self.assertEqual(await self.ask(*await self.connect(), "3 + 3"), "6")
+
+    async def test_local_commands_are_rejected(self):
+        connection = await self.connect()
+        self.assertEqual(await self.ask(*connection, "/save snapshot.bin"), "Command not available")
+        self.assertEqual(await self.ask(*connection, "/load snapshot.bin"), "Command not available")
+        self.assertEqual(await self.ask(*connection, "1 + 1"), "2")
+
+    async def test_long_lines_close_the_connection(self):
+        reader, writer = await self.connect()
+        writer.write(b"1 + " * 64 + b"1\n")
+        await writer.drain()
+        self.assertEqual(await reader.readline(), b"Line too long\n")
+        self.assertEqual(await reader.readline(), b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
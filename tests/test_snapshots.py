@@ -0,0 +1,122 @@
+import os
+import struct
+import tempfile
+import unittest
+
+from decimal import Decimal
+from fractions import Fraction
+
+from calculator import CustomError, Memory, Snapshot, Session
+from calculator.backends import numbers
+from calculator.commands import CommandCenter
+from calculator.snapshots import HEADER, KINDS, MAGIC, VERSION
+
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "memory.snapshot")
+
+        self.session = Session()
+        for line in ("a = 3", "big = 2 ^ 200", "negative = 0 - 7", "b = a * 2", "c = b + a"):
+            self.session.process(line)
+        self.assertEqual(self.session.memory.save(self.path), 5)
+
+    def load(self):
+        memory = Memory()
+        memory.load(self.path)
+        self.addCleanup(memory.restore, {})
+        return memory
+
+    def test_round_trip(self):
+        memory = self.load()
+        self.assertEqual(
+            {name: memory.get(name) for name in ("a", "big", "negative", "b", "c")},
+            {"a": 3, "big": 2 ** 200, "negative": -7, "b": 6, "c": 9},
+        )
+
+    def test_loaded_formulas_are_recomputed(self):
+        memory = self.load()
+        memory.update({"a": "10"})
+        self.assertEqual((memory.get("b"), memory.get("c")), (20, 30))
+
+    def test_session_reads_loaded_memory(self):
+        session = Session(memory=self.load())
+        self.assertEqual(session.process("c * 2"), (18, None))
+        session.process("a = 1")
+        self.assertEqual(session.process("c * 2"), (6, None))
+
+    def assertInvalid(self, data):
+        with open(self.path, "wb") as stream:
+            stream.write(data)
+        with self.assertRaises(CustomError) as context:
+            Snapshot(self.path)
+        self.assertEqual(context.exception.message, "Invalid snapshot")
+
+    def test_truncated_files_are_rejected(self):
+        with open(self.path, "rb") as stream:
+            data = stream.read()
+        for length in range(len(data)):
+            self.assertInvalid(data[:length])
+
+    def test_header_claiming_more_entries_is_rejected(self):
+        self.assertInvalid(HEADER.pack(MAGIC, VERSION, 0, 1000, 0, HEADER.size, HEADER.size))
+
+    def test_wrong_magic_is_rejected(self):
+        self.assertInvalid(HEADER.pack(b"JUNK", VERSION, 0, 0, 0, HEADER.size, HEADER.size))
+
+    def test_unknown_kind_is_rejected(self):
+        self.assertInvalid(HEADER.pack(MAGIC, VERSION, len(KINDS), 0, 0, HEADER.size, HEADER.size))
+
+    def test_offsets_past_the_file_are_rejected(self):
+        with open(self.path, "rb") as stream:
+            data = bytearray(stream.read())
+        struct.pack_into("<I", data, HEADER.size, 1 << 20)
+        self.assertInvalid(bytes(data))
+
+
+class BackendSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "memory.snapshot")
+
+    @staticmethod
+    def command(session, line):
+        lines = []
+        command, _ = session.process(line)
+        CommandCenter(command=command, output=lines.append, session=session).execute()
+        return lines
+
+    def test_round_trip_keeps_the_numbers(self):
+        for name, kind in (("fraction", Fraction), ("decimal", Decimal), ("float", float)):
+            session = Session(backend=numbers(name))
+            for line in ("a = 2.50", "b = a / 3", "c = b + a"):
+                session.process(line)
+            self.assertEqual(self.command(session, f"/save {self.path}"), ["Saved 3 variables"], name)
+
+            loaded = Session(backend=numbers(name))
+            self.assertEqual(self.command(loaded, f"/load {self.path}"), ["Loaded 3 variables"], name)
+            result, _ = loaded.process("c")
+            self.assertIsInstance(result, kind, name)
+            self.assertEqual(result, session.process("c")[0], name)
+            self.assertEqual(str(loaded.memory.get("a")), str(session.memory.get("a")), name)
+            loaded.process("a = 3")
+            self.assertEqual(loaded.process("c"), session.process("3 / 3 + 3"), name)
+
+    def test_snapshot_only_loads_into_its_numbers(self):
+        session = Session(backend=numbers("decimal"))
+        session.process("a = 1.5")
+        self.command(session, f"/save {self.path}")
+        self.assertEqual(self.command(Session(), f"/load {self.path}"), ["Snapshot holds decimal numbers, not int"])
+
+        Session().memory.save(self.path)
+        self.assertEqual(
+            self.command(Session(backend=numbers("fraction")), f"/load {self.path}"),
+            ["Snapshot holds int numbers, not fraction"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+from decimal import Decimal
+from functools import reduce
+from operator import floordiv, sub
+
+from calculator import CustomError, Governor, evaluate
+from calculator.digits import Digit
+from calculator.functions import Call, Comma
+from calculator.histories import Reference
+from calculator.operators import Addition, Division, Exponentiation, LeftBracket, Multiplication, RightBracket
+from calculator.operators import Subtraction
+from calculator.streams import ShuntingYard, TokenStream
+from calculator.tokens import Tokenizer
+from calculator.variables import Variable
+
+BINARY = {operator.opcode: operator for operator in (Addition, Subtraction, Multiplication, Division, Exponentiation)}
+
+
+def stream(expression, decimals=False):
+    return TokenStream(Tokenizer(buffer=expression, decimals=decimals).tokenize())
+
+
+class TokenStreamTest(unittest.TestCase):
+    def test_opcodes_and_operands(self):
+        tokens = stream("f(x, $1) + x * 2 + 2")
+        self.assertEqual(
+            list(tokens.opcodes),
+            [
+                Call.opcode, Variable.opcode, Comma.opcode, Reference.opcode, RightBracket.opcode, Addition.opcode,
+                Variable.opcode, Multiplication.opcode, 0, Addition.opcode, 0,
+            ],
+        )
+        self.assertEqual(list(tokens.operands), [0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0])
+        self.assertEqual((tokens.constants, tokens.names, tokens.functions), ([2], ["x"], ["f"]))
+        self.assertEqual(len(tokens), 11)
+
+    def test_values_are_stored_once(self):
+        tokens = stream("a + b * a - 7 + 7 * 3 + b")
+        self.assertEqual(tokens.constants, [7, 3])
+        self.assertEqual(tokens.names, ["a", "b"])
+
+    def test_iterating_gives_the_tokens_back(self):
+        tokens = Tokenizer(buffer="(a + 12) * $_ - g(3)").tokenize()
+        self.assertEqual([repr(token) for token in TokenStream(tokens)], [repr(token) for token in tokens])
+
+    def test_decimals_keep_their_spelling(self):
+        tokens = stream("1.0 + 1 + 2.50 + 2.5 + 1.0", decimals=True)
+        self.assertEqual(tokens.constants, [Decimal("1.0"), 1, Decimal("2.50"), Decimal("2.5")])
+        self.assertEqual([str(constant) for constant in tokens.constants], ["1.0", "1", "2.50", "2.5"])
+        self.assertEqual(list(tokens.operands)[::2], [0, 1, 2, 3, 0])
+
+    def test_huge_integers_are_stored_once(self):
+        tokens = TokenStream([Digit(10 ** 5000), Addition, Digit(10 ** 5000)])
+        self.assertEqual(tokens.constants, [10 ** 5000])
+
+    def test_volatile_and_alias(self):
+        self.assertFalse(stream("a + 1").volatile)
+        self.assertTrue(stream("$_ + 1").volatile)
+        self.assertTrue(stream("g(1)").volatile)
+        self.assertTrue(stream("a").is_alias())
+        self.assertFalse(stream("a + 0").is_alias())
+
+
+class Recorder(ShuntingYard):
+    """A ShuntingYard recording the operator and arity of every reduction"""
+
+    def __init__(self, expression):
+        self.reductions = []
+        operators, arities = [], []
+        for opcode in stream(expression).opcodes:
+            if opcode == LeftBracket.opcode:
+                self.open(opcode, operators, arities)
+            elif opcode == RightBracket.opcode:
+                self.close(operators, arities)
+            elif opcode in BINARY:
+                self.operate(opcode, operators, arities)
+        self.finish(operators, arities)
+
+    def reduce(self, opcode, arity):
+        self.reductions.append((BINARY[opcode], arity))
+
+
+class RunTest(unittest.TestCase):
+    def test_runs_of_the_same_operator_are_reduced_at_once(self):
+        self.assertEqual(Recorder("1 + 2 + 3 + 4").reductions, [(Addition, 4)])
+        self.assertEqual(Recorder("1 - 2 - 3 * 4 * 5").reductions, [(Multiplication, 3), (Subtraction, 3)])
+        self.assertEqual(Recorder("1 + 2 - 3 + 4").reductions, [(Addition, 2), (Subtraction, 2), (Addition, 2)])
+        self.assertEqual(Recorder("(1 + 2 + 3) * 4").reductions, [(Addition, 3), (Multiplication, 2)])
+
+    def test_right_associative_operators_are_not_runs(self):
+        self.assertEqual(Recorder("2 ^ 3 ^ 2").reductions, [(Exponentiation, 2), (Exponentiation, 2)])
+
+    def test_long_runs_are_applied_every_run_operands(self):
+        count = ShuntingYard.RUN * 2 + 10
+        reductions = Recorder(" + ".join(["1"] * count)).reductions
+        self.assertEqual(reductions, [(Addition, ShuntingYard.RUN), (Addition, ShuntingYard.RUN), (Addition, 12)])
+        self.assertEqual(sum(arity - 1 for _, arity in reductions), count - 1)
+
+    def test_runs_match_left_to_right(self):
+        values = list(range(1000, 0, -7))
+        for operator, function in ((" - ", sub), (" / ", floordiv)):
+            expression = operator.join(map(str, [10 ** 40] + values))
+            self.assertEqual(evaluate(expression), reduce(function, values, 10 ** 40), operator)
+        self.assertEqual(evaluate(" * ".join(["3"] * 600)), 3 ** 600)
+        self.assertEqual(evaluate(" + ".join(["x"] * 600), {"x": 7}), 4200)
+
+    def test_division_by_zero_inside_a_run(self):
+        with self.assertRaises(CustomError) as context:
+            evaluate("100 / 2 / 0 / 5")
+        self.assertEqual(context.exception.message, "Division by zero")
+
+    def test_runs_are_checked_at_once(self):
+        self.assertEqual(Governor.estimate_run(Addition, [255, 1, 1, 1]), 11)
+        self.assertEqual(Governor.estimate_run(Multiplication, [255, 255, 0]), 0)
+        with self.assertRaises(CustomError) as context:
+            evaluate("500 + 10 + 1", governor=Governor(max_bits=10))
+        self.assertEqual(context.exception.message, "Result too large")
+        self.assertEqual(evaluate("500 + 10 + 1", governor=Governor(max_bits=11)), 511)
+
+    def test_runs_of_other_backends(self):
+        self.assertEqual(str(evaluate("1.5 + 2.5 + 3 - 0.5", backend="decimal")), "6.5")
+        self.assertEqual(str(evaluate("1 / 2 / 3", backend="fraction")), "1/6")
+        self.assertEqual(evaluate("1 - 0.5 - 0.25 - 0.125", backend="float"), 0.125)
+
+
+if __name__ == "__main__":
+    unittest.main()
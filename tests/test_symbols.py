@@ -0,0 +1,64 @@
+import unittest
+from fractions import Fraction
+
+from calculator.symbols import INT64_MAX, INT64_MIN, SPILLED, SymbolTable, Values
+
+
+class SymbolTableTest(unittest.TestCase):
+    def test_names_get_dense_ids_in_order(self):
+        symbols = SymbolTable()
+        self.assertEqual([symbols.intern(name) for name in ("b", "a", "b", "c")], [0, 1, 0, 2])
+        self.assertEqual((list(symbols), len(symbols)), (["b", "a", "c"], 3))
+        self.assertEqual((symbols.find("c"), symbols.find("d")), (2, None))
+        self.assertIn("a", symbols)
+        self.assertNotIn("d", symbols)
+
+    def test_one_copy_of_each_name(self):
+        symbols = SymbolTable()
+        name = "".join(["na", "me"])
+        symbols.intern(name)
+        symbols.intern("".join(["nam", "e"]))
+        self.assertIs(symbols.names[0], next(iter(symbols.ids)))
+        self.assertIs(symbols.names[0], name)
+
+
+class ValuesTest(unittest.TestCase):
+    def test_int64_values_are_packed(self):
+        values = Values({"low": INT64_MIN + 1, "high": INT64_MAX, "zero": 0})
+        self.assertEqual(list(values.packed), [INT64_MIN + 1, INT64_MAX, 0])
+        self.assertEqual(values.spilled, {})
+        self.assertEqual(dict(values.items()), {"low": INT64_MIN + 1, "high": INT64_MAX, "zero": 0})
+
+    def test_other_values_are_spilled(self):
+        values = Values({"marker": INT64_MIN, "big": INT64_MAX + 1, "half": Fraction(1, 2), "failed": None})
+        self.assertEqual(list(values.packed), [SPILLED] * 4)
+        self.assertEqual(values["marker"], INT64_MIN)
+        self.assertEqual(values["big"], INT64_MAX + 1)
+        self.assertEqual(values.get("half"), Fraction(1, 2))
+        self.assertIsNone(values.get("failed", 0))
+        self.assertEqual(values.get("missing", 0), 0)
+        with self.assertRaises(KeyError):
+            values["missing"]
+
+    def test_rewriting_moves_between_packed_and_spilled(self):
+        values = Values({"x": 2 ** 70})
+        values["x"] = 5
+        self.assertEqual((values["x"], values.spilled), (5, {}))
+        values["x"] = True
+        self.assertIs(values["x"], True)
+        self.assertEqual(len(values), 1)
+
+    def test_versions(self):
+        values = Values({"a": 1, "b": 2})
+        version = values.version
+        self.assertFalse(values.changed(["a", "b"], version))
+        self.assertTrue(values.changed(["missing"], version - 1))
+
+        values["b"] = 3
+        self.assertFalse(values.changed(["a"], version))
+        self.assertTrue(values.changed(["a", "b"], version))
+        self.assertFalse(values.changed(["b"], values.version))
+
+
+if __name__ == "__main__":
+    unittest.main()
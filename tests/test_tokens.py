@@ -0,0 +1,65 @@
+import unittest
+
+from calculator import CustomError
+from calculator.digits import Digit
+from calculator.histories import Reference
+from calculator.tokens import Tokenizer
+from calculator.variables import Variable
+
+OPERANDS = (Digit, Variable, Reference)
+
+
+def error(expression, decimals=False):
+    """The message and column of the error scanning expression ends with"""
+    found = Tokenizer(buffer=expression, decimals=decimals).scan()
+    return found and (found.message, found.column)
+
+
+class TokenizerTest(unittest.TestCase):
+    def test_tokens(self):
+        tokens = Tokenizer(buffer="ab + 12 * ($2 - $_)").tokenize()
+        self.assertEqual([type(token).__name__ for token in tokens if isinstance(token, OPERANDS)],
+                         ["Variable", "Digit", "Reference", "Reference"])
+        self.assertEqual(len(tokens), 9)
+
+    def test_sign_runs_are_one_operator(self):
+        self.assertEqual(len(Tokenizer(buffer="1 +-- - 2").tokenize()), 3)
+
+    def test_error_columns(self):
+        for expression, expected in (
+            ("1 +* 2", ("Invalid Expression", 4)),
+            ("* 2", ("Invalid Expression", 1)),
+            ("2 3", ("Invalid Expression", 3)),
+            ("1 + 2 +", ("Invalid Expression", 8)),
+            ("4 * (2 + 3", ("Invalid Expression", 5)),
+            ("4 + 3)", ("Invalid Expression", 6)),
+            ("1 + a1", ("Unknown variable", 5)),
+            ("2 ** 3", ("Invalid Expression", 3)),
+            ("1 + $0", ("Invalid Expression", 5)),
+            ("1 # 2", ("Invalid Expression", 3)),
+        ):
+            self.assertEqual(error(expression), expected, expression)
+
+    def test_decimals(self):
+        self.assertEqual(error("1.5"), ("Invalid Expression", 2))
+        self.assertFalse(error("1.5", decimals=True))
+        self.assertEqual(error("1.5.2", decimals=True), ("Invalid Expression", 4))
+
+    def test_column_of_a_token(self):
+        tokenizer = Tokenizer(buffer="  ab + (12 * $3)")
+        tokens = tokenizer.tokenize()
+        self.assertEqual([tokenizer.column(token) for token in tokens if isinstance(token, OPERANDS)], [3, 9, 14])
+
+    def test_stream_across_chunks(self):
+        tokens = list(Tokenizer.stream(["12", "3 + a", "bc * $", "_"]))
+        self.assertEqual((tokens[0].number, tokens[2].variable, str(tokens[4])), (123, "abc", "$_"))
+        self.assertEqual(len(tokens), 5)
+
+    def test_stream_error_column_counts_every_chunk(self):
+        with self.assertRaises(CustomError) as context:
+            list(Tokenizer.stream(["1 + 2", " + * 3"]))
+        self.assertEqual(context.exception.column, 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
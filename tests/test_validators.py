@@ -0,0 +1,61 @@
+import unittest
+
+from calculator import Memory
+from calculator.commands import Command
+from calculator.functions import Function
+from calculator.tokens import Tokenizer
+from calculator.validators import Validator
+
+
+class ValidatorTest(unittest.TestCase):
+    def setUp(self):
+        self.memory = Memory()
+        self.memory.update({"x": "2", "y": "x * 3"})
+
+    def error(self, line):
+        """The message and column of the error validating line ends with"""
+        _, error = Validator(line, self.memory).validate()
+        return error.message, error.column
+
+    def test_valid_inputs(self):
+        self.assertIsInstance(Validator("x + y * 2", self.memory).validate()[0], Tokenizer)
+        self.assertEqual(Validator("z = 5", self.memory).validate()[0], {"z": "5"})
+        self.assertIsInstance(Validator("z = x + 1", self.memory).validate()[0]["z"], Tokenizer)
+        self.assertIsInstance(Validator("f(a, b) = a + x", self.memory).validate()[0], Function)
+        self.assertIsInstance(Validator("/save file", self.memory).validate()[0], Command)
+
+    def test_empty_line_has_no_message(self):
+        self.assertEqual(Validator("   ", self.memory).validate()[1].message, None)
+
+    def test_expression_errors(self):
+        self.assertEqual(self.error("missing"), ("Unknown variable", 1))
+        self.assertEqual(self.error("x + y * missing"), ("Unknown variable", 9))
+        self.assertEqual(self.error("x +* 2"), ("Invalid Expression", 4))
+
+    def test_assignment_errors(self):
+        for line, expected in (
+            ("1a = 3", ("Invalid identifier", 1)),
+            ("  x1 = 3", ("Invalid identifier", 3)),
+            ("z =", ("Invalid assignment", 3)),
+            ("z = 1 = 2", ("Invalid assignment", 7)),
+            ("z = x +* 2", ("Invalid assignment", 8)),
+            ("z = (x", ("Invalid assignment", 5)),
+            ("z = x + missing", ("Unknown variable", 9)),
+            ("x = y + 1", ("Cyclic assignment", 5)),
+        ):
+            self.assertEqual(self.error(line), expected, line)
+
+    def test_definition_errors(self):
+        for line, expected in (
+            ("f(a, 1b) = a", ("Invalid identifier", 6)),
+            ("f(ab, b, ab) = b", ("Invalid identifier", 10)),
+            ("f(a) =", ("Invalid assignment", 6)),
+            ("f(a) = a + $1", ("Invalid assignment", 12)),
+            ("f(a) = a ** 2", ("Invalid assignment", 10)),
+            ("f(a) = a + missing", ("Unknown variable", 12)),
+        ):
+            self.assertEqual(self.error(line), expected, line)
+
+
+if __name__ == "__main__":
+    unittest.main()
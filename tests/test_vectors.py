@@ -0,0 +1,102 @@
+import io
+import os
+import tempfile
+import unittest
+
+from calculator import CustomError, Governor, evaluate
+from calculator.calculator import vectorize
+from calculator.tokens import Tokenizer
+from calculator.vectors import INT64_MAX, VectorCalculator, load_columns, numpy
+
+COLUMNS = {"x": [2, 1000000, 5, 0, -7], "y": [3, 0, 1, -1, 2]}
+
+
+def scalar(expression, row, governor=None):
+    """The result of expression on one row through the scalar Calculator, or its error message"""
+    try:
+        return evaluate(expression, {name: values[row] for name, values in COLUMNS.items()}, governor=governor)
+    except CustomError as error:
+        return error.message
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class VectorCalculatorTest(unittest.TestCase):
+    def calculate(self, expression, columns=COLUMNS, **options):
+        calculator = VectorCalculator(buffer=Tokenizer(buffer=expression).tokenize(), columns=columns, **options)
+        results = calculator.calculate()
+        return [calculator.errors.get(row, result) for row, result in enumerate(results.tolist())]
+
+    def assertMatchesScalar(self, expression, governor=None):
+        self.assertEqual(
+            self.calculate(expression, governor=governor),
+            [scalar(expression, row, governor) for row in range(len(COLUMNS["x"]))],
+            expression,
+        )
+
+    def test_rows_match_the_scalar_calculator(self):
+        for expression in ("x + y * 2", "x - (y - 4) * x", "x / 2", "x ^ 2 + y ^ 3", "(x + y) ^ 2 / 3"):
+            self.assertMatchesScalar(expression)
+
+    def test_division_by_zero_fails_its_row_only(self):
+        self.assertMatchesScalar("x / y")
+        self.assertMatchesScalar("y ^ (0 - 1)")
+        self.assertEqual(self.calculate("x / y"), [0, "Division by zero", 5, 0, -4])
+
+    def test_governor_fails_too_large_rows_only(self):
+        self.assertMatchesScalar("x ^ 5000")
+        self.assertMatchesScalar("x ^ 400", Governor(max_bits=1000))
+        self.assertEqual(self.calculate("x ^ 400", governor=Governor(max_bits=1000))[1], "Result too large")
+
+    def test_first_error_of_a_row_is_kept(self):
+        self.assertMatchesScalar("2 ^ (x * 1000) / y")
+
+    def test_overflow_policies(self):
+        columns = {"x": [INT64_MAX, 1]}
+        self.assertEqual(self.calculate("x + 1", columns), [INT64_MAX + 1, 2])
+        self.assertEqual(self.calculate("x + 1", columns, overflow="raise"), ["Integer overflow", 2])
+        self.assertEqual(self.calculate("x + 1", columns, overflow="wrap"), [-INT64_MAX - 1, 2])
+
+    def test_unknown_variable_fails_every_row(self):
+        with self.assertRaises(CustomError) as context:
+            self.calculate("z + 1")
+        self.assertEqual(context.exception.message, "Unknown variable")
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class ColumnsTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "columns.csv")
+
+    def write(self, text):
+        with open(self.path, "w") as stream:
+            stream.write(text)
+
+    def error(self, text):
+        self.write(text)
+        with self.assertRaises(CustomError) as context:
+            load_columns(self.path)
+        return context.exception.message
+
+    def test_load(self):
+        self.write("x, y\n1,2\n\n3,4\n")
+        self.assertEqual(load_columns(self.path), {"x": [1, 3], "y": [2, 4]})
+
+    def test_bad_files(self):
+        self.assertEqual(self.error(""), "No columns")
+        self.assertEqual(self.error("x,1y\n1,2\n"), "Invalid identifier")
+        self.assertEqual(self.error("x,y\n1,2\n3\n"), "Row 3 has 1 values for 2 columns")
+        self.assertEqual(self.error("x,y\n1,2\n3,four\n"), "Invalid integer 'four' on row 3")
+        with self.assertRaises(CustomError):
+            load_columns(os.path.join(self.path, "missing.csv"))
+
+    def test_vectorize_writes_one_line_per_row(self):
+        self.write("x,y\n6,2\n1,0\n")
+        output = io.StringIO()
+        vectorize("x / y", self.path, output=output)
+        self.assertEqual(output.getvalue(), "3\nDivision by zero\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import io
+import os
+import tempfile
+import unittest
+
+from calculator import Session
+from calculator.watchers import Watcher
+
+
+class WatcherTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "sheet.txt")
+        self.lines, self.errors = [], io.StringIO()
+        self.watcher = Watcher(self.path, Session, output=self.lines.append, errors=self.errors)
+        self.edits = 0
+
+    def edit(self, *lines):
+        """Write lines to the sheet with a modification time of its own, so even an edit of the same size is seen"""
+        with open(self.path, "w") as target:
+            target.write("".join(f"{line}\n" for line in lines))
+        self.edits += 1
+        os.utime(self.path, ns=(self.edits * 10 ** 9, self.edits * 10 ** 9))
+
+    def poll(self):
+        """The lines printed and the number of lines evaluated by one poll"""
+        del self.lines[:]
+        self.errors.seek(0)
+        self.errors.truncate()
+        self.watcher.poll()
+        report = self.errors.getvalue()
+        return list(self.lines), int(report.split(", ")[1].split()[0]) if report else None
+
+    def test_first_read_shows_every_result(self):
+        self.edit("price = 10", "qty = 3", "price * qty", "qty + 1")
+        self.assertEqual(self.poll(), (["3: 30", "4: 4"], 4))
+        self.assertEqual(self.poll(), ([], None))
+
+    def test_assignment_only_reaches_the_lines_reading_it(self):
+        self.edit("price = 10", "qty = 3", "total = price * qty", "total", "qty + 1", "price")
+        self.poll()
+        self.edit("price = 20", "qty = 3", "total = price * qty", "total", "qty + 1", "price")
+        self.assertEqual(self.poll(), (["4: 60", "6: 20"], 3))
+
+    def test_edited_expression_alone_is_calculated(self):
+        self.edit("x = 4", "x * 2", "x * 3")
+        self.poll()
+        self.edit("x = 4", "x * 2", "x * 5")
+        self.assertEqual(self.poll(), (["3: 20"], 1))
+
+    def test_inserted_lines_keep_the_other_results(self):
+        self.edit("x = 4", "x * 2")
+        self.poll()
+        self.edit("", "x = 4", "7", "x * 2")
+        self.assertEqual(self.poll(), (["3: 7"], 1))
+
+    def test_assignment_may_read_a_variable_assigned_further_down(self):
+        self.edit("y = x + 1", "x = 2", "y")
+        self.assertEqual(self.poll()[0], ["3: 3"])
+
+    def test_removed_assignment_starts_over(self):
+        self.edit("x = 2", "y = 5", "x + y")
+        self.poll()
+        self.edit("y = 5", "x + y")
+        self.assertEqual(self.poll()[0], ["2: Unknown variable"])
+        self.edit("x = 1", "y = 5", "x + y")
+        self.assertEqual(self.poll()[0], ["3: 6"])
+
+    def test_failed_lines_recover(self):
+        self.edit("d = 0", "10 / d")
+        self.assertEqual(self.poll()[0], ["2: Division by zero"])
+        self.edit("d = 5", "10 / d")
+        self.assertEqual(self.poll()[0], ["2: 2"])
+
+    def test_unreadable_file_is_reported_once(self):
+        self.assertEqual(self.watcher.poll(), 0)
+        self.assertEqual(self.watcher.poll(), 0)
+        self.assertEqual(self.errors.getvalue(), f"Cannot read {self.path}\n")
+
+
+if __name__ == "__main__":
+    unittest.main()